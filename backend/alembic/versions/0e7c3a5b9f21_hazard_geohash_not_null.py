@@ -0,0 +1,100 @@
+"""Backfill hazard geohash and make it NOT NULL
+
+Revision ID: 0e7c3a5b9f21
+Revises: b5d18e3c7a60
+Create Date: 2026-10-19 09:41:27.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0e7c3a5b9f21'
+down_revision: Union[str, Sequence[str], None] = 'b5d18e3c7a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# Frozen copy of core.geohash.encode at precision 9; migrations must not
+# change behaviour when app code does
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def _encode(lat: float, lng: float, precision: int = 9) -> str:
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                bits = (bits << 1) | 1
+                lng_lo = mid
+            else:
+                bits <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    hazard = sa.table(
+        'hazard',
+        sa.column('id', sa.Integer),
+        sa.column('lat', sa.Float),
+        sa.column('lng', sa.Float),
+        sa.column('geohash', sa.String),
+    )
+    update = (
+        hazard.update()
+        .where(hazard.c.id == sa.bindparam('hazard_id'))
+        .values(geohash=sa.bindparam('new_geohash'))
+    )
+
+    # Keyset over id so each batch is one SELECT plus one executemany UPDATE
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(hazard.c.id, hazard.c.lat, hazard.c.lng)
+            .where(hazard.c.geohash.is_(None), hazard.c.id > last_id)
+            .order_by(hazard.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        conn.execute(update, [{'hazard_id': row.id, 'new_geohash': _encode(row.lat, row.lng)} for row in rows])
+        last_id = rows[-1].id
+
+    with op.batch_alter_table('hazard') as batch_op:
+        batch_op.alter_column('geohash', existing_type=sa.String(length=12), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('hazard') as batch_op:
+        batch_op.alter_column('geohash', existing_type=sa.String(length=12), nullable=True)
@@ -0,0 +1,31 @@
+"""Notification dedup_key for nearby-alert fan-out
+
+Revision ID: 2a7f4d9e1b58
+Revises: e8b3f05a7c92
+Create Date: 2026-10-18 16:04:45.118932
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a7f4d9e1b58'
+down_revision: Union[str, Sequence[str], None] = 'e8b3f05a7c92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notifications', sa.Column('dedup_key', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=True))
+    op.create_index('ix_notifications_dedup_key_created_at', 'notifications', ['dedup_key', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_dedup_key_created_at', table_name='notifications')
+    op.drop_column('notifications', 'dedup_key')
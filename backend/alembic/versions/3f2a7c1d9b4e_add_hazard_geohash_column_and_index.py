@@ -0,0 +1,31 @@
+"""Add hazard geohash column and composite spatial index
+
+Revision ID: 3f2a7c1d9b4e
+Revises: 9e016faa6a8c
+Create Date: 2026-10-18 10:12:44.513204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a7c1d9b4e'
+down_revision: Union[str, Sequence[str], None] = '9e016faa6a8c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('hazard', sa.Column('geohash', sa.String(length=12), nullable=True))
+    op.create_index('ix_hazard_geohash_lat_lng', 'hazard', ['geohash', 'lat', 'lng'], unique=False)
+    # Existing rows are backfilled by 0e7c3a5b9f21, which also makes the column NOT NULL
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hazard_geohash_lat_lng', table_name='hazard')
+    op.drop_column('hazard', 'geohash')
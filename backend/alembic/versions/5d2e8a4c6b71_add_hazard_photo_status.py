@@ -0,0 +1,32 @@
+"""Add hazard photo_status for background uploads
+
+Revision ID: 5d2e8a4c6b71
+Revises: 7b5e0c2a8f13
+Create Date: 2026-10-18 13:42:10.518260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8a4c6b71'
+down_revision: Union[str, Sequence[str], None] = '7b5e0c2a8f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'hazard',
+        sa.Column('photo_status', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False, server_default='uploaded')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('hazard', 'photo_status')
@@ -0,0 +1,31 @@
+"""Index user_current_location.updated_at
+
+Revision ID: 6a1f9c3e2d84
+Revises: 0e7c3a5b9f21
+Create Date: 2026-10-19 11:12:05.406118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a1f9c3e2d84'
+down_revision: Union[str, Sequence[str], None] = '0e7c3a5b9f21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Location grid syncs read rows updated since their last watermark
+    op.create_index(
+        op.f('ix_user_current_location_updated_at'), 'user_current_location', ['updated_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_user_current_location_updated_at'), table_name='user_current_location')
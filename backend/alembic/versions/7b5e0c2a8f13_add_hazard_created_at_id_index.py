@@ -0,0 +1,28 @@
+"""Add hazard (created_at, id) index for keyset pagination
+
+Revision ID: 7b5e0c2a8f13
+Revises: 3f2a7c1d9b4e
+Create Date: 2026-10-18 11:03:27.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b5e0c2a8f13'
+down_revision: Union[str, Sequence[str], None] = '3f2a7c1d9b4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_hazard_created_at_id', 'hazard', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hazard_created_at_id', table_name='hazard')
@@ -0,0 +1,36 @@
+"""Enforce nearby alert dedup with a unique window bucket index
+
+Revision ID: 8f4b2d6e0a57
+Revises: d2c7e5a91b36
+Create Date: 2026-10-19 12:47:19.935862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4b2d6e0a57'
+down_revision: Union[str, Sequence[str], None] = 'd2c7e5a91b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows keep a NULL bucket, which never conflicts
+    op.add_column('notifications', sa.Column('window_bucket', sa.Integer(), nullable=True))
+    op.create_index(
+        'ux_notifications_user_id_dedup_key_window_bucket',
+        'notifications',
+        ['user_id', 'dedup_key', 'window_bucket'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_notifications_user_id_dedup_key_window_bucket', table_name='notifications')
+    op.drop_column('notifications', 'window_bucket')
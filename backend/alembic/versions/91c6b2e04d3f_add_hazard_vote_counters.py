@@ -0,0 +1,37 @@
+"""Add hazard upvotes/downvotes counters
+
+Revision ID: 91c6b2e04d3f
+Revises: 2a7f4d9e1b58
+Create Date: 2026-10-18 16:48:30.775204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '91c6b2e04d3f'
+down_revision: Union[str, Sequence[str], None] = '2a7f4d9e1b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('hazard', sa.Column('upvotes', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('hazard', sa.Column('downvotes', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from existing votes
+    op.execute("""
+        UPDATE hazard SET
+            upvotes = (SELECT count(*) FROM votes WHERE votes.report_id = hazard.id AND votes.vote_type = 'upvote'),
+            downvotes = (SELECT count(*) FROM votes WHERE votes.report_id = hazard.id AND votes.vote_type = 'downvote')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('hazard', 'downvotes')
+    op.drop_column('hazard', 'upvotes')
@@ -0,0 +1,38 @@
+"""Unique vote per (user_id, report_id)
+
+Revision ID: b5d18e3c7a60
+Revises: 91c6b2e04d3f
+Create Date: 2026-10-18 17:25:12.390846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d18e3c7a60'
+down_revision: Union[str, Sequence[str], None] = '91c6b2e04d3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep only the latest vote from races that produced duplicates
+    op.execute("""
+        DELETE FROM votes
+        WHERE id NOT IN (SELECT max(id) FROM votes GROUP BY user_id, report_id)
+    """)
+    op.execute("""
+        UPDATE hazard SET
+            upvotes = (SELECT count(*) FROM votes WHERE votes.report_id = hazard.id AND votes.vote_type = 'upvote'),
+            downvotes = (SELECT count(*) FROM votes WHERE votes.report_id = hazard.id AND votes.vote_type = 'downvote')
+    """)
+    op.create_index('ux_votes_user_id_report_id', 'votes', ['user_id', 'report_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_votes_user_id_report_id', table_name='votes')
@@ -0,0 +1,29 @@
+"""Add hazard thumbnails
+
+Revision ID: c4a9e1f7d203
+Revises: 5d2e8a4c6b71
+Create Date: 2026-10-18 14:36:52.207113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a9e1f7d203'
+down_revision: Union[str, Sequence[str], None] = '5d2e8a4c6b71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('hazard', sa.Column('thumbnails', sqlmodel.sql.sqltypes.AutoString(length=1024), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('hazard', 'thumbnails')
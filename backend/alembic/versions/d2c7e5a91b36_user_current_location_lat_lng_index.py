@@ -0,0 +1,29 @@
+"""Index user_current_location (lat, lng)
+
+Revision ID: d2c7e5a91b36
+Revises: 6a1f9c3e2d84
+Create Date: 2026-10-19 12:03:48.270514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2c7e5a91b36'
+down_revision: Union[str, Sequence[str], None] = '6a1f9c3e2d84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nearby alerts resolve recipients with a bounding-box query
+    op.create_index('ix_user_current_location_lat_lng', 'user_current_location', ['lat', 'lng'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_current_location_lat_lng', table_name='user_current_location')
@@ -0,0 +1,41 @@
+"""Notification outbox columns
+
+Revision ID: e8b3f05a7c92
+Revises: c4a9e1f7d203
+Create Date: 2026-10-18 15:21:08.630417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3f05a7c92'
+down_revision: Union[str, Sequence[str], None] = 'c4a9e1f7d203'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notifications', sa.Column('recipient', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True))
+    op.add_column('notifications', sa.Column('payload', sqlmodel.sql.sqltypes.AutoString(length=2000), nullable=True))
+    op.add_column('notifications', sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('notifications', sa.Column('next_attempt_at', sa.DateTime(), nullable=False, server_default=sa.func.now()))
+    op.add_column('notifications', sa.Column('last_error', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True))
+    op.add_column('notifications', sa.Column('sent_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_notifications_status_next_attempt_at', 'notifications', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_status_next_attempt_at', table_name='notifications')
+    op.drop_column('notifications', 'sent_at')
+    op.drop_column('notifications', 'last_error')
+    op.drop_column('notifications', 'next_attempt_at')
+    op.drop_column('notifications', 'attempts')
+    op.drop_column('notifications', 'payload')
+    op.drop_column('notifications', 'recipient')
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 
-from db.session import get_session
+from db.session import get_session, get_async_read_session
 from core.deps import get_current_user
 from models.users import Users
 from schemas.comment import CommentCreate, CommentResponse, CommentWithUserResponse
-from services.comment_service import create_comment, get_comments_by_report
+from services.comment_service import create_comment, get_comments_by_report_async
 
 router = APIRouter()
 
@@ -29,8 +30,8 @@ def add_comment(
 
 
 @router.get("/{report_id}", response_model=List[CommentWithUserResponse])
-def fetch_comments(report_id: int, session: Session = Depends(get_session)):
-    comments = get_comments_by_report(session, report_id)
+async def fetch_comments(report_id: int, session: AsyncSession = Depends(get_async_read_session)):
+    comments = await get_comments_by_report_async(session, report_id)
 
    
     return [
@@ -1,12 +1,16 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from core.s3_service import upload_to_s3
+from core.s3_service import ALLOWED_CONTENT_TYPES, new_object_key
+from core.storage import storage, run_storage_io
 
 router = APIRouter()
 
 @router.post("/upload")
-def upload_file(file: UploadFile = File(...)):
+async def upload_file(file: UploadFile = File(...)):
     try:
-        photo_url = upload_to_s3(file)
+        if file.content_type not in ALLOWED_CONTENT_TYPES:
+            raise ValueError("Unsupported file type. Please upload a JPEG or PNG image.")
+        photo_url = new_object_key(file.filename)
+        await run_storage_io(storage.upload_fileobj, file.file, photo_url, file.content_type)
         return {"photo_url": photo_url}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
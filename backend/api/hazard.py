@@ -1,19 +1,33 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Path, BackgroundTasks, status
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Path, Query, BackgroundTasks, status
 from sqlmodel import Session, select
-from typing import List
-from core.notification_service import send_hazard_email
-from db.session import get_session
-from services.hazard_service import create_hazard
-from services.location_service import upsert_user_location, get_users_near_location, haversine_distance
-from core.deps import get_current_user, get_current_admin
-from core.s3_service import upload_to_s3, get_presigned_url
+from typing import List, Optional
+from sqlmodel.ext.asyncio.session import AsyncSession
+from db.session import get_session, get_async_session, get_read_session, get_async_read_session
+from services.hazard_service import (
+    create_hazard,
+    get_hazards_near_location_async,
+    list_hazards_page,
+    list_feed_page,
+    hazard_with_urls
+)
+from services.location_service import upsert_user_location
+from core.deps import get_current_user, get_current_user_async, get_current_admin
+from core.storage import run_storage_io
 from models.hazard import Hazard
 from models.users import Users
-from schemas.hazard import HazardRead, HazardStatusUpdate
+from schemas.hazard import HazardRead, HazardPage, HazardFeedPage, HazardStatusUpdate
 from schemas.location import UserCurrentLocationUpdate
 import os
+from datetime import datetime
 from fastapi.responses import JSONResponse
-from core.ml_model import is_pothole
+from core.batch_inference import is_pothole_batched
+from core.content_cache import classification_cache, s3_key_cache
+from services.upload_service import receive_upload
+from services.upload_queue import upload_spool, spool_storage
+from services.thumbnail_service import enqueue_thumbnails
+from services.outbox_service import enqueue_email, alert_nearby_users
+from services.vote_buffer import vote_buffer
+from core.config import settings
 
 router = APIRouter()
 
@@ -29,23 +43,48 @@ async def report_hazard(
     session: Session = Depends(get_session),
     current_user: Users = Depends(get_current_user)
 ):
-    # ✅ Read image bytes for ML check
-    image_bytes = await file.read()
+    # ✅ Read the upload once: hash it, stream it to S3 (or the local spool) and keep the bytes for ML
+    check_pothole = hazard_type.lower() == "pothole"
+    spooled = settings.UPLOAD_SPOOL_ENABLED
+    upload, digest, image_bytes = await receive_upload(
+        file,
+        keep_bytes=check_pothole,
+        target=spool_storage if spooled else None
+    )
 
-    # ✅ ML check only for pothole type
-    if hazard_type.lower() == "pothole" and not is_pothole(image_bytes):
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST , # ✅ keep 200 so frontend doesn't treat as hard error
-            content={
-                "success": False,
-                "message": "Uploaded image is not a valid hazard. Please try again."
-            }
-        )
-    # ✅ Reset file pointer so S3 can read it
-    file.file.seek(0)
+    try:
+        # ✅ ML check only for pothole type (skipped for repeat uploads)
+        if check_pothole:
+            valid = classification_cache.get(digest)
+            if valid is None:
+                valid = await is_pothole_batched(image_bytes)
+                classification_cache.put(digest, valid)
 
-    # ✅ Upload to S3
-    s3_key = upload_to_s3(file)
+            if not valid:
+                await run_storage_io(upload.abort)
+                return JSONResponse(
+                    status_code=status.HTTP_400_BAD_REQUEST , # ✅ keep 200 so frontend doesn't treat as hard error
+                    content={
+                        "success": False,
+                        "message": "Uploaded image is not a valid hazard. Please try again."
+                    }
+                )
+
+        # ✅ Finish the S3 upload, reusing the stored object for identical images
+        photo_pending = False
+        s3_key = s3_key_cache.get(digest)
+        if s3_key is None:
+            s3_key = await run_storage_io(upload.complete)
+            if spooled:
+                # ✅ Spool worker pushes it to S3 and fills in photo_url
+                photo_pending = True
+            else:
+                s3_key_cache.put(digest, s3_key)
+        else:
+            await run_storage_io(upload.abort)
+    except Exception:
+        await run_storage_io(upload.abort)
+        raise
 
     # ✅ Create hazard entry
     hazard = create_hazard(
@@ -53,11 +92,44 @@ async def report_hazard(
         lng=lng,
         hazard_type=hazard_type,
         description=description,
-        photo_url=s3_key,
+        photo_url="" if photo_pending else s3_key,
+        photo_status="pending" if photo_pending else "uploaded",
         user_id=current_user.id,
-        session=session
+        session=session,
+        commit=False
     )
 
+    # ✅ Persist the spool job before the commit so a crash can't strand the hazard as pending
+    spool_job = None
+    if photo_pending:
+        spool_job = await run_storage_io(upload_spool.write_sidecar, hazard.id, s3_key, file.content_type, digest)
+
+    # ✅ Queue notification for accidents in the same transaction as the hazard
+    if hazard_type.lower() == "accident":
+        enqueue_email(
+            session,
+            current_user.id,
+            hazard.id,
+            os.getenv("TRAFFIC_AUTH_EMAIL"),
+            hazard_type,
+            f"Lat: {lat}, Lng: {lng}",
+            "High",
+            "Immediate action required!"
+        )
+    try:
+        session.commit()
+    except Exception:
+        if spool_job:
+            upload_spool.discard_sidecar(spool_job)
+        raise
+    session.refresh(hazard)
+
+    if spool_job:
+        # Thumbnails are queued by the spool worker once the original is stored
+        upload_spool.submit(spool_job)
+    else:
+        enqueue_thumbnails(hazard.id, s3_key, image_bytes)
+
     # ✅ Update user location
     upsert_user_location(
         session,
@@ -68,67 +140,83 @@ async def report_hazard(
         )
     )
 
-    # ✅ Send notification for accidents
-    if hazard_type.lower() == "accident":
-        traffic_email = os.getenv("TRAFFIC_AUTH_EMAIL")
-        background_tasks.add_task(
-            send_hazard_email,
-            traffic_email,
-            hazard_type,
-            f"Lat: {lat}, Lng: {lng}",
-            "High",
-            "Immediate action required!"
-        )
+    # ✅ Notify nearby users (fan-out into the outbox after the response)
+    if settings.NEARBY_ALERTS_ENABLED:
+        background_tasks.add_task(alert_nearby_users, hazard.id)
 
-    # ✅ Notify nearby users
-    nearby_users = get_users_near_location(session, lat, lng, radius_km=2)
-    print(f"Nearby users for hazard {hazard.id}: {[u.user_id for u in nearby_users]}")
+    return hazard_with_urls(hazard)
 
-    return hazard
+@router.get("/", response_model=HazardPage)
+def get_hazards(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    hazard_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    session: Session = Depends(get_read_session)
+):
+    hazards, next_cursor = list_hazards_page(
+        session,
+        limit=limit,
+        cursor=cursor,
+        status=status_filter,
+        hazard_type=hazard_type,
+        created_after=created_after,
+        created_before=created_before
+    )
+    return {"items": [hazard_with_urls(h) for h in hazards], "next_cursor": next_cursor}
 
-@router.get("/", response_model=List[HazardRead])
-def get_hazards(session: Session = Depends(get_session)):
-    hazards = session.exec(select(Hazard)).all()
-    for hazard in hazards:
-        hazard.photo_url = get_presigned_url(hazard.photo_url)
-    return hazards
+
+@router.get("/feed", response_model=HazardFeedPage)
+def get_feed(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    hazard_type: Optional[str] = None,
+    session: Session = Depends(get_session),
+    current_user: Users = Depends(get_current_user)
+):
+    rows, next_cursor = list_feed_page(
+        session,
+        current_user.id,
+        limit=limit,
+        cursor=cursor,
+        status=status_filter,
+        hazard_type=hazard_type
+    )
+    if settings.VOTE_BUFFER_ENABLED:
+        rows = [(hazard, vote_buffer.user_vote(current_user.id, hazard.id, vote_type)) for hazard, vote_type in rows]
+    items = [{**hazard_with_urls(hazard), "userVote": vote_type} for hazard, vote_type in rows]
+    return {"items": items, "next_cursor": next_cursor}
 
 
 @router.get("/nearby", response_model=List[HazardRead])
-def get_nearby_hazards(
+async def get_nearby_hazards(
     lat: float,
     lng: float,
     radius_km: float = 3,
-    session: Session = Depends(get_session),
-    current_user: Users = Depends(get_current_user)
+    limit: Optional[int] = Query(None, ge=1),
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: Users = Depends(get_current_user_async)
 ):
-    hazards = session.exec(select(Hazard)).all()
-    nearby_hazards = []
+    nearby_hazards = await get_hazards_near_location_async(session, lat, lng, radius_km, limit)
 
-    for hazard in hazards:
-        distance = haversine_distance(lat, lng, hazard.lat, hazard.lng)
-        if distance <= radius_km:
-            hazard.photo_url = get_presigned_url(hazard.photo_url)
-            nearby_hazards.append(hazard)
-
-    return nearby_hazards
+    return [hazard_with_urls(h) for h in nearby_hazards]
 
 
 @router.get("/mine", response_model=List[HazardRead])
-def get_my_hazards(
-    session: Session = Depends(get_session),
-    current_user: Users = Depends(get_current_user)
+async def get_my_hazards(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: Users = Depends(get_current_user_async)
 ):
-    hazards = session.exec(
+    hazards = (await session.exec(
         select(Hazard)
         .where(Hazard.reported_by == current_user.id)
         .order_by(Hazard.created_at.desc())
-    ).all()
-
-    for h in hazards:
-        h.photo_url = get_presigned_url(h.photo_url)
+    )).all()
 
-    return hazards
+    return [hazard_with_urls(h) for h in hazards]
 
 
 @router.delete("/{hazard_id}")
@@ -175,13 +263,11 @@ def update_hazard_status(
     session.commit()
     session.refresh(hazard)
 
-    hazard.photo_url = get_presigned_url(hazard.photo_url)
-    return hazard
+    return hazard_with_urls(hazard)
 
 @router.post("/{hazard_id}/upvote")
 def send_upvote_email(
     hazard_id: str,
-    background_tasks: BackgroundTasks,
     session: Session = Depends(get_session),
     current_user: Users = Depends(get_current_user)
 ):
@@ -194,14 +280,17 @@ def send_upvote_email(
     reporter = session.get(Users, hazard.reported_by)
     recipient_email = reporter.email if reporter else os.getenv("ADMIN_EMAIL")
 
-    # Send email only (no DB update)
-    background_tasks.add_task(
-        send_hazard_email,
+    # Queue the email in the outbox; the dispatcher delivers it
+    enqueue_email(
+        session,
+        hazard.reported_by,
+        hazard.id,
         recipient_email,
         hazard.hazard_type,
         f"Lat: {hazard.lat}, Lng: {hazard.lng}",
         "Info",
         f"Someone upvoted your hazard report (ID: {hazard.id})."
     )
+    session.commit()
 
-    return {"message": "Email sent successfully"}
+    return {"message": "Email queued successfully"}
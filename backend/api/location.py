@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session
-from db.session import get_session
-from core.deps import get_current_user
+from sqlmodel.ext.asyncio.session import AsyncSession
+from db.session import get_session, get_async_session, get_read_session
+from core.deps import get_current_user, get_current_user_async
 from models.users import Users
 from schemas.location import (
     UserCurrentLocationUpdate,
@@ -10,9 +11,9 @@ from schemas.location import (
 )
 from services.location_service import (
     upsert_user_location,
-    get_user_location,
+    get_user_location_async,
     get_users_near_location,
-    haversine_distance
+    haversine_distances
 )
 from typing import List
 
@@ -29,11 +30,11 @@ def update_location(
     return upsert_user_location(session, data)
 
 @router.get("/me", response_model=UserCurrentLocationRead)
-def my_location(
-    session: Session = Depends(get_session),
-    current_user: Users = Depends(get_current_user)
+async def my_location(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: Users = Depends(get_current_user_async)
 ):
-    location = get_user_location(session, current_user.id)
+    location = await get_user_location_async(session, current_user.id)
     if not location:
         raise HTTPException(status_code=404, detail="Location not found")
     return location
@@ -43,17 +44,22 @@ def users_nearby(
     lat: float,
     lng: float,
     radius_km: float = 2,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user: Users = Depends(get_current_user)
 ):
     locations = get_users_near_location(session, lat, lng, radius_km)
+    distances = haversine_distances(
+        lat, lng,
+        [loc.lat for loc in locations],
+        [loc.lng for loc in locations]
+    )
     return [
         UsersNearbyRead(
             user_id=loc.user_id,
             lat=loc.lat,
             lng=loc.lng,
             updated_at=loc.updated_at,
-            distance_km=haversine_distance(lat, lng, loc.lat, loc.lng)
+            distance_km=float(distance)
         )
-        for loc in locations
+        for loc, distance in zip(locations, distances)
     ]
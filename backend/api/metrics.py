@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+from db.session import async_engine, pool_stats, read_engines
+from core.deps import get_current_admin
+from models.users import Users
+
+router = APIRouter()
+
+
+@router.get("/db-pool")
+def get_db_pool_stats(current_admin: Users = Depends(get_current_admin)):
+    # Per worker: in_use/idle/overflow gauges plus checkout wait percentiles
+    stats = pool_stats()
+    stats["async"] = pool_stats(async_engine.sync_engine)
+    stats["replicas"] = [pool_stats(replica) for replica in read_engines.engines]
+    return stats
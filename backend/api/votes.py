@@ -1,40 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from sqlmodel import Session
 from db.session import get_session
-from models.vote import Vote
 from core.deps import get_current_user
 from models.users import Users
-from datetime import datetime
+from services.vote_service import toggle_vote
+from services.vote_buffer import vote_buffer
+from core.config import settings
 
 router = APIRouter()
 
+VOTE_MESSAGES = {
+    "created": "Vote cast",
+    "updated": "Vote updated",
+    "removed": "Vote removed"
+}
+
 
 @router.post("/")
 def cast_vote(report_id: int, vote_type: str, session: Session = Depends(get_session), user: Users = Depends(get_current_user)):
     if vote_type not in ["upvote", "downvote"]:
         raise HTTPException(status_code=400, detail="Invalid vote type")
 
-    # Check if user has already voted on this report
-    existing_vote = session.exec(
-        select(Vote).where(Vote.user_id == user.id, Vote.report_id == report_id)
-    ).first()
-
-    if existing_vote:
-        if existing_vote.vote_type == vote_type:
-            # Unvoting
-            session.delete(existing_vote)
-            session.commit()
-            return {"message": "Vote removed"}
-        else:
-            # Changing vote
-            existing_vote.vote_type = vote_type
-            existing_vote.created_at = datetime.utcnow()
-            session.add(existing_vote)
-            session.commit()
-            return {"message": "Vote updated"}
+    if settings.VOTE_BUFFER_ENABLED:
+        # Coalesced in memory and written by the buffer's next flush
+        action = vote_buffer.toggle(session, user.id, report_id, vote_type)
     else:
-        # New vote
-        new_vote = Vote(user_id=user.id, report_id=report_id, vote_type=vote_type)
-        session.add(new_vote)
-        session.commit()
-        return {"message": "Vote cast"}
+        # Upsert in one statement; the unique (user_id, report_id) index keeps
+        # concurrent taps from creating duplicate votes
+        action = toggle_vote(session, user.id, report_id, vote_type)
+    return {"message": VOTE_MESSAGES[action]}
@@ -0,0 +1,148 @@
+import asyncio
+import os
+import random
+import tempfile
+import time
+from uuid import UUID
+
+import httpx
+from fastapi import Depends, FastAPI, Header
+from sqlmodel import SQLModel, Session, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db import base  # registers all tables
+from api.comment import router as comment_router
+from api.hazard import router as hazard_router
+from core.deps import get_current_user_async
+from db.session import async_database_url, create_async_db_engine, get_async_read_session, get_async_session
+from models.comment import Comment
+from models.hazard import Hazard
+from models.users import Users
+from services.comment_service import get_comments_by_report
+from services.hazard_service import get_hazards_near_location, hazard_with_urls
+
+# Set BENCH_DATABASE_URL to a PostgreSQL URL to measure with real network
+# round trips; the default SQLite file has none, so it mostly shows
+# per-request overhead.
+DATABASE_URL = os.getenv("BENCH_DATABASE_URL")
+CLIENTS = int(os.getenv("BENCH_CLIENTS", 500))
+REQUESTS_PER_CLIENT = int(os.getenv("BENCH_REQUESTS_PER_CLIENT", 4))
+N_HAZARDS = 200
+N_COMMENTS = 2000
+
+
+def user_override(x_user: str = Header(...)):
+    return Users(id=UUID(x_user), name="", email="", password_hash="")
+
+
+def build_sync_app(engine) -> FastAPI:
+    # The endpoints as they were before moving to AsyncSession
+    app = FastAPI()
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    @app.get("/api/hazards/nearby")
+    def nearby(lat: float, lng: float, radius_km: float = 3, session: Session = Depends(session_override),
+               user: Users = Depends(user_override)):
+        return [hazard_with_urls(h) for h in get_hazards_near_location(session, lat, lng, radius_km)]
+
+    @app.get("/api/comments/{report_id}")
+    def comments(report_id: int, session: Session = Depends(session_override)):
+        return [{"id": c.id, "text": c.text, "user_name": c.user.name} for c in get_comments_by_report(session, report_id)]
+
+    return app
+
+
+def build_async_app(async_engine) -> FastAPI:
+    app = FastAPI()
+    app.include_router(hazard_router, prefix="/api/hazards")
+    app.include_router(comment_router, prefix="/api/comments")
+
+    async def session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = session_override
+    app.dependency_overrides[get_async_read_session] = session_override
+    app.dependency_overrides[get_current_user_async] = user_override
+    return app
+
+
+def seed(engine):
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(7)
+    with Session(engine) as session:
+        users = [Users(name=f"u{i}", email=f"u{i}@example.com", password_hash="x") for i in range(20)]
+        session.add_all(users)
+        session.commit()
+        user_ids = [u.id for u in session.exec(select(Users)).all()]
+        session.add_all([
+            Hazard(
+                lat=28.6 + rng.uniform(-0.05, 0.05),
+                lng=77.2 + rng.uniform(-0.05, 0.05),
+                hazard_type="pothole",
+                photo_url="hazards/x.jpg",
+                reported_by=rng.choice(user_ids)
+            )
+            for _ in range(N_HAZARDS)
+        ])
+        session.commit()
+        session.add_all([
+            Comment(report_id=rng.randint(1, N_HAZARDS), user_id=rng.choice(user_ids), text="seen it")
+            for _ in range(N_COMMENTS)
+        ])
+        session.commit()
+    return user_ids
+
+
+async def run(app: FastAPI, user_ids) -> dict:
+    latencies = []
+    rng = random.Random(11)
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=CLIENTS)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+        async def client_loop(i: int):
+            headers = {"X-User": str(user_ids[i % len(user_ids)])}
+            for n in range(REQUESTS_PER_CLIENT):
+                if n % 2:
+                    url = f"/api/comments/{rng.randint(1, N_HAZARDS)}"
+                else:
+                    url = f"/api/hazards/nearby?lat=28.6&lng=77.2&radius_km={rng.uniform(0.5, 2):.2f}"
+                start = time.perf_counter()
+                response = await client.get(url, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(i) for i in range(CLIENTS)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000
+    }
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        url = DATABASE_URL or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url, connect_args={"check_same_thread": False} if url.startswith("sqlite") else {})
+        user_ids = seed(engine)
+        async_engine = create_async_db_engine(async_database_url(url).render_as_string(hide_password=False))
+
+        print(f"{CLIENTS} concurrent clients x {REQUESTS_PER_CLIENT} requests ({engine.dialect.name})")
+        for name, app in [("sync", build_sync_app(engine)), ("async", build_async_app(async_engine))]:
+            result = await run(app, user_ids)
+            print(f"{name:>6}: {result['rps']:8.0f} req/s  p50 {result['p50_ms']:7.1f} ms  p99 {result['p99_ms']:7.1f} ms")
+
+        await async_engine.dispose()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
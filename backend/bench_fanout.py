@@ -0,0 +1,81 @@
+import random
+import time
+from uuid import uuid4
+
+from sqlmodel import SQLModel, Session, create_engine, select, func
+
+from db import base  # registers all tables
+import models.event_listeners
+from models.hazard import Hazard
+from models.location import UserCurrentLocation
+from models.notification import Notification
+from models.users import Users
+from services.location_service import find_users_near_location
+from services.outbox_service import fan_out_alert
+
+N_USERS = 10_000
+CENTER_LAT, CENTER_LNG = 28.61, 77.21
+# All users within ~1 km so every one of them is in range
+SPREAD = 0.008
+
+
+def per_row_insert(session, hazard, user_ids):
+    # Naive fan-out: one ORM object (and one INSERT) per recipient
+    for user_id in user_ids:
+        session.add(Notification(user_id=user_id, report_id=hazard.id, type="email"))
+    session.commit()
+
+
+def count(session):
+    return session.exec(select(func.count()).select_from(Notification)).one()
+
+
+if __name__ == "__main__":
+    random.seed(42)
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        users = [Users(name=f"u{i}", email=f"u{i}@example.com", password_hash="x") for i in range(N_USERS)]
+        session.add_all(users)
+        session.commit()
+        user_ids = [u.id for u in session.exec(select(Users)).all()]
+        session.add_all([
+            UserCurrentLocation(
+                user_id=user_id,
+                lat=CENTER_LAT + random.uniform(-SPREAD, SPREAD),
+                lng=CENTER_LNG + random.uniform(-SPREAD, SPREAD)
+            )
+            for user_id in user_ids
+        ])
+        hazard = Hazard(lat=CENTER_LAT, lng=CENTER_LNG, hazard_type="accident",
+                        photo_url="hazards/bench.jpg", reported_by=user_ids[0])
+        session.add(hazard)
+        session.commit()
+        session.refresh(hazard)
+
+        t0 = time.perf_counter()
+        nearby = [loc.user_id for loc in find_users_near_location(session, CENTER_LAT, CENTER_LNG, 2)]
+        lookup = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        per_row_insert(session, hazard, nearby)
+        naive = time.perf_counter() - t0
+        session.exec(Notification.__table__.delete())
+        session.commit()
+
+        t0 = time.perf_counter()
+        inserted = fan_out_alert(session, hazard, nearby)
+        bulk = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        repeat = fan_out_alert(session, hazard, nearby)
+        dedup = time.perf_counter() - t0
+
+        assert inserted == len(nearby) - 1  # reporter excluded
+        assert repeat == 0 and count(session) == inserted
+
+    print(f"{len(nearby)} users in range (lookup {lookup * 1000:.1f} ms)")
+    print(f"per-row ORM inserts : {naive * 1000:7.1f} ms")
+    print(f"multi-row INSERT    : {bulk * 1000:7.1f} ms  ({inserted} rows)")
+    print(f"repeat within window: {dedup * 1000:7.1f} ms  ({repeat} rows, deduplicated)")
@@ -0,0 +1,79 @@
+import asyncio
+import glob
+import os
+import statistics
+import sys
+import time
+
+from core.ml_model import is_pothole
+from core.batch_inference import pothole_worker, is_pothole_batched
+from core.executors import shutdown_cpu_executor
+
+DATASET_DIR = os.path.join(os.path.dirname(__file__), "dataset")
+N_REQUESTS = 256
+PROBE_INTERVAL_MS = 5
+CONCURRENCY = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+
+
+def load_images():
+    paths = sorted(glob.glob(os.path.join(DATASET_DIR, "*", "*", "*.jpg")))
+    images = [open(p, "rb").read() for p in paths[:64]]
+    return [images[i % len(images)] for i in range(N_REQUESTS)]
+
+
+async def probe(stop, lags):
+    # Stands in for cheap concurrent requests (feed reads etc.)
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL_MS / 1000)
+        lags.append((time.perf_counter() - t0) * 1000 - PROBE_INTERVAL_MS)
+
+
+async def run(images, classify):
+    sem = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+    lags = []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(stop, lags))
+
+    async def one(image_bytes):
+        async with sem:
+            t0 = time.perf_counter()
+            await classify(image_bytes)
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(b) for b in images))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await prober
+    latencies.sort()
+    lags.sort()
+    return {
+        "throughput_per_s": len(images) / elapsed,
+        "latency_p50_ms": statistics.median(latencies),
+        "latency_p99_ms": latencies[int(0.99 * (len(latencies) - 1))],
+        "probe_p99_ms": lags[int(0.99 * (len(lags) - 1))] if lags else 0.0
+    }
+
+
+async def single(image_bytes):
+    # Current report_hazard path: blocking call on the event loop
+    return is_pothole(image_bytes)
+
+
+def report(name, result):
+    print(f"{name:<8} {result['throughput_per_s']:8.1f} img/s  "
+          f"p50 {result['latency_p50_ms']:8.1f} ms  p99 {result['latency_p99_ms']:8.1f} ms  "
+          f"other-request p99 delay {result['probe_p99_ms']:8.1f} ms")
+
+
+if __name__ == "__main__":
+    images = load_images()
+    print(f"{N_REQUESTS} requests, concurrency {CONCURRENCY}")
+    report("inline", asyncio.run(run(images, single)))
+    pothole_worker.start()
+    report("executor", asyncio.run(run(images, is_pothole_batched)))
+    print("worker stats:", pothole_worker.stats())
+    pothole_worker.stop()
+    shutdown_cpu_executor()
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import os
+import random
+import tempfile
+import time
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlmodel import SQLModel, Session, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db import base  # registers all tables
+from api.auth import router as auth_router
+from api.hazard import router as hazard_router
+from core.config import settings
+from core.security import pwd_context
+from db.session import async_database_url, create_async_db_engine, get_async_session, get_read_session
+from models.hazard import Hazard
+from models.users import Users
+
+LOGINS = int(os.getenv("BENCH_LOGINS", 200))  # concurrent login storm
+FEED_CLIENTS = int(os.getenv("BENCH_FEED_CLIENTS", 20))
+FEED_REQUESTS_PER_CLIENT = 10
+N_USERS = 50
+PASSWORD = "correct horse"
+
+
+def legacy_login(session: Session, email: str, password: str):
+    # Previous login: bcrypt verify inline on the request thread
+    user = session.exec(select(Users).where(Users.email == email)).first()
+    if not user or not pwd_context.verify(password, user.password_hash):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    return {"access_token": "x"}
+
+
+def build_app(engine, async_engine, legacy: bool) -> FastAPI:
+    app = FastAPI()
+    app.include_router(hazard_router, prefix="/api/hazards")
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    async def async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    if legacy:
+        @app.post("/api/auth/login")
+        def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(session_override)):
+            return legacy_login(session, form_data.username, form_data.password)
+    else:
+        app.include_router(auth_router, prefix="/api/auth")
+
+    app.dependency_overrides[get_read_session] = session_override
+    app.dependency_overrides[get_async_session] = async_session_override
+    return app
+
+
+def seed(engine):
+    SQLModel.metadata.create_all(engine)
+    password_hash = pwd_context.hash(PASSWORD)  # one hash, reused for every user
+    with Session(engine) as session:
+        users = [Users(name=f"u{i}", email=f"u{i}@example.com", password_hash=password_hash) for i in range(N_USERS)]
+        session.add_all(users)
+        session.commit()
+        reporter = users[0].id
+        session.add_all([
+            Hazard(lat=28.6, lng=77.2, hazard_type="pothole", photo_url="hazards/x.jpg", reported_by=reporter)
+            for _ in range(50)
+        ])
+        session.commit()
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))] * 1000 if values else 0.0
+
+
+async def run(app: FastAPI) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=LOGINS + FEED_CLIENTS)
+    statuses = {}
+    feed_latencies = []
+    rng = random.Random(5)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=300) as client:
+        async def login(i: int):
+            data = {"username": f"u{rng.randrange(N_USERS)}@example.com", "password": PASSWORD}
+            response = await client.post("/api/auth/login", data=data)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        async def feed_reader():
+            for _ in range(FEED_REQUESTS_PER_CLIENT):
+                start = time.perf_counter()
+                response = await client.get("/api/hazards/?limit=20")
+                feed_latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(login(i) for i in range(LOGINS)),
+            *(feed_reader() for _ in range(FEED_CLIENTS))
+        )
+        elapsed = time.perf_counter() - start
+
+    return {
+        "logins_per_s": statuses.get(200, 0) / elapsed,
+        "statuses": statuses,
+        "feed_p50_ms": pct(feed_latencies, 0.50),
+        "feed_p99_ms": pct(feed_latencies, 0.99)
+    }
+
+
+async def main():
+    logging.getLogger("passlib").setLevel(logging.ERROR)
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        # Room for every FastAPI threadpool thread (40) to hold a connection
+        engine = create_engine(url, pool_size=40, connect_args={"check_same_thread": False, "timeout": 60})
+        seed(engine)
+        async_engine = create_async_db_engine(async_database_url(url))
+
+        print(
+            f"{LOGINS} concurrent logins + {FEED_CLIENTS} feed readers, bcrypt cost {settings.BCRYPT_ROUNDS}, "
+            f"{settings.PASSWORD_HASH_WORKERS} hash workers, max pending {settings.PASSWORD_HASH_MAX_PENDING}"
+        )
+        for name, legacy in [("inline", True), ("executor", False)]:
+            result = await run(build_app(engine, async_engine, legacy))
+            print(
+                f"{name:>9}: {result['logins_per_s']:6.1f} logins/s  statuses {result['statuses']}  "
+                f"feed p50 {result['feed_p50_ms']:7.1f} ms  p99 {result['feed_p99_ms']:7.1f} ms"
+            )
+
+        await async_engine.dispose()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
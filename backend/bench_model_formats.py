@@ -0,0 +1,59 @@
+import glob
+import os
+import sys
+import time
+
+import torch
+
+from core.ml_model import load_model, preprocess, MODEL_FORMATS, POTHOLE_THRESHOLD
+
+DATASET_DIR = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "dataset")
+BATCH_SIZE = 16
+
+
+def load_samples():
+    # Same layout as the training ImageFolder: <class>/<subdir>/*.jpg
+    samples = []
+    for label, cls in enumerate(["non_pothole", "pothole"]):
+        for path in sorted(glob.glob(os.path.join(DATASET_DIR, cls, "**", "*.jpg"), recursive=True)):
+            with open(path, "rb") as f:
+                samples.append((preprocess(f.read()), label))
+    return samples
+
+
+def evaluate(model, samples):
+    tensors = [t for t, _ in samples]
+    with torch.no_grad():
+        # Warm-up so tracing/quantization setup is not timed
+        model(tensors[0].unsqueeze(0))
+
+        t0 = time.perf_counter()
+        single = [model(t.unsqueeze(0)).item() for t in tensors]
+        single_ms = (time.perf_counter() - t0) / len(tensors) * 1000
+
+        t0 = time.perf_counter()
+        for i in range(0, len(tensors), BATCH_SIZE):
+            model(torch.stack(tensors[i:i + BATCH_SIZE]))
+        batch_ms = (time.perf_counter() - t0) / len(tensors) * 1000
+
+    correct = sum((p > POTHOLE_THRESHOLD) == bool(label) for p, (_, label) in zip(single, samples))
+    return single, correct / len(samples), single_ms, batch_ms
+
+
+if __name__ == "__main__":
+    torch.set_num_threads(1)
+    samples = load_samples()
+    print(f"{len(samples)} images from {DATASET_DIR}")
+
+    reference = None
+    for fmt in MODEL_FORMATS:
+        probs, accuracy, single_ms, batch_ms = evaluate(load_model(fmt), samples)
+        if reference is None:
+            reference = probs
+        agreement = sum(
+            (a > POTHOLE_THRESHOLD) == (b > POTHOLE_THRESHOLD) for a, b in zip(probs, reference)
+        ) / len(probs)
+        max_diff = max(abs(a - b) for a, b in zip(probs, reference))
+        print(f"{fmt:<10} acc {accuracy:.3f}  agree-with-eager {agreement:.3f}  "
+              f"max |dp| {max_diff:.2e}  {single_ms:6.2f} ms/img (bs=1)  "
+              f"{batch_ms:6.2f} ms/img (bs={BATCH_SIZE})")
@@ -0,0 +1,65 @@
+import random
+import time
+from uuid import uuid4
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from db import base  # registers all tables
+import models.event_listeners
+from models.hazard import Hazard
+from services.hazard_service import get_hazards_near_location
+from services.location_service import haversine_distance
+
+N_HAZARDS = 200_000
+N_QUERIES = 50
+# Roughly a city-sized area around Delhi
+CENTER_LAT, CENTER_LNG, SPREAD = 28.61, 77.21, 0.5
+
+
+def full_scan(session, lat, lng, radius_km):
+    hazards = session.exec(select(Hazard)).all()
+    return [h for h in hazards if haversine_distance(lat, lng, h.lat, h.lng) <= radius_km]
+
+
+if __name__ == "__main__":
+    random.seed(42)
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        reporter = uuid4()
+        session.add_all([
+            Hazard(
+                lat=CENTER_LAT + random.uniform(-SPREAD, SPREAD),
+                lng=CENTER_LNG + random.uniform(-SPREAD, SPREAD),
+                hazard_type="pothole",
+                photo_url="hazards/bench.jpg",
+                reported_by=reporter,
+            )
+            for _ in range(N_HAZARDS)
+        ])
+        session.commit()
+
+        queries = [
+            (CENTER_LAT + random.uniform(-SPREAD, SPREAD),
+             CENTER_LNG + random.uniform(-SPREAD, SPREAD),
+             random.choice([0.5, 1, 3, 10]))
+            for _ in range(N_QUERIES)
+        ]
+
+        scan_time = index_time = 0.0
+        for lat, lng, radius in queries:
+            session.expunge_all()
+            t0 = time.perf_counter()
+            expected = full_scan(session, lat, lng, radius)
+            scan_time += time.perf_counter() - t0
+
+            session.expunge_all()
+            t0 = time.perf_counter()
+            got = get_hazards_near_location(session, lat, lng, radius)
+            index_time += time.perf_counter() - t0
+
+            assert sorted(h.id for h in expected) == sorted(h.id for h in got), (lat, lng, radius)
+
+    print(f"{N_HAZARDS} hazards, {N_QUERIES} queries - results identical")
+    print(f"full scan : {scan_time / N_QUERIES * 1000:.1f} ms/query")
+    print(f"geohash   : {index_time / N_QUERIES * 1000:.1f} ms/query")
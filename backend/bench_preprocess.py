@@ -0,0 +1,46 @@
+import glob
+import os
+import time
+from io import BytesIO
+
+from PIL import Image
+
+from core.ml_model import preprocess, preprocess_reference
+
+DATASET_DIR = os.path.join(os.path.dirname(__file__), "dataset")
+# Typical phone upload sizes
+SIZES = [(640, 480), (1920, 1080), (4032, 3024)]
+N_IMAGES = 20
+
+
+def make_jpegs(size):
+    paths = sorted(glob.glob(os.path.join(DATASET_DIR, "*", "*", "*.jpg")))[:N_IMAGES]
+    jpegs = []
+    for path in paths:
+        img = Image.open(path).convert("RGB").resize(size, Image.BICUBIC)
+        buf = BytesIO()
+        img.save(buf, format="JPEG", quality=90)
+        jpegs.append(buf.getvalue())
+    return jpegs
+
+
+def ms_per_image(fn, images):
+    t0 = time.perf_counter()
+    for image_bytes in images:
+        fn(image_bytes)
+    return (time.perf_counter() - t0) / len(images) * 1000
+
+
+if __name__ == "__main__":
+    for size in SIZES:
+        images = make_jpegs(size)
+        max_diff = max(
+            (preprocess(b) - preprocess_reference(b)).abs().max().item() for b in images
+        )
+        mean_diff = sum(
+            (preprocess(b) - preprocess_reference(b)).abs().mean().item() for b in images
+        ) / len(images)
+        ref_ms = ms_per_image(preprocess_reference, images)
+        fast_ms = ms_per_image(preprocess, images)
+        print(f"{size[0]}x{size[1]:<5} reference {ref_ms:7.2f} ms/img  fast {fast_ms:6.2f} ms/img  "
+              f"speedup {ref_ms / fast_ms:5.1f}x  mean |d| {mean_diff:.4f}  max |d| {max_diff:.3f}")
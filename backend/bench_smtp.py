@@ -0,0 +1,83 @@
+# Needs aiosmtpd (pip install aiosmtpd); not a runtime dependency
+import asyncio
+import smtplib
+import time
+from concurrent.futures import wait
+
+from aiosmtpd.controller import Controller
+
+from core.notification_service import EmailSender, SMTPConnectionPool, build_hazard_message
+
+N_MESSAGES = 500
+HOST, PORT = "127.0.0.1", 8025
+# Stand-in for the STARTTLS + AUTH round trips of a real relay
+HANDSHAKE_MS = 20
+
+
+class CountingHandler:
+    def __init__(self):
+        self.received = 0
+        self.drop_after = None  # drop the connection after this many messages
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        await asyncio.sleep(HANDSHAKE_MS / 1000)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        if self.drop_after and self.received % self.drop_after == 0:
+            server.transport.close()
+        return "250 OK"
+
+
+def messages():
+    return [
+        build_hazard_message(f"user{i}@example.com", "accident", "Lat: 28.6, Lng: 77.2", "High", "Drive carefully")
+        for i in range(N_MESSAGES)
+    ]
+
+
+def per_message_connection(msgs):
+    # Previous send_hazard_email: new connection + handshake per email
+    for message in msgs:
+        with smtplib.SMTP(HOST, PORT) as smtp:
+            smtp.ehlo()
+            smtp.send_message(message)
+
+
+def pooled(msgs, workers=2):
+    sender = EmailSender(SMTPConnectionPool(HOST, PORT, size=workers), workers=workers)
+    futures = [sender.submit(m) for m in msgs]
+    wait(futures)
+    sender.stop()
+    return sender.stats()
+
+
+if __name__ == "__main__":
+    handler = CountingHandler()
+    controller = Controller(handler, hostname=HOST, port=PORT)
+    controller.start()
+    try:
+        msgs = messages()
+
+        t0 = time.perf_counter()
+        per_message_connection(msgs)
+        before = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        stats = pooled(msgs)
+        after = time.perf_counter() - t0
+
+        print(f"{N_MESSAGES} emails, {HANDSHAKE_MS} ms handshake")
+        print(f"connection per email : {N_MESSAGES / before:7.0f} msg/s")
+        print(f"pooled sender        : {N_MESSAGES / after:7.0f} msg/s  "
+              f"({stats['connections_opened']} connections, {stats['batches']} batches)")
+
+        handler.drop_after = 50
+        handler.received = 0
+        stats = pooled(msgs)
+        print(f"server drops every 50 : sent {stats['sent']}, failed {stats['failed']}, "
+              f"reconnects {stats['reconnects']}")
+    finally:
+        controller.stop()
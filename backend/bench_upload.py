@@ -0,0 +1,89 @@
+import asyncio
+import os
+import tempfile
+import tracemalloc
+
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+import services.upload_service as upload_service
+from core.storage import S3Storage, run_storage_io
+from services.upload_service import receive_upload
+
+UPLOAD_SIZES_MB = [1, 4, 9]
+
+
+class LocalS3:
+    """In-process S3 stand-in: keeps only object sizes, like a remote store would"""
+
+    def __init__(self):
+        self.objects = {}
+        self._uploads = {}
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None):
+        data = fileobj.read()
+        self.objects[key] = len(data)
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.objects[Key] = len(Body)
+
+    def create_multipart_upload(self, Bucket, Key, ContentType):
+        upload_id = f"upload-{len(self._uploads)}"
+        self._uploads[upload_id] = 0
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self._uploads[UploadId] += len(Body)
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.objects[Key] = self._uploads.pop(UploadId)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self._uploads.pop(UploadId, None)
+
+
+def make_upload(size):
+    # Same spooling Starlette does for multipart bodies
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(os.urandom(size))
+    spool.seek(0)
+    return UploadFile(
+        spool,
+        size=size,
+        filename="photo.jpg",
+        headers=Headers({"content-type": "image/jpeg"})
+    )
+
+
+async def buffered_path(file, client):
+    # Previous report_hazard: read everything for ML, then stream to S3 again
+    image_bytes = await file.read()
+    file.file.seek(0)
+    client.upload_fileobj(file.file, "bucket", "key")
+    return len(image_bytes)
+
+
+async def streaming_path(file, client):
+    upload, digest, image_bytes = await receive_upload(file, keep_bytes=True)
+    await run_storage_io(upload.complete)
+    return len(image_bytes)
+
+
+def peak_mb(coro_fn, size, client):
+    file = make_upload(size)
+    tracemalloc.start()
+    asyncio.run(coro_fn(file, client))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+if __name__ == "__main__":
+    client = LocalS3()
+    upload_service.storage = S3Storage(client, "bench")
+    for mb in UPLOAD_SIZES_MB:
+        size = mb * 1024 * 1024
+        before = peak_mb(buffered_path, size, client)
+        after = peak_mb(streaming_path, size, client)
+        print(f"{mb:>2} MB upload  peak per request: buffered {before:6.1f} MB  streaming {after:6.1f} MB")
@@ -0,0 +1,160 @@
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from uuid import UUID
+
+from fastapi import Depends, FastAPI, Header
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from db import base  # registers all tables
+import models.event_listeners
+import api.votes
+from api.votes import router as vote_router
+from core.config import settings
+from core.deps import get_current_user
+from db.session import get_session
+from models.hazard import Hazard
+from models.users import Users
+from models.vote import Vote
+from services.vote_buffer import VoteBuffer
+
+N_USERS = 50
+N_REPORTS = 3
+TAPS_PER_USER = 40
+THREADS = 16
+
+
+def legacy_cast_vote(session: Session, user_id, report_id: int, vote_type: str):
+    # Previous cast_vote: SELECT, then INSERT/UPDATE/DELETE
+    existing = session.exec(select(Vote).where(Vote.user_id == user_id, Vote.report_id == report_id)).first()
+    if existing and existing.vote_type == vote_type:
+        session.delete(existing)
+    elif existing:
+        existing.vote_type = vote_type
+        session.add(existing)
+    else:
+        session.add(Vote(user_id=user_id, report_id=report_id, vote_type=vote_type))
+    session.commit()
+
+
+def build_app(engine, legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    def user_override(x_user: str = Header(...)):
+        return Users(id=UUID(x_user), name="", email="", password_hash="")
+
+    if legacy:
+        @app.post("/api/votes/")
+        def cast(report_id: int, vote_type: str, session: Session = Depends(session_override),
+                 user: Users = Depends(user_override)):
+            legacy_cast_vote(session, user.id, report_id, vote_type)
+            return {}
+    else:
+        app.include_router(vote_router, prefix="/api/votes")
+        app.dependency_overrides[get_session] = session_override
+        app.dependency_overrides[get_current_user] = user_override
+    return app
+
+
+def setup(path: str, unique: bool):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"timeout": 60, "check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    if not unique:
+        # Schema as it was before the unique index migration
+        with engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX ux_votes_user_id_report_id")
+
+    with Session(engine) as session:
+        users = [Users(name=f"u{i}", email=f"u{i}@example.com", password_hash="x") for i in range(N_USERS)]
+        session.add_all(users)
+        session.commit()
+        user_ids = [u.id for u in session.exec(select(Users)).all()]
+        session.add_all([
+            Hazard(lat=28.6, lng=77.2, hazard_type="pothole", photo_url="hazards/x.jpg", reported_by=user_ids[0])
+            for _ in range(N_REPORTS)
+        ])
+        session.commit()
+    return engine, user_ids
+
+
+def hammer(app, user_ids):
+    random.seed(7)
+    # Even-indexed users only ever upvote, so their final state is the parity of their taps
+    taps = []
+    for i, user_id in enumerate(user_ids):
+        for _ in range(TAPS_PER_USER):
+            vote_type = "upvote" if i % 2 == 0 else random.choice(["upvote", "downvote"])
+            taps.append((user_id, random.randint(1, N_REPORTS), vote_type))
+    random.shuffle(taps)
+
+    client = TestClient(app)
+    errors = Counter()
+
+    def tap(item):
+        user_id, report_id, vote_type = item
+        try:
+            r = client.post(f"/api/votes/?report_id={report_id}&vote_type={vote_type}", headers={"X-User": str(user_id)})
+            if r.status_code != 200:
+                errors[r.status_code] += 1
+        except Exception as e:
+            errors[type(e).__name__] += 1
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as pool:
+        list(pool.map(tap, taps))
+    elapsed = time.perf_counter() - t0
+    return taps, elapsed, errors
+
+
+def check(engine, taps):
+    with Session(engine) as session:
+        votes = session.exec(select(Vote)).all()
+        duplicates = sum(n - 1 for n in Counter((v.user_id, v.report_id) for v in votes).values())
+
+        expected = Counter((u, r) for u, r, t in taps if t == "upvote")
+        even_users = {u for u, _, t in taps} - {u for u, _, t in taps if t == "downvote"}
+        have = {(v.user_id, v.report_id) for v in votes}
+        parity_errors = sum(
+            1 for (u, r), n in expected.items()
+            if u in even_users and ((u, r) in have) != (n % 2 == 1)
+        )
+
+        counter_errors = 0
+        for hazard in session.exec(select(Hazard)).all():
+            up = sum(1 for v in votes if v.report_id == hazard.id and v.vote_type == "upvote")
+            down = sum(1 for v in votes if v.report_id == hazard.id and v.vote_type == "downvote")
+            counter_errors += (hazard.upvotes, hazard.downvotes) != (up, down)
+    return duplicates, parity_errors, counter_errors
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, legacy, buffered in [
+            ("select-then-write", True, False),
+            ("upsert", False, False),
+            ("buffered upsert", False, True),
+        ]:
+            engine, user_ids = setup(os.path.join(tmp, f"{label}.db"), unique=not legacy)
+            commits = []
+            event.listen(engine, "commit", lambda conn: commits.append(1))
+
+            settings.VOTE_BUFFER_ENABLED = buffered
+            buffer = api.votes.vote_buffer = VoteBuffer(engine, flush_interval_ms=200)
+            if buffered:
+                buffer.start()
+            taps, elapsed, errors = hammer(build_app(engine, legacy), user_ids)
+            buffer.stop()
+
+            duplicates, parity_errors, counter_errors = check(engine, taps)
+            counters = "n/a" if legacy else counter_errors
+            print(f"{label:18}: {len(taps) / elapsed:6.0f} req/s  {len(commits):5d} commits  duplicates {duplicates}  "
+                  f"wrong final state {parity_errors}  counter drift {counters}  errors {dict(errors)}")
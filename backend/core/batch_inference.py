@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import torch
+
+from core.batching import collect_batch, percentile
+from core.config import settings
+from core.executors import run_cpu_bound
+from core.ml_model import model, preprocess, is_pothole, POTHOLE_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+
+class BatchInferenceWorker:
+    """
+    Queues preprocessed image tensors and runs the model on micro-batches
+    from a dedicated thread. A batch is dispatched once it reaches
+    max_batch_size or the oldest queued image has waited max_wait_ms. Each
+    caller gets its own probability back through a Future.
+    """
+
+    def __init__(self, model, max_batch_size: int = 16, max_wait_ms: float = 5):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.images = 0
+        self._latencies_ms = deque(maxlen=1000)
+        self._started_at = None
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="pothole-inference", daemon=True)
+            self._started_at = time.monotonic()
+            self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, tensor: torch.Tensor) -> Future:
+        self.start()
+        future = Future()
+        self._queue.put((tensor, future, time.monotonic()))
+        return future
+
+    async def predict(self, tensor: torch.Tensor) -> float:
+        return await asyncio.wrap_future(self.submit(tensor))
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            # Measured from submission: an image that already queued behind a
+            # forward pass does not wait another max_wait for company
+            _, _, submitted_at = first
+            batch = collect_batch(self._queue, first, self.max_batch_size, submitted_at + self.max_wait)
+
+            tensors, pending = [], []
+            for tensor, future, submitted_at in batch:
+                if future.set_running_or_notify_cancel():
+                    tensors.append(tensor)
+                    pending.append((future, submitted_at))
+
+            if not tensors:
+                continue
+
+            try:
+                with torch.no_grad():
+                    probs = self.model(torch.stack(tensors)).view(-1).tolist()
+            except Exception as e:
+                logger.error(f"Batch inference failed: {e}")
+                for future, _ in pending:
+                    future.set_exception(e)
+                continue
+
+            done_at = time.monotonic()
+            for (future, _), prob in zip(pending, probs):
+                future.set_result(prob)
+
+            with self._stats_lock:
+                self.batches += 1
+                self.images += len(pending)
+                self._latencies_ms.extend((done_at - t) * 1000 for _, t in pending)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            latencies = sorted(self._latencies_ms)
+            elapsed = time.monotonic() - self._started_at if self._started_at else 0
+
+            return {
+                "batches": self.batches,
+                "images": self.images,
+                "avg_batch_size": self.images / self.batches if self.batches else 0.0,
+                "throughput_per_s": self.images / elapsed if elapsed else 0.0,
+                "latency_p50_ms": percentile(latencies, 0.50),
+                "latency_p99_ms": percentile(latencies, 0.99),
+                "queue_depth": self._queue.qsize()
+            }
+
+
+pothole_worker = BatchInferenceWorker(
+    model,
+    max_batch_size=settings.ML_MAX_BATCH_SIZE,
+    max_wait_ms=settings.ML_MAX_WAIT_MS
+)
+
+
+async def is_pothole_batched(image_bytes: bytes) -> bool:
+    """
+    Async is_pothole. Decoding runs on the CPU executor; with the thread
+    executor the forward pass goes through the shared micro-batching worker,
+    with the process executor each worker process runs its own model.
+    """
+    if settings.CPU_EXECUTOR == "process":
+        return await run_cpu_bound(is_pothole, image_bytes)
+
+    tensor = await run_cpu_bound(preprocess, image_bytes)
+    prob = await pothole_worker.predict(tensor)
+    return prob > POTHOLE_THRESHOLD
@@ -0,0 +1,32 @@
+import queue
+import time
+from typing import Sequence
+
+
+def collect_batch(q: queue.Queue, first, max_size: int, deadline: float) -> list:
+    """
+    Drain `q` into a batch that starts with `first`, until it holds max_size
+    items or time.monotonic() reaches deadline. A None item (the workers'
+    stop sentinel) ends the batch early and is put back for the run loop.
+    """
+    batch = [first]
+    while len(batch) < max_size:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            item = q.get(timeout=remaining)
+        except queue.Empty:
+            break
+        if item is None:
+            q.put(None)
+            break
+        batch.append(item)
+    return batch
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile (p in 0..1) of an already sorted sequence; 0.0 if empty"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
@@ -1,7 +1,25 @@
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
+    APP_PROFILE: str = "production"  # "debug" turns on SQL echo
+
     DATABASE_URL: str
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10  # per uvicorn worker
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_S: float = 10
+    DB_POOL_RECYCLE_S: int = 1800  # below server/proxy idle timeouts
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 15000  # PostgreSQL only; 0 disables
+    # Async endpoints get their own pool of the same size, so each worker
+    # can hold 2 x (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+    # Unset derives it from DATABASE_URL (asyncpg / aiosqlite).
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Comma-separated read replica URLs for safe GET handlers, used in
+    # turn. Empty sends every read to the primary.
+    DB_REPLICA_URLS: str = ""
+
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int 
@@ -12,6 +30,94 @@ class Settings(BaseSettings):
     AWS_REGION: str = "ap-south-1"
     S3_BUCKET: str
     S3_URL_EXPIRES: int = 3600  # 1 hour
+    S3_MAX_POOL_CONNECTIONS: int = 32
+    S3_MAX_ATTEMPTS: int = 5  # botocore "standard" retries with exponential backoff
+    PRESIGNED_URL_CACHE_SIZE: int = 10000
+    PRESIGNED_URL_REUSE_FRACTION: float = 0.8  # share of expires_in a cached URL is served for before re-signing
+
+    # Object storage backend: "s3" or "local" (filesystem, for tests/benchmarks)
+    STORAGE_BACKEND: str = "s3"
+    STORAGE_IO_WORKERS: int = 32
+    LOCAL_STORAGE_DIR: str = "media"
+    LOCAL_STORAGE_URL: str = "/media"
+
+    # Spool uploads to local disk and push them to storage in the background
+    UPLOAD_SPOOL_ENABLED: bool = False
+    UPLOAD_SPOOL_DIR: str = "upload_spool"
+    UPLOAD_SPOOL_WORKERS: int = 2
+    UPLOAD_SPOOL_MAX_ATTEMPTS: int = 8
+
+    # Thumbnails rendered in the background and stored next to the original
+    THUMBNAILS_ENABLED: bool = True
+    THUMBNAIL_WIDTHS: str = "320,640"  # comma-separated pixel widths
+    THUMBNAIL_FORMAT: str = "webp"  # "webp" or "jpeg"
+    THUMBNAIL_QUALITY: int = 75
+    THUMBNAIL_BATCH_SIZE: int = 8
+    THUMBNAIL_MAX_WAIT_MS: float = 50
+
+    # Pooled SMTP sender (core/notification_service.py)
+    SMTP_POOL_SIZE: int = 2  # connections == sender threads
+    SMTP_BATCH_SIZE: int = 20
+    SMTP_MAX_WAIT_MS: float = 100
+    SMTP_MAX_ATTEMPTS: int = 3
+    SMTP_MAX_IDLE_S: float = 60  # NOOP-check connections idle longer than this
+    SMTP_TIMEOUT_S: float = 30
+
+    # Notification outbox dispatcher
+    NOTIFY_BATCH_SIZE: int = 50
+    NOTIFY_POLL_INTERVAL_S: float = 1.0
+    NOTIFY_MAX_ATTEMPTS: int = 6
+    NOTIFY_RETRY_BASE_S: float = 30  # 30s, 60s, 120s ... between attempts
+    NOTIFY_RETRY_MAX_S: float = 3600
+    NOTIFY_LEASE_S: float = 300  # Claimed rows become claimable again after this
+    NOTIFY_RATE_LIMITS: str = "email=20,web_push=200,sms=5"  # messages/s per channel, per dispatcher
+
+    # Per-worker user location grid. Reads older than LOCATION_GRID_SYNC_S
+    # first pull rows updated since the last sync (minus the overlap, which
+    # covers clock skew between workers and late commits); a full rebuild
+    # every LOCATION_GRID_REBUILD_S drops rows deleted elsewhere
+    LOCATION_GRID_SYNC_S: float = 5
+    LOCATION_GRID_SYNC_OVERLAP_S: float = 30
+    LOCATION_GRID_REBUILD_S: float = 600
+
+    # Alerts to users near a new hazard
+    NEARBY_ALERTS_ENABLED: bool = True
+    NEARBY_ALERT_RADIUS_KM: float = 2
+    NEARBY_ALERT_CHANNEL: str = "email"
+    NEARBY_ALERT_AREA_PRECISION: int = 6  # geohash cell (~1.2 x 0.6 km) used for dedup
+    NEARBY_ALERT_DEDUP_MINUTES: int = 30
+    NEARBY_ALERT_INSERT_CHUNK: int = 1000  # rows per multi-row INSERT
+
+    # Write-behind buffer for votes (per process)
+    VOTE_BUFFER_ENABLED: bool = False
+    VOTE_BUFFER_FLUSH_MS: float = 200
+    VOTE_BUFFER_MAX_ENTRIES: int = 1000
+
+    # CPU-bound work (image decode, inference) executor
+    CPU_EXECUTOR: str = "thread"  # "thread" or "process"
+    CPU_EXECUTOR_WORKERS: int = 4
+    TORCH_NUM_THREADS: int = 1  # intra-op threads per process
+    ML_MODEL_FORMAT: str = "eager"  # "eager", "scripted" or "quantized"
+    ML_MAX_BATCH_SIZE: int = 16  # pothole classifications per forward pass
+    ML_MAX_WAIT_MS: float = 5  # how long the first request waits for a batch to fill
+
+    # Hard cap on uploaded image size
+    MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+
+    # Dedup caches keyed by SHA-256 of uploaded image bytes
+    CONTENT_CACHE_SIZE: int = 10000
+
+    # Password hashing. Stored hashes below BCRYPT_ROUNDS are re-hashed on
+    # the next login; hash/verify calls queued or running beyond
+    # PASSWORD_HASH_MAX_PENDING are rejected with 503
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # Authenticated user records, keyed by token sub. Invalidation is per
+    # process, so other workers can see a role change/delete up to the TTL late
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_S: float = 60
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,20 @@
+from core.config import settings
+from core.ttl_cache import TTLCache
+
+
+class ContentHashCache(TTLCache):
+    """
+    Bounded LRU keyed by the SHA-256 of an upload. Used to skip repeat work
+    when the same photo is uploaded again (retries, double taps). Entries
+    never expire: the same bytes always give the same result.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        super().__init__(maxsize)
+
+
+# digest -> is_pothole result
+classification_cache = ContentHashCache(settings.CONTENT_CACHE_SIZE)
+
+# digest -> S3 key of the already uploaded object
+s3_key_cache = ContentHashCache(settings.CONTENT_CACHE_SIZE)
@@ -1,25 +1,52 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from db.session import get_session
+from uuid import UUID
+from db.session import get_async_session, get_session
 from models.users import Users
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from core.security import SECRET_KEY, ALGORITHM
+from core.user_cache import user_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)) -> Users:
+def _token_user_id(token: str) -> UUID:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-    except JWTError:
+        return UUID(payload["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = session.exec(select(Users).where(Users.id == user_id)).first()
+def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)) -> Users:
+    # The token is only trusted for identity; role/name come from the
+    # user record (cached), so role changes and deletes take effect
+    user_id = _token_user_id(token)
+    user = user_cache.get(str(user_id))
+    if user is not None:
+        return user
+
+    version = user_cache.version()
+    user = session.get(Users, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    user_cache.put(str(user_id), user, version)
+    return user
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_async_session)
+) -> Users:
+    user_id = _token_user_id(token)
+    user = user_cache.get(str(user_id))
+    if user is not None:
+        return user
+
+    version = user_cache.version()
+    user = await session.get(Users, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    user_cache.put(str(user_id), user, version)
     return user
 
 def get_current_admin(
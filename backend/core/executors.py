@@ -0,0 +1,62 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import torch
+
+from core.config import settings
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _init_process_worker(torch_threads: int):
+    torch.set_num_threads(torch_threads)
+    # Load the model once per worker instead of once per task
+    import core.ml_model  # noqa: F401
+
+
+def get_cpu_executor() -> Executor:
+    """
+    Shared executor for CPU-heavy steps, configured by CPU_EXECUTOR:
+      - "thread": thread pool; PIL decode and torch ops release the GIL
+      - "process": process pool, each worker with its own preloaded model
+    """
+    global _executor
+    if _executor is not None:
+        return _executor
+
+    with _executor_lock:
+        if _executor is None:
+            if settings.CPU_EXECUTOR == "process":
+                _executor = ProcessPoolExecutor(
+                    max_workers=settings.CPU_EXECUTOR_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_process_worker,
+                    initargs=(settings.TORCH_NUM_THREADS,)
+                )
+            elif settings.CPU_EXECUTOR == "thread":
+                torch.set_num_threads(settings.TORCH_NUM_THREADS)
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.CPU_EXECUTOR_WORKERS,
+                    thread_name_prefix="cpu-bound"
+                )
+            else:
+                raise ValueError(f"Unknown CPU_EXECUTOR: {settings.CPU_EXECUTOR}")
+    return _executor
+
+
+async def run_cpu_bound(fn, *args):
+    """Run fn(*args) on the CPU executor without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cpu_executor(), partial(fn, *args))
+
+
+def shutdown_cpu_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
@@ -0,0 +1,148 @@
+from math import asin, cos, degrees, radians, sin
+from typing import List, Optional, Tuple
+
+# Standard geohash base32 alphabet (no a, i, l, o)
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Precision stored on Hazard rows (~4.8m x 4.8m cells)
+GEOHASH_PRECISION = 9
+
+# Max number of prefix ranges we are willing to put in one query
+MAX_COVER_CELLS = 16
+
+EARTH_RADIUS_KM = 6371  # same as haversine_distance
+
+# Widen boxes slightly so float rounding never drops an edge point
+BOX_EPSILON_DEG = 1e-9
+
+
+def encode(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Encode a lat/lng pair into a geohash string"""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                bits = (bits << 1) | 1
+                lng_lo = mid
+            else:
+                bits <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """Return (lat_degrees, lng_degrees) covered by one cell at this precision"""
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Returns (min_lat, max_lat, min_lng, max_lng) enclosing the circle.
+    Longitude is left unbounded (-180..180) near the poles or when the box
+    would cross the antimeridian.
+    """
+    d = radius_km / EARTH_RADIUS_KM
+    d_lat = degrees(d) + BOX_EPSILON_DEG
+    min_lat = max(lat - d_lat, -90.0)
+    max_lat = min(lat + d_lat, 90.0)
+
+    # Widest longitude extent of a spherical cap centred at `lat`
+    cos_lat = cos(radians(lat))
+    if min_lat <= -90.0 or max_lat >= 90.0 or sin(d) >= cos_lat:
+        return min_lat, max_lat, -180.0, 180.0
+
+    d_lng = degrees(asin(sin(d) / cos_lat)) + BOX_EPSILON_DEG
+    min_lng = lng - d_lng
+    max_lng = lng + d_lng
+    if min_lng < -180.0 or max_lng > 180.0:
+        return min_lat, max_lat, -180.0, 180.0
+
+    return min_lat, max_lat, min_lng, max_lng
+
+
+def _cells_in_box(min_lat, max_lat, min_lng, max_lng, precision: int) -> List[str]:
+    cell_lat, cell_lng = cell_size(precision)
+
+    lats = []
+    cur = min_lat
+    while cur < max_lat:
+        lats.append(cur)
+        cur += cell_lat
+    lats.append(max_lat)
+
+    lngs = []
+    cur = min_lng
+    while cur < max_lng:
+        lngs.append(cur)
+        cur += cell_lng
+    lngs.append(max_lng)
+
+    # Stepping by exactly one cell from the min corner guarantees every cell
+    # touched by the box is sampled at least once.
+    cells = set()
+    for la in lats:
+        for ln in lngs:
+            cells.add(encode(min(la, 89.999999), min(ln, 179.999999), precision))
+            if len(cells) > MAX_COVER_CELLS:
+                return []
+    return sorted(cells)
+
+
+def covering_prefixes(min_lat, max_lat, min_lng, max_lng) -> List[str]:
+    """
+    Finest set of geohash prefixes (at most MAX_COVER_CELLS) whose union
+    covers the bounding box. Returns [] if even a single-char cover is too
+    large, in which case callers should skip the geohash filter.
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        cell_lat, cell_lng = cell_size(precision)
+        rows = (max_lat - min_lat) / cell_lat + 2
+        cols = (max_lng - min_lng) / cell_lng + 2
+        if rows * cols > MAX_COVER_CELLS * 4:
+            continue
+        cells = _cells_in_box(min_lat, max_lat, min_lng, max_lng, precision)
+        if cells:
+            return cells
+    return []
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """
+    Exclusive upper bound for a prefix range scan: the next prefix of the
+    same or shorter length in base32 order ("tsq4" -> "tsq5", "tsqz" -> "tsr").
+    Only geohash characters are compared, so the range holds under any
+    collation, not just byte order. None if the prefix is all "z" (no bound).
+    """
+    chars = list(prefix)
+    while chars:
+        last = chars.pop()
+        if last != BASE32[-1]:
+            chars.append(BASE32[BASE32.index(last) + 1])
+            return "".join(chars)
+    return None
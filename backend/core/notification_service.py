@@ -4,49 +4,284 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
 import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
 from dotenv import load_dotenv
+from core.batching import collect_batch, percentile
+from core.config import settings
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-def send_hazard_email(recipient_email: str, hazard_type: str, location: str, severity: str, instructions: str):
-    try:
-        server = os.getenv("SMTP_SERVER")
-        port = int(os.getenv("SMTP_PORT"))
-        username = os.getenv("SMTP_USERNAME")
-        password = os.getenv("SMTP_PASSWORD")
-        from_email = os.getenv("FROM_EMAIL")
-
-        message = MIMEMultipart()
-        message["From"] = f"Satraksha Hazard Alert <{from_email}>"
-        message["To"] = recipient_email
-        message["Subject"] = f"Urgent: {hazard_type} Alert in {location}"
-        message["X-Priority"] = "1"
-
-        body = f"""
+# Errors that mean the connection itself is unusable; anything else
+# (e.g. a refused recipient) is specific to the message
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError)
+
+
+class SMTPConnectionPool:
+    """
+    Keeps up to `size` authenticated SMTP connections open so STARTTLS and
+    login happen once per connection instead of once per email.
+    """
+
+    def __init__(self, host: str, port: int, username: str = None, password: str = None,
+                 size: int = 2, max_idle_s: float = 60, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.max_idle_s = max_idle_s
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo()
+            if smtp.has_extn('STARTTLS'):
+                smtp.starttls()
+                smtp.ehlo()
+            if self.username:
+                smtp.login(self.username, self.password)
+        except Exception:
+            self._close(smtp)
+            raise
+        with self._lock:
+            self.opened += 1
+        return smtp
+
+    @staticmethod
+    def _close(smtp: smtplib.SMTP):
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+    def acquire(self) -> smtplib.SMTP:
+        try:
+            smtp, last_used = self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+        if time.monotonic() - last_used > self.max_idle_s:
+            # Servers drop idle sessions; check before trusting it
+            try:
+                if smtp.noop()[0] != 250:
+                    raise smtplib.SMTPServerDisconnected("NOOP failed")
+            except Exception:
+                self._close(smtp)
+                return self._connect()
+        return smtp
+
+    def release(self, smtp: smtplib.SMTP):
+        try:
+            self._idle.put_nowait((smtp, time.monotonic()))
+        except queue.Full:
+            self._close(smtp)
+
+    def discard(self, smtp: smtplib.SMTP):
+        self._close(smtp)
+
+    def close(self):
+        while True:
+            try:
+                smtp, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(smtp)
+
+
+class EmailSender:
+    """
+    Queues outgoing messages and sends them from `workers` threads. Each
+    thread takes up to max_batch_size queued messages (waiting at most
+    max_wait_ms for the batch to fill) and sends them over one pooled
+    connection. When the connection drops it reconnects and retries the
+    message up to max_attempts times.
+    """
+
+    def __init__(self, pool: SMTPConnectionPool, workers: int = 2, max_batch_size: int = 20,
+                 max_wait_ms: float = 100, max_attempts: int = 3):
+        self.pool = pool
+        self.workers = workers
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_attempts = max_attempts
+        self._queue = queue.Queue()
+        self._threads = []
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+        self.reconnects = 0
+        self._latencies_ms = deque(maxlen=1000)
+        self._started_at = None
+
+    def start(self):
+        with self._start_lock:
+            if self._threads:
+                return
+            self._started_at = time.monotonic()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"smtp-sender-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 10):
+        """Flush queued messages, then close pooled connections"""
+        with self._start_lock:
+            for _ in self._threads:
+                self._queue.put(None)
+            for thread in self._threads:
+                thread.join(timeout)
+            self._threads = []
+        self.pool.close()
+
+    def submit(self, message) -> Future:
+        self.start()
+        future = Future()
+        self._queue.put((message, future, time.monotonic()))
+        return future
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = collect_batch(self._queue, first, self.max_batch_size, time.monotonic() + self.max_wait)
+            try:
+                self._send_batch(batch)
+            except Exception as e:
+                # Never let the thread die: fail whatever is still unresolved
+                logger.exception("SMTP sender batch failed")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _send_batch(self, batch):
+        smtp = None
+        for message, future, submitted_at in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            error = None
+            for attempt in range(self.max_attempts):
+                try:
+                    if smtp is None:
+                        smtp = self.pool.acquire()
+                    smtp.send_message(message)
+                    error = None
+                    break
+                except CONNECTION_ERRORS as e:
+                    error = e
+                    if smtp is not None:
+                        self.pool.discard(smtp)
+                        smtp = None
+                    with self._stats_lock:
+                        self.reconnects += 1
+                    time.sleep(min(0.1 * 2 ** attempt, 2))
+                except Exception as e:
+                    # Message-specific (refused recipient, bad header/address)
+                    error = e
+                    if smtp is not None and not isinstance(e, smtplib.SMTPException):
+                        # Session state is unknown after a non-SMTP error; don't reuse it
+                        self.pool.discard(smtp)
+                        smtp = None
+                    break
+
+            with self._stats_lock:
+                if error is None:
+                    self.sent += 1
+                    self._latencies_ms.append((time.monotonic() - submitted_at) * 1000)
+                else:
+                    self.failed += 1
+
+            if error is None:
+                logger.info("Email sent successfully to %s", message["To"])
+                future.set_result(None)
+            else:
+                logger.error(f"Failed to send email to {message['To']}: {error}")
+                future.set_exception(error)
+
+        if smtp is not None:
+            self.pool.release(smtp)
+        with self._stats_lock:
+            self.batches += 1
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            latencies = sorted(self._latencies_ms)
+            elapsed = time.monotonic() - self._started_at if self._started_at else 0
+
+            return {
+                "sent": self.sent,
+                "failed": self.failed,
+                "batches": self.batches,
+                "reconnects": self.reconnects,
+                "connections_opened": self.pool.opened,
+                "throughput_per_s": self.sent / elapsed if elapsed else 0.0,
+                "latency_p50_ms": percentile(latencies, 0.50),
+                "latency_p99_ms": percentile(latencies, 0.99),
+                "queue_depth": self._queue.qsize()
+            }
+
+
+def create_email_sender() -> EmailSender:
+    pool = SMTPConnectionPool(
+        os.getenv("SMTP_SERVER"),
+        int(os.getenv("SMTP_PORT", 587)),
+        os.getenv("SMTP_USERNAME"),
+        os.getenv("SMTP_PASSWORD"),
+        size=settings.SMTP_POOL_SIZE,
+        max_idle_s=settings.SMTP_MAX_IDLE_S,
+        timeout=settings.SMTP_TIMEOUT_S
+    )
+    return EmailSender(
+        pool,
+        workers=settings.SMTP_POOL_SIZE,
+        max_batch_size=settings.SMTP_BATCH_SIZE,
+        max_wait_ms=settings.SMTP_MAX_WAIT_MS,
+        max_attempts=settings.SMTP_MAX_ATTEMPTS
+    )
+
+
+email_sender = create_email_sender()
+
+
+def build_hazard_message(recipient_email: str, hazard_type: str, location: str, severity: str, instructions: str) -> MIMEMultipart:
+    from_email = os.getenv("FROM_EMAIL")
+
+    message = MIMEMultipart()
+    message["From"] = f"Satraksha Hazard Alert <{from_email}>"
+    message["To"] = recipient_email
+    message["Subject"] = f"Urgent: {hazard_type} Alert in {location}"
+    message["X-Priority"] = "1"
+
+    body = f"""
         ⚠️ URGENT HAZARD ALERT ⚠️
-        
+
         Hazard Type: {hazard_type}
         Location: {location}
         Severity Level: {severity}
-        
+
         Safety Instructions:
         {instructions}
-        
+
         ---
         This is an automated alert from the Satrakhs Hazard Monitoring System.
         """
-        message.attach(MIMEText(body, "plain"))
-
-        with smtplib.SMTP(server, port) as smtp:
-            smtp.ehlo()
-            if smtp.has_extn('STARTTLS'):
-                smtp.starttls()
-                smtp.ehlo()
-            smtp.login(username, password)
-            smtp.send_message(message)
+    message.attach(MIMEText(body, "plain"))
+    return message
 
-        logger.info("Hazard email sent successfully to %s", recipient_email)
 
-    except Exception as e:
-        logger.error(f"Failed to send hazard email: {e}")
+def send_hazard_email(recipient_email: str, hazard_type: str, location: str, severity: str, instructions: str) -> Future:
+    """Queue a hazard alert on the pooled sender; returns a Future for the delivery"""
+    message = build_hazard_message(recipient_email, hazard_type, location, severity, instructions)
+    return email_sender.submit(message)
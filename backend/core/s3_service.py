@@ -1,8 +1,11 @@
 import boto3
+from botocore.config import Config
 import os
 import uuid
 from fastapi import UploadFile
 from io import BytesIO
+from core.config import settings
+from core.ttl_cache import TTLCache
 
 # Load AWS credentials from environment variables
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
@@ -10,12 +13,21 @@ AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = os.getenv("AWS_REGION")
 AWS_BUCKET_NAME = os.getenv("AWS_BUCKET_NAME")
 
-# Initialize boto3 S3 client
+ALLOWED_CONTENT_TYPES = {"image/jpeg", "image/png"}
+
+# S3 minimum size for every multipart part except the last
+MULTIPART_PART_SIZE = 5 * 1024 * 1024
+
+# Initialize boto3 S3 client (thread-safe; shared by the storage I/O pool)
 s3 = boto3.client(
     "s3",
     region_name=AWS_REGION,
     aws_access_key_id=AWS_ACCESS_KEY_ID,
     aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+    config=Config(
+        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+        retries={"max_attempts": settings.S3_MAX_ATTEMPTS, "mode": "standard"}
+    )
 )
 
 def upload_to_s3(file: UploadFile = None, image_bytes: bytes = None, folder: str = "hazards") -> str:
@@ -25,11 +37,10 @@ def upload_to_s3(file: UploadFile = None, image_bytes: bytes = None, folder: str
     if not file and not image_bytes:
         raise ValueError("Either file or image_bytes must be provided.")
 
-    if file and file.content_type not in {"image/jpeg", "image/png"}:
+    if file and file.content_type not in ALLOWED_CONTENT_TYPES:
         raise ValueError("Unsupported file type. Please upload a JPEG or PNG image.")
 
-    ext = file.filename.split('.')[-1] if file else "jpg"
-    key = f"{folder}/{uuid.uuid4()}.{ext}"
+    key = new_object_key(file.filename if file else None, folder)
 
     try:
         if file:
@@ -51,9 +62,147 @@ def upload_to_s3(file: UploadFile = None, image_bytes: bytes = None, folder: str
 
     return key
 
+def new_object_key(filename: str = None, folder: str = "hazards") -> str:
+    ext = filename.split('.')[-1] if filename else "jpg"
+    return f"{folder}/{uuid.uuid4()}.{ext}"
+
+class S3StreamingUpload:
+    """
+    Incremental upload of a single object. Bytes are sent as a multipart
+    part as soon as a full part is available; objects smaller than one part
+    never start a multipart upload and are sent with one PUT on complete().
+
+    With retain=False at most one part is held here. With retain=True every
+    written byte is kept in `data` (e.g. for the classifier) and parts are
+    sent from that same buffer, so the image is never held twice.
+    """
+
+    def __init__(self, client, bucket: str, key: str, content_type: str,
+                 part_size: int = MULTIPART_PART_SIZE, retain: bool = False):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.content_type = content_type
+        self.part_size = part_size
+        self.retain = retain
+        self.upload_id = None
+        self._parts = []
+        self._buffer = bytearray()
+        self._sent = 0  # offset in _buffer of the first byte not yet uploaded
+
+    @property
+    def data(self) -> bytearray:
+        return self._buffer
+
+    def write_blocks(self, size: int) -> bool:
+        """Whether write() of `size` more bytes sends a part (network I/O)"""
+        return len(self._buffer) - self._sent + size >= self.part_size
+
+    def write(self, chunk: bytes):
+        self._buffer.extend(chunk)
+        while len(self._buffer) - self._sent >= self.part_size:
+            self._flush_part(self.part_size)
+
+    def _flush_part(self, size: int):
+        with memoryview(self._buffer) as view:
+            part = bytes(view[self._sent:self._sent + size])
+        self._upload_part(part)
+        if self.retain:
+            self._sent += size
+        else:
+            del self._buffer[:size]
+
+    def _upload_part(self, data: bytes):
+        try:
+            if self.upload_id is None:
+                resp = self.client.create_multipart_upload(
+                    Bucket=self.bucket, Key=self.key, ContentType=self.content_type
+                )
+                self.upload_id = resp["UploadId"]
+            part_number = len(self._parts) + 1
+            resp = self.client.upload_part(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self.upload_id,
+                PartNumber=part_number,
+                Body=data
+            )
+            self._parts.append({"ETag": resp["ETag"], "PartNumber": part_number})
+        except Exception as e:
+            raise RuntimeError(f"Failed to upload to S3: {str(e)}")
+
+    def complete(self) -> str:
+        """Flush the remaining bytes and return the S3 key"""
+        try:
+            if self.upload_id is None:
+                self.client.put_object(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    Body=self._buffer,
+                    ContentType=self.content_type
+                )
+            else:
+                remaining = len(self._buffer) - self._sent
+                if remaining:
+                    self._flush_part(remaining)
+                self.client.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=self.upload_id,
+                    MultipartUpload={"Parts": self._parts}
+                )
+                self.upload_id = None
+        except Exception as e:
+            raise RuntimeError(f"Failed to upload to S3: {str(e)}")
+        return self.key
+
+    def abort(self):
+        """Discard any parts already sent"""
+        if self.upload_id is not None:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id
+            )
+            self.upload_id = None
+
+class PresignedUrlCache:
+    """
+    LRU cache of presigned GET URLs keyed by (s3_key, expires_in).
+    A URL is reused for `reuse_fraction` of its lifetime and re-signed
+    after that, so clients never receive a URL that is about to expire.
+    Returning the same URL across list calls also lets browsers cache images.
+    """
+
+    def __init__(self, client, bucket: str, maxsize: int = 10000, reuse_fraction: float = 0.8):
+        self.client = client
+        self.bucket = bucket
+        self.reuse_fraction = reuse_fraction
+        self._urls = TTLCache(maxsize)  # (key, expires_in) -> url
+
+    def get(self, s3_key: str, expires_in: int = 3600) -> str:
+        cache_key = (s3_key, expires_in)
+        url = self._urls.get(cache_key)
+        if url is not None:
+            return url
+
+        url = self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": s3_key},
+            ExpiresIn=expires_in
+        )
+        self._urls.put(cache_key, url, ttl_s=expires_in * self.reuse_fraction)
+        return url
+
+    def stats(self) -> dict:
+        return self._urls.stats()
+
+
+presigned_url_cache = PresignedUrlCache(
+    s3,
+    AWS_BUCKET_NAME,
+    maxsize=settings.PRESIGNED_URL_CACHE_SIZE,
+    reuse_fraction=settings.PRESIGNED_URL_REUSE_FRACTION
+)
+
+
 def get_presigned_url(s3_key: str, expires_in: int = 3600) -> str:
-    return s3.generate_presigned_url(
-        "get_object",
-        Params={"Bucket": AWS_BUCKET_NAME, "Key": s3_key},
-        ExpiresIn=expires_in
-    )
+    return presigned_url_cache.get(s3_key, expires_in)
@@ -2,7 +2,14 @@ from passlib.context import CryptContext
 from jose import jwt
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from functools import partial
+from typing import Optional, Tuple
+from core.config import settings
+import asyncio
 import os
+import threading
 
 load_dotenv()
 
@@ -10,7 +17,20 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS
+)
+
+# bcrypt releases the GIL, so a small dedicated pool keeps a login storm
+# off the FastAPI threadpool and the event loop
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_hash_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
@@ -18,6 +38,35 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """(valid, new_hash): new_hash is set when the stored hash uses an outdated cost"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+async def _run_hashing(fn, *args):
+    if not _hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="Too many sign-in attempts, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    # Free the slot when the hash finishes, even if the request was cancelled
+    try:
+        future = _hash_executor.submit(partial(fn, *args))
+    except RuntimeError:
+        _hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return await asyncio.wrap_future(future)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hashing(get_password_hash, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await _run_hashing(verify_and_update_password, plain_password, hashed_password)
+
+def shutdown_hash_executor():
+    _hash_executor.shutdown(wait=True)
+
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -0,0 +1,55 @@
+import io
+import os
+from typing import Dict, Iterable
+
+from PIL import Image, ImageOps
+
+FORMATS = {
+    "webp": ("WEBP", "webp", "image/webp"),
+    "jpeg": ("JPEG", "jpg", "image/jpeg"),
+}
+
+
+def parse_widths(value: str) -> list:
+    """'320,640' -> [320, 640]"""
+    return sorted({int(w) for w in value.split(",") if w.strip()})
+
+
+def content_type(fmt: str) -> str:
+    return FORMATS[fmt][2]
+
+
+def thumbnail_key(key: str, width: int, fmt: str) -> str:
+    """hazards/<uuid>.jpg -> hazards/<uuid>_w320.webp"""
+    root, _ = os.path.splitext(key)
+    return f"{root}_w{width}.{FORMATS[fmt][1]}"
+
+
+def render_thumbnails(image_bytes: bytes, widths: Iterable[int], fmt: str = "webp", quality: int = 75) -> Dict[int, bytes]:
+    """
+    Decode once and encode one variant per width, largest first, each
+    resized from the previous variant. Images are never upscaled.
+    """
+    pil_format = FORMATS[fmt][0]
+    widths = sorted(widths, reverse=True)
+
+    img = Image.open(io.BytesIO(image_bytes))
+    # JPEG only: DCT-domain downscale while decoding. Requesting a square
+    # keeps both sides large enough whatever the EXIF orientation.
+    img.draft("RGB", (widths[0], widths[0]))
+    img = ImageOps.exif_transpose(img)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+
+    variants = {}
+    for width in widths:
+        if img.width > width:
+            height = max(1, round(img.height * width / img.width))
+            img = img.resize((width, height), Image.LANCZOS)
+        out = io.BytesIO()
+        if pil_format == "JPEG":
+            img.save(out, pil_format, quality=quality, optimize=True, progressive=True)
+        else:
+            img.save(out, pil_format, quality=quality)
+        variants[width] = out.getvalue()
+    return variants
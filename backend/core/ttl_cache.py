@@ -0,0 +1,58 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe bounded LRU with optional per-entry expiry and hit/miss
+    counters. ttl_s=None keeps entries until they are evicted; put() can
+    override the TTL per entry. The caches built on it only decide their
+    keys, values and lifetimes.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl_s: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires_at or None, value)
+        self._lock = Lock()
+
+    def get(self, key: Hashable):
+        """Returns the cached value, or None on a miss or expired entry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value, ttl_s: Optional[float] = None):
+        ttl_s = self.ttl_s if ttl_s is None else ttl_s
+        expires_at = time.monotonic() + ttl_s if ttl_s is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize
+            }
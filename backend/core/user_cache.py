@@ -0,0 +1,50 @@
+from threading import Lock
+from typing import Optional
+
+from core.config import settings
+from core.ttl_cache import TTLCache
+from models.users import Users
+
+USER_FIELDS = ("id", "name", "email", "password_hash", "role", "created_at")
+
+
+class UserCache:
+    """
+    Bounded LRU of user records keyed by the token's `sub`, so
+    authenticated requests skip the users-table lookup. Entries expire
+    after ttl_s; services invalidate a user on profile change or delete.
+    Invalidation only reaches this process, so other workers may serve a
+    changed or deleted user for up to ttl_s.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl_s: float = 60):
+        self._records = TTLCache(maxsize, ttl_s)  # sub -> field dict
+        self._version = 0  # bumped on every invalidation
+        self._lock = Lock()
+
+    def get(self, sub: str) -> Optional[Users]:
+        """A fresh, session-less Users built from the cached record, or None on a miss"""
+        fields = self._records.get(sub)
+        return Users(**fields) if fields is not None else None
+
+    def version(self) -> int:
+        """Read before loading a user; pass to put() so a concurrent invalidation wins"""
+        with self._lock:
+            return self._version
+
+    def put(self, sub: str, user: Users, version: int):
+        fields = {name: getattr(user, name) for name in USER_FIELDS}
+        with self._lock:
+            if version == self._version:
+                self._records.put(sub, fields)
+
+    def invalidate(self, sub: str):
+        with self._lock:
+            self._records.pop(sub)
+            self._version += 1
+
+    def stats(self) -> dict:
+        return self._records.stats()
+
+
+user_cache = UserCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL_S)
@@ -5,6 +5,7 @@ from models.comment import Comment
 from models.vote import Vote
 from models.notification import Notification
 from models.forwarded_report import ForwardedReport
+import models.event_listeners  # noqa: F401  Hazard.geohash is NOT NULL; set on every insert
 
 
 all_models = [
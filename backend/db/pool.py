@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Checkout wait times and counters for one engine's connection pool"""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._waits_ms = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidated = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self._waits_ms.append(seconds * 1000)
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits_ms)
+
+            def pct(p):
+                if not waits:
+                    return 0.0
+                return waits[min(len(waits) - 1, int(p * len(waits)))]
+
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidated": self.invalidated,
+                "wait_p50_ms": pct(0.50),
+                "wait_p99_ms": pct(0.99),
+                "wait_max_ms": waits[-1] if waits else 0.0
+            }
+
+
+def timed_queue_pool(metrics: PoolMetrics, base=QueuePool):
+    """
+    QueuePool subclass that records how long each checkout waited for a
+    connection (including opening a new one). The metrics live on the
+    class so they survive engine.dispose() recreating the pool.
+    """
+
+    class TimedQueuePool(base):
+        _metrics = metrics
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                entry = super()._do_get()
+            except PoolTimeoutError:
+                self._metrics.record_wait(time.perf_counter() - start, timed_out=True)
+                raise
+            self._metrics.record_wait(time.perf_counter() - start)
+            return entry
+
+    return TimedQueuePool
+
+
+def instrument_engine(engine, metrics: PoolMetrics):
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        with metrics._lock:
+            metrics.connects += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        with metrics._lock:
+            metrics.invalidated += 1
+
+
+def pool_gauges(engine) -> dict:
+    """Point-in-time pool occupancy; QueuePool only"""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "open": pool.size() + pool.overflow(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow
+    }
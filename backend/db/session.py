@@ -1,13 +1,156 @@
+import itertools
+from fastapi import Request
 from sqlmodel import SQLModel, Session, create_engine
-import os
-from dotenv import load_dotenv
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from core.config import settings
+from db.pool import PoolMetrics, instrument_engine, pool_gauges, timed_queue_pool
 
-load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+def create_db_engine(database_url: str = None, metrics: PoolMetrics = None):
+    """
+    Engine configured from Settings. Each uvicorn worker holds up to
+    DB_POOL_SIZE + DB_MAX_OVERFLOW connections, so keep
+    workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) below the server's
+    max_connections. SQL echo is only on in the debug profile.
+    """
+    url = make_url(database_url or settings.DATABASE_URL)
+    echo = settings.DB_ECHO or settings.APP_PROFILE == "debug"
+
+    if url.get_backend_name() == "sqlite":
+        # Tests/benchmarks: SQLite keeps SQLAlchemy's default pool
+        return create_engine(url, echo=echo, connect_args={"check_same_thread": False})
+
+    metrics = metrics or PoolMetrics()
+    connect_args = {}
+    if url.get_backend_name() == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
+    engine = create_engine(
+        url,
+        echo=echo,
+        poolclass=timed_queue_pool(metrics),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_S,
+        pool_recycle=settings.DB_POOL_RECYCLE_S,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args
+    )
+    engine.pool_metrics = metrics
+    instrument_engine(engine, metrics)
+    return engine
+
+
+engine = create_db_engine()
+
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(database_url: str):
+    """DATABASE_URL with its driver swapped for the async one"""
+    url = make_url(database_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+def create_async_db_engine(database_url: str = None, metrics: PoolMetrics = None):
+    """
+    Async counterpart of create_db_engine (asyncpg, aiosqlite for tests)
+    with the same pool settings. It is a separate pool, so count it when
+    sizing max_connections.
+    """
+    url = make_url(database_url or settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL))
+    echo = settings.DB_ECHO or settings.APP_PROFILE == "debug"
+
+    if url.get_backend_name() == "sqlite":
+        return create_async_engine(url, echo=echo)
+
+    metrics = metrics or PoolMetrics()
+    connect_args = {}
+    if url.drivername == "postgresql+asyncpg" and settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+
+    async_engine = create_async_engine(
+        url,
+        echo=echo,
+        poolclass=timed_queue_pool(metrics, base=AsyncAdaptedQueuePool),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_S,
+        pool_recycle=settings.DB_POOL_RECYCLE_S,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args
+    )
+    async_engine.sync_engine.pool_metrics = metrics
+    instrument_engine(async_engine.sync_engine, metrics)
+    return async_engine
+
+
+async_engine = create_async_db_engine()
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def parse_urls(value: str) -> list:
+    """'sqlite:///a.db, sqlite:///b.db' -> ['sqlite:///a.db', 'sqlite:///b.db']"""
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+class RoundRobin:
+    """Hands out the replica engines in turn; with none, the primary"""
+
+    def __init__(self, engines: list, primary):
+        self.engines = engines
+        self.primary = primary
+        self._counter = itertools.count()
+
+    def next(self):
+        if not self.engines:
+            return self.primary
+        return self.engines[next(self._counter) % len(self.engines)]
+
+
+replica_urls = parse_urls(settings.DB_REPLICA_URLS)
+read_engines = RoundRobin([create_db_engine(url) for url in replica_urls], engine)
+async_read_engines = RoundRobin(
+    [create_async_db_engine(async_database_url(url)) for url in replica_urls],
+    async_engine
+)
+
+
+def pool_stats(engine=engine) -> dict:
+    stats = pool_gauges(engine)
+    metrics = getattr(engine, "pool_metrics", None)
+    if metrics is not None:
+        stats.update(metrics.stats())
+    return stats
 
-engine = create_engine(DATABASE_URL, echo=True)
 
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+def get_read_session(request: Request):
+    """
+    Session on the next read replica for safe requests, the primary
+    otherwise. Replicas lag the primary, so handlers that must see the
+    caller's own recent writes (e.g. /mine after a report) use get_session.
+    """
+    bind = read_engines.next() if request.method in SAFE_METHODS else engine
+    with Session(bind) as session:
+        yield session
+
+
+async def get_async_read_session(request: Request):
+    """get_read_session for async handlers"""
+    bind = async_read_engines.next() if request.method in SAFE_METHODS else async_engine
+    async with AsyncSession(bind, expire_on_commit=False) as session:
+        yield session
@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 from api.auth import router as auth_router
 from api.users import router as user_router
 from api.hazard import router as hazard_router
@@ -7,6 +8,20 @@ from api.comment import router as comment_router
 from api.files import router as files_router
 from api.location import router as location_router
 from api.votes import router as vote_router
+from api.metrics import router as metrics_router
+import models.event_listeners  # registers Hazard geohash/updated_at hooks
+from sqlmodel import Session
+from db.session import engine
+from services.location_service import rebuild_location_grid
+from core.batch_inference import pothole_worker
+from core.executors import shutdown_cpu_executor
+from core.security import shutdown_hash_executor
+from services.upload_queue import upload_spool
+from services.thumbnail_service import thumbnail_worker
+from services.vote_buffer import vote_buffer
+from core.config import settings
+from db.session import async_engine, async_read_engines
+import os
 
 app = FastAPI()
 
@@ -23,6 +38,57 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+def load_location_grid():
+    with Session(engine) as session:
+        rebuild_location_grid(session)
+
+
+@app.on_event("startup")
+def start_inference_worker():
+    pothole_worker.start()
+
+
+@app.on_event("startup")
+def start_thumbnail_worker():
+    if settings.THUMBNAILS_ENABLED:
+        thumbnail_worker.start()
+
+
+@app.on_event("startup")
+def start_vote_buffer():
+    if settings.VOTE_BUFFER_ENABLED:
+        vote_buffer.start()
+
+
+@app.on_event("startup")
+def start_upload_spool():
+    if settings.UPLOAD_SPOOL_ENABLED:
+        upload_spool.start()
+
+
+@app.on_event("shutdown")
+def stop_cpu_workers():
+    pothole_worker.stop()
+    shutdown_cpu_executor()
+    upload_spool.stop()
+    thumbnail_worker.stop()
+    vote_buffer.stop()
+    shutdown_hash_executor()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await async_engine.dispose()
+    for replica in async_read_engines.engines:
+        await replica.dispose()
+
+
+if settings.STORAGE_BACKEND == "local":
+    os.makedirs(settings.LOCAL_STORAGE_DIR, exist_ok=True)
+    app.mount(settings.LOCAL_STORAGE_URL, StaticFiles(directory=settings.LOCAL_STORAGE_DIR), name="media")
+
+
 app.include_router(auth_router, prefix="/api/auth", tags=["Auth"])
 app.include_router(user_router, prefix="/api/users", tags=["Users"])
 app.include_router(hazard_router, prefix="/api/hazards", tags=["Hazards"])
@@ -30,3 +96,4 @@ app.include_router(comment_router, prefix="/api/comments", tags=["Comments"])
 app.include_router(files_router, prefix="/api/files", tags=["Files"])
 app.include_router(location_router, prefix="/api/location", tags=["Location"])
 app.include_router(vote_router, prefix="/api/votes", tags=["Votes"])
+app.include_router(metrics_router, prefix="/api/metrics", tags=["Metrics"])
@@ -1,8 +1,14 @@
 from sqlalchemy import event
 from sqlalchemy.orm import mapper
 from models.hazard import Hazard
+from core.geohash import encode
 from datetime import datetime
 
+@event.listens_for(Hazard, "before_insert", propagate=True)
+def receive_before_insert(mapper, connection, target):
+    target.geohash = encode(target.lat, target.lng)
+
 @event.listens_for(Hazard, "before_update", propagate=True)
 def receive_before_update(mapper, connection, target):
     target.updated_at = datetime.utcnow()
+    target.geohash = encode(target.lat, target.lng)
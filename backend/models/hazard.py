@@ -1,20 +1,36 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
 from uuid import UUID
 from typing import Optional
 from datetime import datetime
 
 
 class Hazard(SQLModel, table=True):
+    """
+    A reported road hazard. `geohash` is NOT NULL but never set by callers:
+    the ORM listeners in models/event_listeners.py fill it from lat/lng on
+    insert and update, so core-level inserts must supply it themselves.
+    """
+
     __tablename__ = "hazard"
+    __table_args__ = (
+        Index("ix_hazard_geohash_lat_lng", "geohash", "lat", "lng"),
+        Index("ix_hazard_created_at_id", "created_at", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     lat: float = Field(index=True)
     lng: float = Field(index=True)
+    geohash: str = Field(max_length=12)  # Set from lat/lng by models/event_listeners.py
     hazard_type: str = Field(max_length=50, index=True)
     description: Optional[str] = Field(default=None, max_length=500)
-    photo_url: str = Field(max_length=2048)  # Required
+    photo_url: str = Field(max_length=2048)  # Required; "" while photo_status is "pending"
+    photo_status: str = Field(default="uploaded", max_length=20)  # 'pending', 'uploaded', 'failed'
+    thumbnails: Optional[str] = Field(default=None, max_length=1024)  # JSON {"<width>": "<key>"}, set by the thumbnail worker
     status: str = Field(default="unresolved", max_length=50, index=True)
     source: str = Field(default="user", max_length=50)
+    upvotes: int = Field(default=0)  # Maintained by vote_service; see reconcile_vote_counts
+    downvotes: int = Field(default=0)
     reported_by: UUID = Field(foreign_key="users.id")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
 from uuid import UUID
 from datetime import datetime
 from typing import Optional
@@ -16,8 +17,12 @@ class UserLocation(SQLModel, table=True):
 
 class UserCurrentLocation(SQLModel, table=True):
     __tablename__ = "user_current_location"
-    
+    __table_args__ = (
+        # Bounding-box lookups of users near a new hazard (alert fan-out)
+        Index("ix_user_current_location_lat_lng", "lat", "lng"),
+    )
+
     user_id: UUID = Field(primary_key=True, foreign_key="users.id")
     lat: float
     lng: float
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, index=True)  # Watermark for location grid syncs
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
 from uuid import UUID
 from typing import Optional
 from datetime import datetime
@@ -6,10 +7,26 @@ from datetime import datetime
 
 class Notification(SQLModel, table=True):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Dispatcher claim query: status = 'pending' AND next_attempt_at <= now
+        Index("ix_notifications_status_next_attempt_at", "status", "next_attempt_at"),
+        # Fan-out dedup lookup: same area within the dedup window
+        Index("ix_notifications_dedup_key_created_at", "dedup_key", "created_at"),
+        # One alert per user, area and dedup window, even when fan-outs race
+        Index("ux_notifications_user_id_dedup_key_window_bucket", "user_id", "dedup_key", "window_bucket", unique=True),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: UUID = Field(foreign_key="users.id")
     report_id: int = Field(foreign_key="hazard.id")
     type: str = Field(max_length=50)  # 'web_push', 'email', 'sms'
-    status: str = Field(default="pending", max_length=50)
+    status: str = Field(default="pending", max_length=50)  # 'pending', 'sent', 'failed'
+    recipient: Optional[str] = Field(default=None, max_length=255)  # Email address; NULL = look up from user_id
+    dedup_key: Optional[str] = Field(default=None, max_length=32)  # Alert area, e.g. 'area:tsq4x'
+    window_bucket: Optional[int] = None  # Dedup window number (epoch minutes // window); NULL = never deduplicated
+    payload: Optional[str] = Field(default=None, max_length=2000)  # JSON message fields
+    attempts: int = Field(default=0)
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)  # Also the claim lease while sending
+    last_error: Optional[str] = Field(default=None, max_length=500)
+    sent_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
 from uuid import UUID
 from typing import Optional
 from datetime import datetime
@@ -6,6 +7,10 @@ from datetime import datetime
 
 class Vote(SQLModel, table=True):
     __tablename__ = "votes"
+    __table_args__ = (
+        # One vote per user per report; also the ON CONFLICT target
+        Index("ux_votes_user_id_report_id", "user_id", "report_id", unique=True),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: UUID = Field(foreign_key="users.id")
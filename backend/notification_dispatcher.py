@@ -0,0 +1,34 @@
+import logging
+import signal
+import threading
+
+from core.config import settings
+from core.notification_service import email_sender
+from db.session import engine
+from services.outbox_service import NotificationDispatcher, parse_rate_limits
+
+logger = logging.getLogger("notification_dispatcher")
+
+# Outbox dispatcher, run separately from the API workers:
+#   python notification_dispatcher.py
+# Start as many copies as needed; rows are claimed with SKIP LOCKED.
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    dispatcher = NotificationDispatcher(
+        engine,
+        email_sender,
+        batch_size=settings.NOTIFY_BATCH_SIZE,
+        poll_interval_s=settings.NOTIFY_POLL_INTERVAL_S,
+        lease_s=settings.NOTIFY_LEASE_S,
+        max_attempts=settings.NOTIFY_MAX_ATTEMPTS,
+        rate_limits=parse_rate_limits(settings.NOTIFY_RATE_LIMITS)
+    )
+    try:
+        dispatcher.run(stop)
+    finally:
+        email_sender.stop()
+        logger.info("Notification dispatcher stopped: %s", dispatcher.stats())
@@ -0,0 +1,22 @@
+import torch
+
+from core.ml_model import (
+    load_eager_model,
+    build_scripted_model,
+    build_quantized_model,
+    SCRIPTED_MODEL_PATH,
+    QUANTIZED_MODEL_PATH,
+)
+
+# Export TorchScript and int8-quantized variants of the trained classifier.
+# Select one at runtime with ML_MODEL_FORMAT=scripted|quantized.
+if __name__ == "__main__":
+    eager = load_eager_model()
+
+    scripted = build_scripted_model(eager)
+    torch.jit.save(scripted, SCRIPTED_MODEL_PATH)
+    print(f"Saved scripted model to {SCRIPTED_MODEL_PATH}")
+
+    quantized = build_quantized_model(load_eager_model())
+    torch.jit.save(quantized, QUANTIZED_MODEL_PATH)
+    print(f"Saved quantized model to {QUANTIZED_MODEL_PATH}")
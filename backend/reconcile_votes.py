@@ -0,0 +1,11 @@
+from sqlmodel import Session
+
+from db.session import engine
+from services.vote_service import reconcile_vote_counts
+
+# Fix drift between hazard.upvotes/downvotes and the votes table.
+# Safe to run while the API is serving; schedule it e.g. nightly.
+if __name__ == "__main__":
+    with Session(engine) as session:
+        fixed = reconcile_vote_counts(session)
+    print(f"Reconciled vote counters on {fixed} hazards")
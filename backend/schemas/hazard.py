@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 class HazardBase(BaseModel):
     lat: float
@@ -17,6 +17,10 @@ class HazardCreate(HazardBase):
 
 class HazardRead(HazardBase):
     id: int
+    photo_status: Optional[str] = "uploaded"
+    upvotes: int = 0
+    downvotes: int = 0
+    thumbnails: Dict[str, str] = {}  # width -> presigned URL, empty until rendered
     reported_by: UUID
     created_at: datetime
     updated_at: datetime
@@ -24,6 +28,10 @@ class HazardRead(HazardBase):
     class Config:
         orm_mode = True
 
+class HazardPage(BaseModel):
+    items: List[HazardRead]
+    next_cursor: Optional[str] = None  # None when there are no more pages
+
 class HazardStatusUpdate(BaseModel):
     status: str
 
@@ -32,3 +40,7 @@ class HazardWithVotes(HazardRead):
     upvotes: int
     downvotes: int
     userVote: Optional[str] = None
+
+class HazardFeedPage(BaseModel):
+    items: List[HazardWithVotes]
+    next_cursor: Optional[str] = None
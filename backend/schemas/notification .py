@@ -16,6 +16,10 @@ class NotificationResponse(BaseModel):
     report_id: int
     type: str
     status: str
+    recipient: Optional[str] = None
+    attempts: int = 0
+    last_error: Optional[str] = None
+    sent_at: Optional[datetime] = None
     created_at: datetime
 
     class Config:
@@ -1,17 +1,25 @@
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from schemas.users import UserCreate
 from models.users import Users
-from core.security import get_password_hash, create_access_token, verify_password
+from core.user_cache import user_cache
+from core.security import get_password_hash_async, create_access_token, verify_and_update_password_async
 from fastapi import HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 
-def register_user(session: Session, user_data: UserCreate):
-    existing = session.exec(select(Users).where(Users.email == user_data.email)).first()
+def token_claims(user: Users) -> dict:
+    # role/name are for clients; the server authorizes from the user record
+    return {"sub": str(user.id), "role": user.role, "name": user.name}
+
+async def register_user(session: AsyncSession, user_data: UserCreate):
+    existing = (await session.exec(select(Users).where(Users.email == user_data.email))).first()
     if existing:
         raise HTTPException(status_code=400, detail="Email already exists")
+    # End the read transaction so no connection is held while bcrypt runs
+    await session.commit()
 
     
-    hashed = get_password_hash(user_data.password)
+    hashed = await get_password_hash_async(user_data.password)
     user = Users(
         name=user_data.name,
         email=user_data.email,
@@ -20,11 +28,11 @@ def register_user(session: Session, user_data: UserCreate):
 
     
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
 
     
-    token = create_access_token(data={"sub": str(user.id)})
+    token = create_access_token(data=token_claims(user))
 
     return {
         "access_token": token,
@@ -38,24 +46,26 @@ def register_user(session: Session, user_data: UserCreate):
         }
     }
 
-def authenticate_user(session: Session, form_data: OAuth2PasswordRequestForm):
-    print("Username:", form_data.username)
-    print("Password:", form_data.password)
-
-    
-    user = session.exec(select(Users).where(Users.email == form_data.username)).first()
+async def authenticate_user(session: AsyncSession, form_data: OAuth2PasswordRequestForm):
+    user = (await session.exec(select(Users).where(Users.email == form_data.username))).first()
     if not user:
-        print("No user found with this email")
-    else:
-        print("User found:", user.email)
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    # End the read transaction so no connection is held while bcrypt runs
+    await session.commit()
 
-    
-    if not user or not verify_password(form_data.password, user.password_hash):
-        print("Invalid password")
+    valid, new_hash = await verify_and_update_password_async(form_data.password, user.password_hash)
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    if new_hash:
+        # Stored with an older bcrypt cost; upgrade while we have the password
+        user.password_hash = new_hash
+        session.add(user)
+        await session.commit()
+        user_cache.invalidate(str(user.id))
+
     
-    token = create_access_token(data={"sub": str(user.id)})
+    token = create_access_token(data=token_claims(user))
 
     return {
         "access_token": token,
@@ -1,4 +1,5 @@
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from uuid import UUID
 from fastapi import HTTPException
 from models.comment import Comment
@@ -19,11 +20,18 @@ def create_comment(session: Session, user_id: UUID, comment_data: CommentCreate)
     return new_comment
 
 
-def get_comments_by_report(session: Session, report_id: int):
-    statement = (
+def _comments_by_report_statement(report_id: int):
+    return (
         select(Comment)
         .where(Comment.report_id == report_id)
         .options(selectinload(Comment.user))  
         .order_by(Comment.created_at.desc())
     )
-    return session.exec(statement).all()
+
+
+def get_comments_by_report(session: Session, report_id: int):
+    return session.exec(_comments_by_report_statement(report_id)).all()
+
+
+async def get_comments_by_report_async(session: AsyncSession, report_id: int):
+    return (await session.exec(_comments_by_report_statement(report_id))).all()
@@ -1,7 +1,19 @@
-from sqlmodel import Session
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import and_, or_
+from fastapi import HTTPException
 from models.hazard import Hazard
+from models.vote import Vote
+from core.storage import get_presigned_url
+from core.config import settings
+from services.vote_buffer import vote_buffer
+from core.geohash import bounding_box, covering_prefixes, prefix_upper_bound
+from services.location_service import within_radius, nearest_k
 from uuid import UUID
 from datetime import datetime
+from typing import List, Optional, Tuple
+import base64
+import json
 
 def create_hazard(
     lat: float,
@@ -10,7 +22,9 @@ def create_hazard(
     description: str,
     photo_url: str,
     user_id: UUID,
-    session: Session
+    session: Session,
+    photo_status: str = "uploaded",
+    commit: bool = True
 ) -> Hazard:
     hazard = Hazard(
         lat=lat,
@@ -18,12 +32,195 @@ def create_hazard(
         hazard_type=hazard_type,
         description=description,
         photo_url=photo_url,
+        photo_status=photo_status,
         reported_by=user_id,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow()
     )
 
     session.add(hazard)
+    if not commit:
+        # Caller adds related rows (e.g. outbox notifications) and commits
+        session.flush()
+        return hazard
     session.commit()
     session.refresh(hazard)
     return hazard
+
+
+def hazard_with_urls(hazard: Hazard) -> dict:
+    """HazardRead payload with presigned URLs for the photo and each thumbnail"""
+    data = hazard.model_dump()
+    data["photo_url"] = get_presigned_url(hazard.photo_url)
+    variants = json.loads(hazard.thumbnails) if hazard.thumbnails else {}
+    data["thumbnails"] = {width: get_presigned_url(key) for width, key in variants.items()}
+    if settings.VOTE_BUFFER_ENABLED:
+        # Include votes still waiting in the write-behind buffer
+        for column, change in vote_buffer.count_delta(hazard.id).items():
+            data[column] += change
+    return data
+
+
+def get_hazards_near_location(
+    session: Session,
+    lat: float,
+    lng: float,
+    radius_km: float = 3,
+    limit: Optional[int] = None
+) -> List[Hazard]:
+    """
+    Spatial lookup in three steps:
+      1. geohash prefix ranges covering the search box (composite index)
+      2. lat/lng bounding box (lat/lng indexes)
+      3. exact haversine check on the remaining candidates
+    With `limit`, only the nearest `limit` hazards are returned, closest first.
+    """
+    candidates = session.exec(_nearby_statement(lat, lng, radius_km)).all()
+    return _filter_nearby(candidates, lat, lng, radius_km, limit)
+
+
+async def get_hazards_near_location_async(
+    session: AsyncSession,
+    lat: float,
+    lng: float,
+    radius_km: float = 3,
+    limit: Optional[int] = None
+) -> List[Hazard]:
+    """get_hazards_near_location on an AsyncSession"""
+    candidates = (await session.exec(_nearby_statement(lat, lng, radius_km))).all()
+    return _filter_nearby(candidates, lat, lng, radius_km, limit)
+
+
+def _nearby_statement(lat: float, lng: float, radius_km: float):
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+
+    statement = select(Hazard).where(
+        Hazard.lat >= min_lat,
+        Hazard.lat <= max_lat,
+        Hazard.lng >= min_lng,
+        Hazard.lng <= max_lng,
+    )
+
+    prefixes = covering_prefixes(min_lat, max_lat, min_lng, max_lng)
+    if prefixes:
+        statement = statement.where(or_(*(_prefix_range(p) for p in prefixes)))
+
+    return statement.order_by(Hazard.id)
+
+
+def _prefix_range(prefix: str):
+    upper = prefix_upper_bound(prefix)
+    if upper is None:
+        return Hazard.geohash >= prefix
+    return and_(Hazard.geohash >= prefix, Hazard.geohash < upper)
+
+
+def _filter_nearby(candidates: List[Hazard], lat: float, lng: float, radius_km: float, limit: Optional[int]) -> List[Hazard]:
+    lats = [h.lat for h in candidates]
+    lngs = [h.lng for h in candidates]
+    mask, _ = within_radius(lat, lng, lats, lngs, radius_km)
+    nearby = [h for h, keep in zip(candidates, mask) if keep]
+
+    if limit is not None:
+        order = nearest_k(lat, lng, [h.lat for h in nearby], [h.lng for h in nearby], limit)
+        nearby = [nearby[i] for i in order]
+    return nearby
+
+
+def encode_cursor(hazard: Hazard) -> str:
+    raw = json.dumps({"c": hazard.created_at.isoformat(), "i": hazard.id})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["c"]), int(data["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def list_hazards_page(
+    session: Session,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    hazard_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None
+) -> Tuple[List[Hazard], Optional[str]]:
+    """
+    Keyset pagination over (created_at, id), newest first. Each page is a
+    range scan on ix_hazard_created_at_id, so deep pages cost the same as
+    the first one (unlike OFFSET).
+    """
+    statement = _page_statement(
+        select(Hazard), limit, cursor, status, hazard_type, created_after, created_before
+    )
+    hazards = session.exec(statement).all()
+
+    next_cursor = None
+    if len(hazards) > limit:
+        hazards = hazards[:limit]
+        next_cursor = encode_cursor(hazards[-1])
+    return hazards, next_cursor
+
+
+def list_feed_page(
+    session: Session,
+    user_id: UUID,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    hazard_type: Optional[str] = None
+) -> Tuple[List[Tuple[Hazard, Optional[str]]], Optional[str]]:
+    """
+    Same pages as list_hazards_page, each hazard paired with the caller's
+    vote_type (or None). Totals come from the hazard's counter columns, so
+    the whole page is one query with a single LEFT JOIN on votes.
+    """
+    statement = _page_statement(
+        select(Hazard, Vote.vote_type).outerjoin(
+            Vote, and_(Vote.report_id == Hazard.id, Vote.user_id == user_id)
+        ),
+        limit, cursor, status, hazard_type
+    )
+    rows = session.exec(statement).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][0])
+    return rows, next_cursor
+
+
+def _page_statement(
+    statement,
+    limit: int,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    hazard_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None
+):
+    if status:
+        statement = statement.where(Hazard.status == status)
+    if hazard_type:
+        statement = statement.where(Hazard.hazard_type == hazard_type)
+    if created_after:
+        statement = statement.where(Hazard.created_at >= created_after)
+    if created_before:
+        statement = statement.where(Hazard.created_at < created_before)
+
+    if cursor:
+        last_created_at, last_id = decode_cursor(cursor)
+        statement = statement.where(
+            or_(
+                Hazard.created_at < last_created_at,
+                and_(Hazard.created_at == last_created_at, Hazard.id < last_id)
+            )
+        )
+
+    # Fetch one extra row to know whether another page exists
+    return statement.order_by(Hazard.created_at.desc(), Hazard.id.desc()).limit(limit + 1)
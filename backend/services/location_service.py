@@ -1,8 +1,18 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Optional
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.location import UserCurrentLocation
 from schemas.location import UserCurrentLocationUpdate
-from math import radians, cos, sin, asin, sqrt
+from core.config import settings
+from core.geohash import bounding_box
+from math import radians, cos, sin, asin, sqrt, floor
+import numpy as np
+import time
+
+# Grid cell size in degrees (~2.2km of latitude)
+GRID_CELL_DEG = 0.02
 
 def haversine_distance(lat1, lon1, lat2, lon2):
     R = 6371
@@ -11,6 +21,173 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     a = sin(d_lat / 2)**2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(d_lon / 2)**2
     return 2 * R * asin(sqrt(a))
 
+
+def haversine_distances(lat: float, lng: float, lats, lngs) -> np.ndarray:
+    """Vectorized haversine_distance from one point to arrays of points (km)"""
+    lats = np.radians(np.asarray(lats, dtype=np.float64))
+    lngs = np.radians(np.asarray(lngs, dtype=np.float64))
+    lat1 = radians(lat)
+    d_lat = lats - lat1
+    d_lon = lngs - radians(lng)
+    a = np.sin(d_lat / 2)**2 + cos(lat1) * np.cos(lats) * np.sin(d_lon / 2)**2
+    return 2 * 6371 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def within_radius(lat: float, lng: float, lats, lngs, radius_km: float):
+    """Returns (mask, distances) for points within radius_km"""
+    distances = haversine_distances(lat, lng, lats, lngs)
+    return distances <= radius_km, distances
+
+
+def nearest_k(lat: float, lng: float, lats, lngs, k: int) -> np.ndarray:
+    """Indices of the k nearest points, closest first"""
+    distances = haversine_distances(lat, lng, lats, lngs)
+    if k <= 0 or distances.size == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < distances.size:
+        idx = np.argpartition(distances, k - 1)[:k]
+    else:
+        idx = np.arange(distances.size)
+    return idx[np.argsort(distances[idx], kind="stable")]
+
+
+class UserLocationGrid:
+    """
+    Process-local index of current user positions bucketed by lat/lng cell.
+    Each worker keeps its own copy, built from the DB at startup. Its own
+    writes go in immediately via upsert_user_location; writes handled by
+    other workers are pulled in by refresh(), which re-reads rows whose
+    updated_at is past the last watermark. A worker therefore answers with
+    positions at most max_age_s old (plus replica lag when reading from a
+    replica), and may keep a deleted user's last position until the next
+    full rebuild.
+    """
+
+    def __init__(self, cell_deg: float = GRID_CELL_DEG):
+        self.cell_deg = cell_deg
+        self.loaded = False
+        self._cells = {}   # (row, col) -> {user_id: UserCurrentLocation}
+        self._user_cell = {}  # user_id -> (row, col)
+        self._watermark: Optional[datetime] = None  # newest updated_at read from the DB
+        self._synced_at = 0.0  # monotonic time of the last sync or rebuild
+        self._rebuilt_at = 0.0
+        self._lock = Lock()
+        self._sync_lock = Lock()  # one DB sync at a time; other readers use the current grid
+
+    def _cell(self, lat: float, lng: float):
+        return floor(lat / self.cell_deg), floor(lng / self.cell_deg)
+
+    def _put(self, loc: UserCurrentLocation):
+        # Store a detached copy so the index never holds session-bound rows
+        snapshot = UserCurrentLocation(
+            user_id=loc.user_id,
+            lat=loc.lat,
+            lng=loc.lng,
+            updated_at=loc.updated_at
+        )
+        cell = self._cell(loc.lat, loc.lng)
+        old_cell = self._user_cell.get(loc.user_id)
+        if old_cell is not None:
+            current = self._cells[old_cell][loc.user_id]
+            if current.updated_at > loc.updated_at:
+                return  # a sync re-read an older row than we already have
+        if old_cell is not None and old_cell != cell:
+            bucket = self._cells.get(old_cell)
+            if bucket is not None:
+                bucket.pop(loc.user_id, None)
+                if not bucket:
+                    del self._cells[old_cell]
+        self._cells.setdefault(cell, {})[loc.user_id] = snapshot
+        self._user_cell[loc.user_id] = cell
+
+    def upsert(self, loc: UserCurrentLocation):
+        with self._lock:
+            self._put(loc)
+
+    def rebuild(self, session: Session):
+        started = time.monotonic()
+        locations = session.exec(select(UserCurrentLocation)).all()
+        with self._lock:
+            self._cells = {}
+            self._user_cell = {}
+            for loc in locations:
+                self._put(loc)
+            self._watermark = max((loc.updated_at for loc in locations), default=None)
+            self._synced_at = self._rebuilt_at = started
+            self.loaded = True
+
+    def sync(self, session: Session, overlap_s: float = 0):
+        """Apply rows updated since the watermark (minus overlap_s) by any worker"""
+        started = time.monotonic()
+        statement = select(UserCurrentLocation)
+        if self._watermark is not None:
+            statement = statement.where(
+                UserCurrentLocation.updated_at >= self._watermark - timedelta(seconds=overlap_s)
+            )
+        locations = session.exec(statement).all()
+        with self._lock:
+            for loc in locations:
+                self._put(loc)
+                if self._watermark is None or loc.updated_at > self._watermark:
+                    self._watermark = loc.updated_at
+            self._synced_at = started
+
+    def refresh(self, session: Session, max_age_s: float, overlap_s: float = 0, rebuild_s: Optional[float] = None):
+        """Sync first if the grid is older than max_age_s; rebuild if older than rebuild_s"""
+        if not self.loaded:
+            with self._sync_lock:
+                if not self.loaded:
+                    self.rebuild(session)
+            return
+
+        now = time.monotonic()
+        if now - self._synced_at < max_age_s:
+            return
+        # Another request is already catching up; answer from the current grid
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            if rebuild_s is not None and now - self._rebuilt_at >= rebuild_s:
+                self.rebuild(session)
+            elif now - self._synced_at >= max_age_s:
+                self.sync(session, overlap_s)
+        finally:
+            self._sync_lock.release()
+
+    def query(self, lat: float, lng: float, radius_km: float):
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+        row_lo, col_lo = self._cell(min_lat, min_lng)
+        row_hi, col_hi = self._cell(max_lat, max_lng)
+        n_cells = (row_hi - row_lo + 1) * (col_hi - col_lo + 1)
+
+        with self._lock:
+            if n_cells > len(self._cells):
+                # Huge radius: cheaper to walk the occupied cells
+                buckets = list(self._cells.values())
+            else:
+                buckets = [
+                    self._cells[(r, c)]
+                    for r in range(row_lo, row_hi + 1)
+                    for c in range(col_lo, col_hi + 1)
+                    if (r, c) in self._cells
+                ]
+            candidates = [loc for bucket in buckets for loc in bucket.values()]
+
+        mask, _ = within_radius(
+            lat, lng,
+            [loc.lat for loc in candidates],
+            [loc.lng for loc in candidates],
+            radius_km
+        )
+        return [loc for loc, keep in zip(candidates, mask) if keep]
+
+
+location_grid = UserLocationGrid()
+
+
+def rebuild_location_grid(session: Session):
+    location_grid.rebuild(session)
+
 def upsert_user_location(session: Session, data: UserCurrentLocationUpdate):
     loc = session.get(UserCurrentLocation, data.user_id)
     if loc:
@@ -22,14 +199,42 @@ def upsert_user_location(session: Session, data: UserCurrentLocationUpdate):
         session.add(loc)
     session.commit()
     session.refresh(loc)
+    location_grid.upsert(loc)
     return loc
 
 def get_user_location(session: Session, user_id):
     return session.get(UserCurrentLocation, user_id)
 
+async def get_user_location_async(session: AsyncSession, user_id):
+    return await session.get(UserCurrentLocation, user_id)
+
+def find_users_near_location(session: Session, lat: float, lng: float, radius_km: float = 2):
+    """
+    Same result as get_users_near_location, read from the database instead
+    of this worker's grid, so positions written by any worker are included
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+    candidates = session.exec(
+        select(UserCurrentLocation).where(
+            UserCurrentLocation.lat >= min_lat,
+            UserCurrentLocation.lat <= max_lat,
+            UserCurrentLocation.lng >= min_lng,
+            UserCurrentLocation.lng <= max_lng
+        )
+    ).all()
+    mask, _ = within_radius(
+        lat, lng,
+        [loc.lat for loc in candidates],
+        [loc.lng for loc in candidates],
+        radius_km
+    )
+    return [loc for loc, keep in zip(candidates, mask) if keep]
+
 def get_users_near_location(session: Session, lat: float, lng: float, radius_km: float = 2):
-    locations = session.exec(select(UserCurrentLocation)).all()
-    return [
-        loc for loc in locations
-        if haversine_distance(lat, lng, loc.lat, loc.lng) <= radius_km
-    ]
+    location_grid.refresh(
+        session,
+        settings.LOCATION_GRID_SYNC_S,
+        settings.LOCATION_GRID_SYNC_OVERLAP_S,
+        settings.LOCATION_GRID_REBUILD_S
+    )
+    return location_grid.query(lat, lng, radius_km)
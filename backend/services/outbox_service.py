@@ -0,0 +1,337 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import wait
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from core.config import settings
+from core.geohash import encode
+from core.notification_service import build_hazard_message
+from db.session import engine
+from models.hazard import Hazard
+from models.notification import Notification
+from models.users import Users
+from services.location_service import find_users_near_location
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(
+    session: Session,
+    user_id: UUID,
+    report_id: int,
+    recipient: Optional[str],
+    hazard_type: str,
+    location: str,
+    severity: str,
+    instructions: str
+) -> Optional[Notification]:
+    """
+    Add a pending email to the session. It is written by the caller's
+    commit, so the event and its notification land together or not at all.
+    """
+    if not recipient:
+        logger.warning(f"No recipient for {hazard_type} notification on report {report_id}, skipping")
+        return None
+
+    notification = Notification(
+        user_id=user_id,
+        report_id=report_id,
+        type="email",
+        recipient=recipient,
+        payload=json.dumps({
+            "hazard_type": hazard_type,
+            "location": location,
+            "severity": severity,
+            "instructions": instructions
+        })
+    )
+    session.add(notification)
+    return notification
+
+
+def alert_area(lat: float, lng: float) -> str:
+    return f"area:{encode(lat, lng, settings.NEARBY_ALERT_AREA_PRECISION)}"
+
+
+def window_bucket(now: datetime, dedup_minutes: int) -> int:
+    """Fixed dedup window containing `now` (naive UTC)"""
+    minutes = (now - datetime(1970, 1, 1)).total_seconds() // 60
+    return int(minutes // max(dedup_minutes, 1))
+
+
+def fan_out_alert(
+    session: Session,
+    hazard: Hazard,
+    user_ids: Iterable[UUID],
+    channel: str = "email",
+    dedup_minutes: int = 30,
+    chunk_size: int = 1000
+) -> int:
+    """
+    Queue one pending notification per user with multi-row INSERTs of
+    chunk_size rows. The reporter and users already alerted for the same
+    area within dedup_minutes are skipped. Recipients are resolved from
+    user_id by the dispatcher. Returns the number of rows inserted.
+
+    The SELECT skips users alerted in the last dedup_minutes; the unique
+    (user_id, dedup_key, window_bucket) index catches fan-outs racing past
+    it, with ON CONFLICT DO NOTHING dropping the duplicates.
+    """
+    now = datetime.utcnow()
+    area = alert_area(hazard.lat, hazard.lng)
+    bucket = window_bucket(now, dedup_minutes)
+    recent = set(session.exec(
+        select(Notification.user_id)
+        .where(
+            Notification.dedup_key == area,
+            Notification.created_at >= now - timedelta(minutes=dedup_minutes)
+        )
+    ).all())
+    recent.add(hazard.reported_by)
+
+    payload = json.dumps({
+        "hazard_type": hazard.hazard_type,
+        "location": f"Lat: {hazard.lat}, Lng: {hazard.lng}",
+        "severity": "Medium",
+        "instructions": f"A {hazard.hazard_type} was reported near you. Please take care."
+    })
+    rows = [
+        {
+            "user_id": user_id,
+            "report_id": hazard.id,
+            "type": channel,
+            "status": "pending",
+            "recipient": None,
+            "dedup_key": area,
+            "window_bucket": bucket,
+            "payload": payload,
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now
+        }
+        for user_id in dict.fromkeys(user_ids)
+        if user_id not in recent
+    ]
+
+    inserted = 0
+    if rows:
+        dialect_insert = pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+        statement = (
+            dialect_insert(Notification.__table__)
+            .on_conflict_do_nothing(index_elements=["user_id", "dedup_key", "window_bucket"])
+            .returning(Notification.__table__.c.id)
+            .execution_options(insertmanyvalues_page_size=chunk_size)
+        )
+        # Core executemany: SQLAlchemy's "insertmanyvalues" sends multi-row
+        # INSERT ... VALUES statements of chunk_size rows each; RETURNING
+        # yields only the rows that did not conflict
+        inserted = len(session.connection().execute(statement, rows).all())
+    session.commit()
+    return inserted
+
+
+def alert_nearby_users(hazard_id: int):
+    """Background fan-out for a new hazard; runs after the response is sent"""
+    with Session(engine) as session:
+        hazard = session.get(Hazard, hazard_id)
+        if not hazard:
+            return
+        # From the database, not the per-worker grid: every recipient counts here
+        nearby = find_users_near_location(session, hazard.lat, hazard.lng, radius_km=settings.NEARBY_ALERT_RADIUS_KM)
+        queued = fan_out_alert(
+            session,
+            hazard,
+            [loc.user_id for loc in nearby],
+            channel=settings.NEARBY_ALERT_CHANNEL,
+            dedup_minutes=settings.NEARBY_ALERT_DEDUP_MINUTES,
+            chunk_size=settings.NEARBY_ALERT_INSERT_CHUNK
+        )
+        logger.info("Queued %d nearby alerts for hazard %d (%d users in range)", queued, hazard_id, len(nearby))
+
+
+def parse_rate_limits(value: str) -> dict:
+    """'email=20,sms=5' -> {'email': 20.0, 'sms': 5.0}"""
+    limits = {}
+    for item in value.split(","):
+        if "=" in item:
+            channel, rate = item.split("=", 1)
+            limits[channel.strip()] = float(rate)
+    return limits
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` acquisitions per second, bursting up to `burst`"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_s = (1 - self._tokens) / self.rate
+            time.sleep(wait_s)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    seconds = settings.NOTIFY_RETRY_BASE_S * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, settings.NOTIFY_RETRY_MAX_S))
+
+
+def claim_batch(session: Session, limit: int, lease_s: float) -> List[Notification]:
+    """
+    Claim up to `limit` due notifications. SKIP LOCKED lets any number of
+    dispatchers poll concurrently without blocking on or double-claiming
+    each other's rows. Claimed rows stay 'pending' with next_attempt_at
+    pushed out by the lease, so a dispatcher that dies mid-batch only
+    delays them.
+    """
+    now = datetime.utcnow()
+    notifications = session.exec(
+        select(Notification)
+        .where(Notification.status == "pending", Notification.next_attempt_at <= now)
+        .order_by(Notification.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    for notification in notifications:
+        notification.attempts += 1
+        notification.next_attempt_at = now + timedelta(seconds=lease_s)
+        session.add(notification)
+    session.commit()
+    return notifications
+
+
+# Share of lease_s a batch may spend sending before unfinished sends count as failed
+LEASE_SEND_FRACTION = 0.8
+
+
+def record_result(notification: Notification, error: Optional[Exception], max_attempts: int):
+    now = datetime.utcnow()
+    if error is None:
+        notification.status = "sent"
+        notification.sent_at = now
+        notification.last_error = None
+    elif notification.attempts >= max_attempts:
+        notification.status = "failed"
+        notification.last_error = str(error)[:500]
+    else:
+        notification.next_attempt_at = now + retry_delay(notification.attempts)
+        notification.last_error = str(error)[:500]
+
+
+class NotificationDispatcher:
+    """
+    Drains the notifications outbox: claims due rows in batches, sends them
+    through the pooled email sender and records the outcome. Run one or
+    more copies with `python notification_dispatcher.py`.
+    """
+
+    def __init__(self, engine, sender, batch_size: int = 50, poll_interval_s: float = 1.0,
+                 lease_s: float = 300, max_attempts: int = 6, rate_limits: Optional[dict] = None):
+        self.engine = engine
+        self.sender = sender
+        self.limiters = {channel: RateLimiter(rate) for channel, rate in (rate_limits or {}).items()}
+        self.batch_size = batch_size
+        self.poll_interval_s = poll_interval_s
+        self.lease_s = lease_s
+        self.max_attempts = max_attempts
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+    def _send(self, notification: Notification):
+        if notification.type != "email":
+            raise ValueError(f"Unsupported notification type: {notification.type}")
+        if not notification.recipient:
+            raise ValueError(f"No email address for user {notification.user_id}")
+        limiter = self.limiters.get(notification.type)
+        if limiter is not None:
+            limiter.acquire()
+        fields = json.loads(notification.payload or "{}")
+        message = build_hazard_message(notification.recipient, **fields)
+        return self.sender.submit(message)
+
+    def run_once(self) -> int:
+        """Claim and deliver one batch; returns the number of rows claimed"""
+        with Session(self.engine, expire_on_commit=False) as session:
+            # Record results well before the lease lets another dispatcher re-claim the rows
+            deadline = time.monotonic() + self.lease_s * LEASE_SEND_FRACTION
+            notifications = claim_batch(session, self.batch_size, self.lease_s)
+            if not notifications:
+                return 0
+
+            # Fan-out rows carry only user_id; resolve addresses once per batch
+            missing = {n.user_id for n in notifications if not n.recipient}
+            if missing:
+                emails = dict(session.exec(select(Users.id, Users.email).where(Users.id.in_(missing))).all())
+                for notification in notifications:
+                    if not notification.recipient:
+                        notification.recipient = emails.get(notification.user_id)
+
+            futures = {}
+            errors = {}
+            for notification in notifications:
+                try:
+                    futures[notification.id] = self._send(notification)
+                except Exception as e:
+                    errors[notification.id] = e
+            _, not_done = wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+            for notification_id, future in futures.items():
+                if future in not_done:
+                    # Stuck sender: retry later rather than hold the claim and session
+                    future.cancel()
+                    errors[notification_id] = TimeoutError("Email not sent within the claim lease")
+
+            for notification in notifications:
+                future = futures.get(notification.id)
+                error = errors.get(notification.id) or (future.exception() if future else None)
+                record_result(notification, error, self.max_attempts)
+                session.add(notification)
+
+                if notification.status == "sent":
+                    self.sent += 1
+                elif notification.status == "failed":
+                    self.failed += 1
+                    logger.error(f"Notification {notification.id} failed permanently: {error}")
+                else:
+                    self.retried += 1
+            session.commit()
+            return len(notifications)
+
+    def run(self, stop: threading.Event):
+        while not stop.is_set():
+            try:
+                claimed = self.run_once()
+            except Exception as e:
+                logger.error(f"Notification dispatch failed: {e}")
+                claimed = 0
+            # Keep draining while full batches come back
+            if claimed < self.batch_size:
+                stop.wait(self.poll_interval_s)
+
+    def stats(self) -> dict:
+        return {
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "sender": self.sender.stats()
+        }
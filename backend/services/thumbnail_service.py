@@ -0,0 +1,145 @@
+import json
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import update
+from sqlmodel import Session
+
+from core.batching import collect_batch
+from core.config import settings
+from core.content_cache import ContentHashCache
+from core.storage import storage
+from core.thumbnails import content_type, parse_widths, render_thumbnails, thumbnail_key
+from db.session import engine
+from models.hazard import Hazard
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailWorker:
+    """
+    Renders thumbnails for new hazard photos on a background thread.
+    Jobs are collected into batches of up to max_batch_size (or whatever
+    arrived within max_wait_ms). Each batch's hazard rows are then updated
+    with one UPDATE per distinct variant set. Photos whose key was already
+    rendered (dedup hits) reuse the stored variants.
+    """
+
+    def __init__(self, target, widths, fmt: str = "webp", quality: int = 75,
+                 max_batch_size: int = 8, max_wait_ms: float = 50, cache_size: int = 10000):
+        self.target = target
+        self.widths = widths
+        self.fmt = fmt
+        self.quality = quality
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._rendered = ContentHashCache(cache_size)  # original key -> thumbnails JSON
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.images = 0
+        self.failures = 0
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="thumbnails", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def enqueue(self, hazard_id: int, key: str, image_bytes: Optional[bytes] = None):
+        """Queue a hazard photo; without image_bytes the original is read back from storage"""
+        self._queue.put((hazard_id, key, image_bytes))
+
+    def _render(self, key: str, image_bytes: Optional[bytes]) -> str:
+        cached = self._rendered.get(key)
+        if cached is not None:
+            return cached
+
+        if image_bytes is None:
+            image_bytes = self.target.get_bytes(key)
+        variants = render_thumbnails(image_bytes, self.widths, self.fmt, self.quality)
+
+        keys = {}
+        for width, data in variants.items():
+            keys[str(width)] = thumbnail_key(key, width, self.fmt)
+            self.target.put_bytes(data, keys[str(width)], content_type(self.fmt))
+
+        value = json.dumps(keys, sort_keys=True)
+        self._rendered.put(key, value)
+        return value
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = collect_batch(self._queue, first, self.max_batch_size, time.monotonic() + self.max_wait)
+
+            by_value = defaultdict(list)
+            failures = 0
+            for hazard_id, key, image_bytes in batch:
+                try:
+                    by_value[self._render(key, image_bytes)].append(hazard_id)
+                except Exception as e:
+                    failures += 1
+                    logger.error(f"Thumbnail rendering failed for {key}: {e}")
+
+            try:
+                with Session(engine) as session:
+                    for value, hazard_ids in by_value.items():
+                        session.exec(
+                            update(Hazard)
+                            .where(Hazard.id.in_(hazard_ids))
+                            .values(thumbnails=value)
+                        )
+                    session.commit()
+            except Exception as e:
+                failures += sum(len(ids) for ids in by_value.values())
+                logger.error(f"Failed to save thumbnails for batch: {e}")
+
+            with self._stats_lock:
+                self.batches += 1
+                self.images += len(batch)
+                self.failures += failures
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "batches": self.batches,
+                "images": self.images,
+                "failures": self.failures,
+                "avg_batch_size": self.images / self.batches if self.batches else 0.0,
+                "queue_depth": self._queue.qsize(),
+                "rendered_cache": self._rendered.stats()
+            }
+
+
+thumbnail_worker = ThumbnailWorker(
+    storage,
+    parse_widths(settings.THUMBNAIL_WIDTHS),
+    fmt=settings.THUMBNAIL_FORMAT,
+    quality=settings.THUMBNAIL_QUALITY,
+    max_batch_size=settings.THUMBNAIL_BATCH_SIZE,
+    max_wait_ms=settings.THUMBNAIL_MAX_WAIT_MS,
+    cache_size=settings.CONTENT_CACHE_SIZE
+)
+
+
+def enqueue_thumbnails(hazard_id: int, key: str, image_bytes: Optional[bytes] = None):
+    if settings.THUMBNAILS_ENABLED:
+        thumbnail_worker.enqueue(hazard_id, key, image_bytes)
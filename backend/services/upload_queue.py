@@ -0,0 +1,237 @@
+import json
+import logging
+import os
+import queue
+import re
+import threading
+from contextlib import suppress
+from sqlmodel import Session
+from core.config import settings
+from core.content_cache import s3_key_cache
+from core.storage import storage, LocalStorage
+from services.thumbnail_service import enqueue_thumbnails
+from db.session import engine
+from models.hazard import Hazard
+
+logger = logging.getLogger(__name__)
+
+# Backoff between upload attempts: 1s, 2s, 4s ... capped at 5 minutes
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 300.0
+
+# Sidecars are named <key>.json.<pid> after the worker process that owns
+# them, so processes sharing the spool directory never queue the same job
+SIDECAR_RE = re.compile(r"\.json(?:\.(\d+))?$")
+
+spool_storage = LocalStorage(settings.UPLOAD_SPOOL_DIR, "")
+
+
+class UploadSpoolWorker:
+    """
+    Drains spooled uploads to the configured storage. report_hazard writes
+    the image to the spool and a JSON sidecar next to it (write_sidecar)
+    before committing the hazard with photo_status "pending", then queues
+    the job (submit). The worker uploads it with retries and sets
+    photo_url/photo_status once done. On start, sidecars left by dead
+    processes are claimed and re-queued, so the spool survives restarts.
+    """
+
+    def __init__(self, spool: LocalStorage, target, workers: int = 2, max_attempts: int = 8):
+        self.spool = spool
+        self.target = target
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self._queue = queue.Queue()
+        self._threads = []
+
+    def _sidecar_path(self, key: str, pid: int = None) -> str:
+        return f"{self.spool._path(key)}.json.{pid or os.getpid()}"
+
+    def write_sidecar(self, hazard_id: int, key: str, content_type: str, digest: str) -> dict:
+        """Persist the job, owned by this process; call before committing the hazard"""
+        job = {
+            "hazard_id": hazard_id,
+            "key": key,
+            "content_type": content_type,
+            "digest": digest,
+            "attempts": 0
+        }
+        sidecar = self._sidecar_path(key)
+        tmp = f"{sidecar}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(job, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, sidecar)
+        return job
+
+    def discard_sidecar(self, job: dict):
+        """Drop a sidecar whose hazard was never committed"""
+        with suppress(FileNotFoundError):
+            os.remove(self._sidecar_path(job["key"]))
+
+    def submit(self, job: dict):
+        self._queue.put(job)
+
+    def enqueue(self, hazard_id: int, key: str, content_type: str, digest: str):
+        self.submit(self.write_sidecar(hazard_id, key, content_type, digest))
+
+    @staticmethod
+    def _owner_alive(pid: int) -> bool:
+        if pid == os.getpid():
+            # Same pid as a previous process (e.g. restarted container);
+            # this process has not queued anything yet
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def recover(self) -> int:
+        """Claim and re-queue spooled uploads whose owning process is gone"""
+        count = 0
+        for dirpath, _, filenames in os.walk(self.spool.root):
+            for name in filenames:
+                match = SIDECAR_RE.search(name)
+                if match is None:
+                    continue
+                owner = match.group(1)
+                if owner is not None and self._owner_alive(int(owner)):
+                    continue
+
+                # Atomic claim: if another process renamed it first, skip it
+                path = os.path.join(dirpath, name)
+                claimed = f"{path[:match.start()]}.json.{os.getpid()}"
+                try:
+                    os.rename(path, claimed)
+                    with open(claimed) as fh:
+                        job = json.load(fh)
+                except FileNotFoundError:
+                    continue
+                except (OSError, ValueError) as e:
+                    logger.error(f"Skipping unreadable spool entry {name}: {e}")
+                    continue
+                job["attempts"] = 0
+                self._queue.put(job)
+                count += 1
+        return count
+
+    def start(self):
+        if self._threads:
+            return
+        os.makedirs(self.spool.root, exist_ok=True)
+        recovered = self.recover()
+        if recovered:
+            logger.info("Recovered %d spooled uploads", recovered)
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"upload-spool-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5):
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                self._process(job)
+            except Exception:
+                # Keep the worker alive; the sidecar stays for the next restart
+                logger.exception(f"Spool job for {job.get('key')} failed")
+
+    def _retry_later(self, job: dict):
+        delay = min(RETRY_BASE_DELAY * 2 ** (job["attempts"] - 1), RETRY_MAX_DELAY)
+        timer = threading.Timer(delay, self._queue.put, (job,))
+        timer.daemon = True
+        timer.start()
+
+    def _remove(self, *paths: str):
+        for path in paths:
+            with suppress(FileNotFoundError):
+                os.remove(path)
+
+    def _hazard_exists(self, hazard_id: int) -> bool:
+        with Session(engine) as session:
+            return session.get(Hazard, hazard_id) is not None
+
+    def _set_photo(self, hazard_id: int, photo_url: str, photo_status: str):
+        with Session(engine) as session:
+            hazard = session.get(Hazard, hazard_id)
+            if hazard:
+                if photo_url:
+                    hazard.photo_url = photo_url
+                hazard.photo_status = photo_status
+                session.add(hazard)
+                session.commit()
+
+    def _process(self, job: dict):
+        key = job["key"]
+        path = self.spool._path(key)
+
+        try:
+            exists = self._hazard_exists(job["hazard_id"])
+        except Exception as e:
+            job["attempts"] += 1
+            logger.warning(f"Could not look up hazard {job['hazard_id']} for {key}: {e}")
+            self._retry_later(job)
+            return
+        if not exists:
+            # Sidecar from a request that died before its commit
+            logger.warning(f"Hazard {job['hazard_id']} for spooled {key} does not exist, dropping job")
+            self._remove(path, self._sidecar_path(key))
+            return
+
+        try:
+            with open(path, "rb") as fh:
+                self.target.upload_fileobj(fh, key, job["content_type"])
+        except FileNotFoundError:
+            logger.error(f"Spooled file for {key} is missing, dropping job")
+            self._set_photo(job["hazard_id"], "", "failed")
+            self._remove(self._sidecar_path(key))
+            return
+        except Exception as e:
+            job["attempts"] += 1
+            if job["attempts"] >= self.max_attempts:
+                # Files stay in the spool and are retried after the next restart
+                logger.error(f"Giving up on upload of {key} after {job['attempts']} attempts: {e}")
+                self._set_photo(job["hazard_id"], "", "failed")
+            else:
+                logger.warning(f"Upload of {key} failed (attempt {job['attempts']}): {e}")
+                self._retry_later(job)
+            return
+
+        try:
+            self._set_photo(job["hazard_id"], key, "uploaded")
+        except Exception as e:
+            # Keep the spool entry; the upload is idempotent so retrying is safe
+            job["attempts"] += 1
+            logger.error(f"Failed to update hazard {job['hazard_id']} after upload: {e}")
+            self._retry_later(job)
+            return
+
+        s3_key_cache.put(job["digest"], key)
+        if settings.THUMBNAILS_ENABLED:
+            # Render from the spooled copy rather than reading the object back
+            enqueue_thumbnails(job["hazard_id"], key, self.spool.get_bytes(key))
+        self._remove(path, self._sidecar_path(key))
+
+
+upload_spool = UploadSpoolWorker(
+    spool_storage,
+    storage,
+    workers=settings.UPLOAD_SPOOL_WORKERS,
+    max_attempts=settings.UPLOAD_SPOOL_MAX_ATTEMPTS
+)
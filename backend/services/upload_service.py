@@ -0,0 +1,63 @@
+import hashlib
+from fastapi import HTTPException, UploadFile, status
+from core.config import settings
+from core.s3_service import ALLOWED_CONTENT_TYPES, new_object_key
+from core.storage import storage, run_storage_io
+
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+def _too_large():
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Image exceeds the {settings.MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit"
+    )
+
+
+async def receive_upload(file: UploadFile, keep_bytes: bool, folder: str = "hazards", target=None):
+    """
+    Reads the upload once, feeding each chunk to a SHA-256 hasher and a
+    streaming upload to `target` (the configured storage by default; the
+    upload spool passes its local storage). With keep_bytes the upload
+    retains the bytes for the classifier, bounded by MAX_UPLOAD_BYTES.
+    Oversized uploads are rejected as soon as the cap is crossed.
+
+    Chunks go to the storage I/O pool only when a write actually does I/O
+    (a full S3 part, or any write to local disk); otherwise they are just
+    buffered. S3 parts are MULTIPART_PART_SIZE (5 MB), so photos below
+    that, which is most of them, are not sent while the body arrives: they
+    go out in a single PUT when the caller calls complete().
+
+    Returns (upload, digest, image_bytes). The caller must complete() or
+    abort() the upload (via run_storage_io).
+    """
+    if file.content_type not in ALLOWED_CONTENT_TYPES:
+        raise HTTPException(status_code=400, detail="Unsupported file type. Please upload a JPEG or PNG image.")
+
+    # Starlette knows the size when the part was fully received
+    if file.size is not None and file.size > settings.MAX_UPLOAD_BYTES:
+        raise _too_large()
+
+    target = target or storage
+    upload = target.open_upload(new_object_key(file.filename, folder), file.content_type, retain=keep_bytes)
+    hasher = hashlib.sha256()
+    size = 0
+
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > settings.MAX_UPLOAD_BYTES:
+                raise _too_large()
+            hasher.update(chunk)
+            if upload.write_blocks(len(chunk)):
+                await run_storage_io(upload.write, chunk)
+            else:
+                upload.write(chunk)  # buffer only, no I/O
+    except Exception:
+        await run_storage_io(upload.abort)
+        raise
+
+    return upload, hasher.hexdigest(), upload.data if keep_bytes else None
@@ -2,6 +2,7 @@ from sqlmodel import Session, select
 from uuid import UUID
 from fastapi import HTTPException, status
 from models.users import Users
+from core.user_cache import user_cache
 from typing import Dict, List
 
 
@@ -23,6 +24,7 @@ def update_user_profile(session: Session, user_id: UUID, data: Dict) -> Users:
 
     session.add(user)
     session.commit()
+    user_cache.invalidate(str(user_id))
     session.refresh(user)
     return user
 
@@ -38,4 +40,5 @@ def delete_user(session: Session, user_id: UUID):
 
     session.delete(user)
     session.commit()
+    user_cache.invalidate(str(user_id))
     return {"message": "User deleted successfully"}
@@ -0,0 +1,263 @@
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import and_, bindparam, delete, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from core.config import settings
+from db.session import engine
+from models.hazard import Hazard
+from models.vote import Vote
+from services.vote_service import COUNTER_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[UUID, int]  # (user_id, report_id)
+
+
+class _Entry:
+    __slots__ = ("original", "desired")
+
+    def __init__(self, original: Optional[str], desired: Optional[str]):
+        self.original = original  # vote_type in the DB when first buffered (None = no vote)
+        self.desired = desired  # vote_type to write at flush (None = delete)
+
+
+def _counter_delta(before: Optional[str], after: Optional[str]) -> Dict[str, int]:
+    delta = defaultdict(int)
+    if before in COUNTER_COLUMNS:
+        delta[COUNTER_COLUMNS[before]] -= 1
+    if after in COUNTER_COLUMNS:
+        delta[COUNTER_COLUMNS[after]] += 1
+    return delta
+
+
+class VoteBuffer:
+    """
+    In-process write-behind buffer for votes. Each tap only updates the
+    latest desired state per (user, report) in memory, so a burst of
+    toggles collapses into one row change. A background thread writes all
+    pending states in one transaction every flush_interval_ms, or sooner
+    once max_entries keys are pending. Reads overlay the buffered state
+    (user_vote, count_delta) so callers see their own votes immediately.
+
+    The buffer is per process: with several API workers, a user's taps
+    should stay on one worker within a flush window (sticky sessions), and
+    up to one window of votes is lost if the process is killed.
+    """
+
+    def __init__(self, engine, flush_interval_ms: float = 200, max_entries: int = 1000):
+        self.engine = engine
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_entries = max_entries
+        self._entries: Dict[Key, _Entry] = {}
+        self._inflight: Dict[Key, _Entry] = {}  # being written by the current flush
+        self._report_deltas: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.taps = 0
+        self.flushes = 0
+        self.rows_written = 0
+
+    # -- request path -----------------------------------------------------
+
+    def _load_state(self, session: Session, user_id: UUID, report_id: int) -> Optional[str]:
+        row = session.exec(
+            select(Hazard.id, Vote.vote_type)
+            .outerjoin(Vote, and_(Vote.report_id == Hazard.id, Vote.user_id == user_id))
+            .where(Hazard.id == report_id)
+        ).first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Hazard not found")
+        return row[1]
+
+    def toggle(self, session: Session, user_id: UUID, report_id: int, vote_type: str) -> str:
+        """Buffered toggle_vote: returns 'created', 'updated' or 'removed' without writing"""
+        key = (user_id, report_id)
+        loaded = False
+        current = None
+        while True:
+            with self._lock:
+                # Look up and mutate in one critical section, so a flush can
+                # never take the entry between the two
+                entry = self._entries.get(key)
+                if entry is None and key in self._inflight:
+                    desired = self._inflight[key].desired
+                    entry = self._entries[key] = _Entry(desired, desired)
+                if entry is None and loaded:
+                    entry = self._entries[key] = _Entry(current, current)
+                if entry is not None:
+                    before = entry.desired
+                    after = None if before == vote_type else vote_type
+                    entry.desired = after
+                    for column, change in _counter_delta(before, after).items():
+                        self._report_deltas[report_id][column] += change
+                    self.taps += 1
+                    pending = len(self._entries)
+                    break
+
+            # First tap in this window: read the committed state outside the lock
+            current = self._load_state(session, user_id, report_id)
+            loaded = True
+
+        if pending >= self.max_entries:
+            self._wakeup.set()
+
+        if after is None:
+            return "removed"
+        return "created" if before is None else "updated"
+
+    def user_vote(self, user_id: UUID, report_id: int, committed: Optional[str]) -> Optional[str]:
+        key = (user_id, report_id)
+        with self._lock:
+            entry = self._entries.get(key) or self._inflight.get(key)
+            return entry.desired if entry is not None else committed
+
+    def count_delta(self, report_id: int) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._report_deltas.get(report_id, {}))
+
+    # -- flushing ---------------------------------------------------------
+
+    def flush(self) -> int:
+        """Write all pending votes in one transaction; returns rows changed"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._entries:
+                    return 0
+                self._inflight, self._entries = self._entries, {}
+                batch = self._inflight
+
+            try:
+                written = self._write(batch)
+            except Exception as e:
+                logger.error(f"Vote buffer flush failed, will retry: {e}")
+                with self._lock:
+                    # Newer taps win; keep the committed original from the failed batch
+                    for key, entry in batch.items():
+                        newer = self._entries.get(key)
+                        if newer is not None:
+                            newer.original = entry.original
+                        else:
+                            self._entries[key] = entry
+                    self._inflight = {}
+                return 0
+
+            with self._lock:
+                for (_, report_id), entry in batch.items():
+                    for column, change in _counter_delta(entry.original, entry.desired).items():
+                        self._report_deltas[report_id][column] -= change
+                    if not any(self._report_deltas[report_id].values()):
+                        del self._report_deltas[report_id]
+                self._inflight = {}
+                self.flushes += 1
+                self.rows_written += written
+            return written
+
+    def _write(self, batch: Dict[Key, _Entry]) -> int:
+        changed = {key: entry for key, entry in batch.items() if entry.desired != entry.original}
+        if not changed:
+            return 0
+
+        now = datetime.utcnow()
+        with Session(self.engine) as session:
+            dialect = session.get_bind().dialect.name
+            # Re-read the committed state so counters move by what actually changes
+            committed = {
+                (user_id, report_id): vote_type
+                for user_id, report_id, vote_type in session.exec(
+                    select(Vote.user_id, Vote.report_id, Vote.vote_type)
+                    .where(tuple_(Vote.user_id, Vote.report_id).in_(list(changed)))
+                ).all()
+            }
+
+            removals = [key for key, entry in changed.items() if entry.desired is None and key in committed]
+            upserts = [
+                {"user_id": key[0], "report_id": key[1], "vote_type": entry.desired, "created_at": now}
+                for key, entry in changed.items()
+                if entry.desired is not None and committed.get(key) != entry.desired
+            ]
+
+            deltas = defaultdict(lambda: defaultdict(int))
+            for key, entry in changed.items():
+                if committed.get(key) != entry.desired:
+                    for column, change in _counter_delta(committed.get(key), entry.desired).items():
+                        deltas[key[1]][column] += change
+
+            if removals:
+                session.exec(delete(Vote).where(tuple_(Vote.user_id, Vote.report_id).in_(removals)))
+            if upserts:
+                insert = pg_insert if dialect == "postgresql" else sqlite_insert
+                statement = insert(Vote)
+                statement = statement.on_conflict_do_update(
+                    index_elements=[Vote.user_id, Vote.report_id],
+                    set_={"vote_type": statement.excluded.vote_type, "created_at": statement.excluded.created_at}
+                )
+                session.connection().execute(statement, upserts)
+            if deltas:
+                session.connection().execute(
+                    update(Hazard)
+                    .where(Hazard.id == bindparam("report_id"))
+                    .values(
+                        upvotes=Hazard.upvotes + bindparam("up"),
+                        downvotes=Hazard.downvotes + bindparam("down")
+                    ),
+                    [
+                        {"report_id": report_id, "up": delta["upvotes"], "down": delta["downvotes"]}
+                        for report_id, delta in deltas.items()
+                    ]
+                )
+            session.commit()
+        return len(removals) + len(upserts)
+
+    # -- lifecycle --------------------------------------------------------
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="vote-buffer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join(timeout)
+        self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "taps": self.taps,
+                "flushes": self.flushes,
+                "rows_written": self.rows_written,
+                "pending": len(self._entries),
+                "coalescing_ratio": self.taps / self.rows_written if self.rows_written else 0.0
+            }
+
+
+vote_buffer = VoteBuffer(
+    engine,
+    flush_interval_ms=settings.VOTE_BUFFER_FLUSH_MS,
+    max_entries=settings.VOTE_BUFFER_MAX_ENTRIES
+)
@@ -1,30 +1,136 @@
 from sqlmodel import Session, select
+from sqlalchemy import delete, func, literal_column, or_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from uuid import UUID
+from typing import Optional
+from datetime import datetime
+from models.hazard import Hazard
 from models.vote import Vote
 from schemas.vote import VoteCreate
 
+COUNTER_COLUMNS = {"upvote": "upvotes", "downvote": "downvotes"}
+OTHER_VOTE = {"upvote": "downvote", "downvote": "upvote"}
 
-def create_or_toggle_vote(session: Session, user_id: UUID, vote_data: VoteCreate) -> str:
-    existing_vote = session.exec(
-        select(Vote).where(
-            Vote.user_id == user_id,
-            Vote.report_id == vote_data.report_id
-        )
-    ).first()
-
-    if existing_vote:
-        if existing_vote.vote_type == vote_data.vote_type:
-            session.delete(existing_vote)
-            session.commit()
-            return "Vote removed"
-        else:
-            existing_vote.vote_type = vote_data.vote_type
-            session.add(existing_vote)
-            session.commit()
-            return "Vote updated"
+
+def adjust_vote_counts(session: Session, report_id: int, removed: Optional[str] = None, added: Optional[str] = None):
+    """
+    Move the hazard's counters from `removed` to `added` vote type with a
+    relative UPDATE (upvotes = upvotes + 1), so concurrent votes never
+    overwrite each other. Runs in the caller's transaction.
+    """
+    deltas = {}
+    if removed in COUNTER_COLUMNS:
+        deltas[COUNTER_COLUMNS[removed]] = deltas.get(COUNTER_COLUMNS[removed], 0) - 1
+    if added in COUNTER_COLUMNS:
+        deltas[COUNTER_COLUMNS[added]] = deltas.get(COUNTER_COLUMNS[added], 0) + 1
+    values = {name: getattr(Hazard, name) + delta for name, delta in deltas.items() if delta}
+    if values:
+        session.exec(update(Hazard).where(Hazard.id == report_id).values(**values))
+
+
+def _upsert_vote_postgres(session: Session, user_id: UUID, report_id: int, vote_type: str) -> Optional[str]:
+    """
+    One INSERT ... ON CONFLICT DO UPDATE that only fires when the type
+    changes. xmax = 0 on the returned row means it was freshly inserted.
+    No row back means the user already has this vote.
+    """
+    statement = pg_insert(Vote).values(
+        user_id=user_id,
+        report_id=report_id,
+        vote_type=vote_type,
+        created_at=datetime.utcnow()
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[Vote.user_id, Vote.report_id],
+        set_={"vote_type": statement.excluded.vote_type, "created_at": statement.excluded.created_at},
+        where=Vote.vote_type != statement.excluded.vote_type
+    ).returning(literal_column("xmax = 0").label("inserted"))
+
+    row = session.exec(statement).first()
+    if row is None:
+        return None
+    return "created" if row.inserted else "updated"
+
+
+def _upsert_vote_sqlite(session: Session, user_id: UUID, report_id: int, vote_type: str) -> Optional[str]:
+    """
+    SQLite fallback (no xmax): a conditional UPDATE, then INSERT ... ON
+    CONFLICT DO NOTHING. The first write takes SQLite's database write lock
+    and the unique index rules out duplicates.
+    """
+    changed = session.exec(
+        update(Vote)
+        .where(Vote.user_id == user_id, Vote.report_id == report_id, Vote.vote_type != vote_type)
+        .values(vote_type=vote_type, created_at=datetime.utcnow())
+    )
+    if changed.rowcount:
+        return "updated"
+
+    inserted = session.exec(
+        sqlite_insert(Vote)
+        .values(user_id=user_id, report_id=report_id, vote_type=vote_type, created_at=datetime.utcnow())
+        .on_conflict_do_nothing(index_elements=[Vote.user_id, Vote.report_id])
+    )
+    if inserted.rowcount:
+        return "created"
+    return None
+
+
+def toggle_vote(session: Session, user_id: UUID, report_id: int, vote_type: str) -> str:
+    """
+    Cast, switch or remove (same type twice) the user's vote on a report
+    and move the hazard counters to match. Returns 'created', 'updated'
+    or 'removed'. Commits.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        action = _upsert_vote_postgres(session, user_id, report_id, vote_type)
     else:
-        new_vote = Vote(user_id=user_id, **vote_data.dict())
-        session.add(new_vote)
-        session.commit()
-        session.refresh(new_vote)
-        return "Vote created"
+        action = _upsert_vote_sqlite(session, user_id, report_id, vote_type)
+
+    if action == "created":
+        adjust_vote_counts(session, report_id, added=vote_type)
+    elif action == "updated":
+        adjust_vote_counts(session, report_id, removed=OTHER_VOTE[vote_type], added=vote_type)
+    else:
+        # Existing vote of the same type: toggle it off
+        removed = session.exec(
+            delete(Vote)
+            .where(Vote.user_id == user_id, Vote.report_id == report_id, Vote.vote_type == vote_type)
+        )
+        if removed.rowcount:
+            adjust_vote_counts(session, report_id, removed=vote_type)
+        action = "removed"
+
+    session.commit()
+    return action
+
+
+def create_or_toggle_vote(session: Session, user_id: UUID, vote_data: VoteCreate) -> str:
+    action = toggle_vote(session, user_id, vote_data.report_id, vote_data.vote_type)
+    return f"Vote {action}"
+
+
+def _vote_count(vote_type: str):
+    return (
+        select(func.count())
+        .select_from(Vote)
+        .where(Vote.report_id == Hazard.id, Vote.vote_type == vote_type)
+        .scalar_subquery()
+    )
+
+
+def reconcile_vote_counts(session: Session) -> int:
+    """
+    Recompute upvotes/downvotes from the votes table and fix any hazard
+    whose counters drifted. Returns the number of hazards corrected.
+    """
+    upvotes, downvotes = _vote_count("upvote"), _vote_count("downvote")
+    result = session.exec(
+        update(Hazard)
+        .where(or_(Hazard.upvotes != upvotes, Hazard.downvotes != downvotes))
+        .values(upvotes=upvotes, downvotes=downvotes)
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+    return result.rowcount
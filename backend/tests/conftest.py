@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+# core.config.Settings is built at import time. Point everything at
+# throwaway local resources before any app module is imported.
+_scratch = tempfile.mkdtemp(prefix="satraksha-tests-")
+os.environ.update(
+    DATABASE_URL="sqlite://",
+    DB_REPLICA_URLS="",
+    STORAGE_BACKEND="local",
+    LOCAL_STORAGE_DIR=os.path.join(_scratch, "media"),
+    UPLOAD_SPOOL_DIR=os.path.join(_scratch, "spool"),
+)
+for name, value in {
+    "SECRET_KEY": "test-secret",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+    "AWS_ACCESS_KEY_ID": "test",
+    "AWS_SECRET_ACCESS_KEY": "test",
+    "S3_BUCKET": "test-bucket",
+    "AWS_REGION": "us-east-1",
+}.items():
+    os.environ.setdefault(name, value)
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine
+
+from db import base  # noqa: F401  registers all tables and the Hazard listeners
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest.fixture
+def engine(database_url):
+    engine = create_engine(database_url, connect_args={"check_same_thread": False, "timeout": 30})
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    with Session(engine) as session:
+        yield session
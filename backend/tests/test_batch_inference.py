@@ -0,0 +1,39 @@
+import threading
+import time
+
+import torch
+
+from core.batch_inference import BatchInferenceWorker
+
+
+class GatedModel:
+    """Fake model whose first forward pass blocks until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.batch_sizes = []
+
+    def __call__(self, batch):
+        if not self.batch_sizes:
+            self.release.wait(5)
+        self.batch_sizes.append(len(batch))
+        return torch.full((len(batch), 1), 0.5)
+
+
+def test_images_waiting_behind_a_forward_pass_do_not_wait_again():
+    model = GatedModel()
+    worker = BatchInferenceWorker(model, max_batch_size=16, max_wait_ms=300)
+    try:
+        first = worker.submit(torch.zeros(3))
+        time.sleep(0.4)  # first batch is now in the (blocked) forward pass
+        queued = worker.submit(torch.zeros(3))
+        time.sleep(0.4)  # queued has waited past max_wait before the worker is free
+        model.release.set()
+
+        assert first.result(timeout=5) == 0.5
+        start = time.monotonic()
+        assert queued.result(timeout=5) == 0.5
+        assert time.monotonic() - start < 0.15
+        assert model.batch_sizes == [1, 1]
+    finally:
+        worker.stop()
@@ -0,0 +1,34 @@
+import queue
+import time
+
+from core.batching import collect_batch, percentile
+
+
+def test_collect_batch_stops_at_max_size():
+    q = queue.Queue()
+    for i in range(1, 10):
+        q.put(i)
+    assert collect_batch(q, 0, max_size=4, deadline=time.monotonic() + 5) == [0, 1, 2, 3]
+    assert q.qsize() == 6
+
+
+def test_collect_batch_stops_at_deadline():
+    q = queue.Queue()
+    start = time.monotonic()
+    assert collect_batch(q, "first", max_size=4, deadline=start + 0.05) == ["first"]
+    assert 0.04 <= time.monotonic() - start < 1
+
+
+def test_collect_batch_requeues_stop_sentinel():
+    q = queue.Queue()
+    for item in (1, None, 2):
+        q.put(item)
+    assert collect_batch(q, 0, max_size=10, deadline=time.monotonic() + 5) == [0, 1]
+    assert [q.get_nowait() for _ in range(q.qsize())] == [2, None]
+
+
+def test_percentile():
+    values = sorted(range(1, 101))
+    assert percentile(values, 0.5) == 51
+    assert percentile(values, 0.99) == 100
+    assert percentile([], 0.5) == 0.0
@@ -0,0 +1,77 @@
+import os
+import random
+from uuid import uuid4
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from core.geohash import encode, prefix_upper_bound
+from models.hazard import Hazard
+from models.users import Users
+from services.hazard_service import get_hazards_near_location
+from services.location_service import haversine_distance
+
+# Set TEST_POSTGRES_URL to also run the equivalence check on PostgreSQL,
+# where varchar comparison follows the database collation, not byte order
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+def test_prefix_upper_bound_increments_last_character():
+    assert prefix_upper_bound("tsq4") == "tsq5"
+    assert prefix_upper_bound("tsq9") == "tsqb"  # skips "a", not in the alphabet
+    assert prefix_upper_bound("tsqz") == "tsr"
+    assert prefix_upper_bound("tzzz") == "u"
+    assert prefix_upper_bound("zzz") is None
+
+
+def test_prefix_range_holds_every_extension():
+    rng = random.Random(3)
+    for _ in range(1000):
+        geohash = encode(rng.uniform(-89, 89), rng.uniform(-179, 179))
+        for length in range(1, len(geohash)):
+            prefix = geohash[:length]
+            upper = prefix_upper_bound(prefix)
+            assert prefix <= geohash and (upper is None or geohash < upper)
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def spatial_engine(request, engine):
+    if request.param == "sqlite":
+        yield engine
+        return
+    if not POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL not set")
+    pg_engine = create_engine(POSTGRES_URL)
+    SQLModel.metadata.create_all(pg_engine)
+    yield pg_engine
+    SQLModel.metadata.drop_all(pg_engine)
+    pg_engine.dispose()
+
+
+def test_nearby_matches_full_scan(spatial_engine):
+    rng = random.Random(42)
+    center_lat, center_lng, spread = 28.61, 77.21, 0.2
+    with Session(spatial_engine) as session:
+        reporter = Users(name="reporter", email=f"{uuid4()}@example.com", password_hash="x")
+        session.add(reporter)
+        session.commit()
+        session.add_all([
+            Hazard(
+                lat=center_lat + rng.uniform(-spread, spread),
+                lng=center_lng + rng.uniform(-spread, spread),
+                hazard_type="pothole",
+                photo_url="hazards/test.jpg",
+                reported_by=reporter.id
+            )
+            for _ in range(3000)
+        ])
+        session.commit()
+        hazards = session.exec(select(Hazard.id, Hazard.lat, Hazard.lng)).all()
+
+        for _ in range(25):
+            lat = center_lat + rng.uniform(-spread, spread)
+            lng = center_lng + rng.uniform(-spread, spread)
+            radius_km = rng.uniform(0.5, 8)
+            expected = sorted(i for i, a, b in hazards if haversine_distance(lat, lng, a, b) <= radius_km)
+            found = sorted(h.id for h in get_hazards_near_location(session, lat, lng, radius_km))
+            assert found == expected
@@ -0,0 +1,75 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+
+from models.hazard import Hazard
+from models.users import Users
+from services.hazard_service import list_feed_page
+from services.vote_service import toggle_vote
+
+
+@pytest.fixture
+def users(session):
+    users = [Users(name=f"u{i}", email=f"{uuid4()}@example.com", password_hash="x") for i in range(3)]
+    session.add_all(users)
+    session.commit()
+    return [u.id for u in users]
+
+
+@pytest.fixture
+def hazard_ids(session, users):
+    hazards = [
+        Hazard(lat=28.6, lng=77.2, hazard_type="pothole", photo_url="hazards/a.jpg", reported_by=users[0])
+        for _ in range(4)
+    ]
+    session.add_all(hazards)
+    session.commit()
+    return [h.id for h in hazards]
+
+
+def test_feed_pairs_each_hazard_with_only_the_callers_vote(engine, session, users, hazard_ids):
+    me, other, third = users
+    toggle_vote(session, me, hazard_ids[0], "upvote")
+    toggle_vote(session, me, hazard_ids[1], "downvote")
+    # Other users' votes must neither show up as mine nor duplicate feed rows
+    for voter in (other, third):
+        toggle_vote(session, voter, hazard_ids[0], "downvote")
+        toggle_vote(session, voter, hazard_ids[2], "upvote")
+    session.expunge_all()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        rows, next_cursor = list_feed_page(session, me, limit=10)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(statements) == 1  # one query for the whole page
+    assert next_cursor is None
+    by_id = {hazard.id: (vote_type, hazard.upvotes, hazard.downvotes) for hazard, vote_type in rows}
+    assert len(rows) == len(by_id) == 4
+    assert by_id == {
+        hazard_ids[0]: ("upvote", 1, 2),
+        hazard_ids[1]: ("downvote", 0, 1),
+        hazard_ids[2]: (None, 2, 0),
+        hazard_ids[3]: (None, 0, 0),
+    }
+
+
+def test_feed_pages_with_votes_keep_the_cursor_order(session, users, hazard_ids):
+    me, other, _ = users
+    for hazard_id in hazard_ids:
+        toggle_vote(session, other, hazard_id, "upvote")
+    toggle_vote(session, me, hazard_ids[1], "upvote")
+
+    first, cursor = list_feed_page(session, me, limit=2)
+    second, cursor_after = list_feed_page(session, me, limit=2, cursor=cursor)
+
+    assert [h.id for h, _ in first + second] == sorted(hazard_ids, reverse=True)
+    assert cursor_after is None
+    assert [vote for _, vote in first + second] == [None, None, "upvote", None]
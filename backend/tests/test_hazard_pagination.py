@@ -0,0 +1,90 @@
+import base64
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from api.hazard import router as hazard_router
+from db.session import get_read_session
+from models.hazard import Hazard
+from models.users import Users
+from services.hazard_service import decode_cursor, encode_cursor, list_hazards_page
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def reporter(session):
+    user = Users(name="reporter", email=f"{uuid4()}@example.com", password_hash="x")
+    session.add(user)
+    session.commit()
+    return user.id
+
+
+@pytest.fixture
+def hazards(session, reporter):
+    """12 hazards over 4 timestamps, 3 per timestamp, so ties need the id tie-break"""
+    rows = [
+        Hazard(
+            lat=28.6, lng=77.2, hazard_type="pothole", photo_url="hazards/a.jpg", reported_by=reporter,
+            status="resolved" if i % 4 == 0 else "unresolved",
+            created_at=T0 + timedelta(minutes=i // 3)
+        )
+        for i in range(12)
+    ]
+    session.add_all(rows)
+    session.commit()
+    return [(h.created_at, h.id) for h in rows]
+
+
+def test_cursor_round_trip():
+    hazard = Hazard(id=42, created_at=datetime(2026, 3, 4, 5, 6, 7, 890123))
+    assert decode_cursor(encode_cursor(hazard)) == (hazard.created_at, 42)
+
+
+def test_pages_cover_every_hazard_once_in_created_at_id_order(session, hazards):
+    seen, cursor = [], None
+    while True:
+        page, cursor = list_hazards_page(session, limit=5, cursor=cursor)
+        seen.extend((h.created_at, h.id) for h in page)
+        if cursor is None:
+            break
+
+    assert seen == sorted(hazards, reverse=True)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(b'{"c": "2026-01-01T00:00:00"}').decode(),
+    base64.urlsafe_b64encode(b'{"c": "yesterday", "i": 1}').decode(),
+    base64.urlsafe_b64encode(b'{"c": "2026-01-01T00:00:00", "i": "x"}').decode(),
+    base64.urlsafe_b64encode(b"[1, 2]").decode(),
+])
+def test_bad_cursor_is_rejected(session, cursor):
+    with pytest.raises(HTTPException) as exc:
+        list_hazards_page(session, cursor=cursor)
+    assert exc.value.status_code == 400
+
+
+def test_list_endpoint_filters_by_status_and_follows_cursor(engine, hazards):
+    app = FastAPI()
+    app.include_router(hazard_router, prefix="/api/hazards")
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_read_session] = session_override
+    client = TestClient(app)
+
+    first = client.get("/api/hazards/", params={"status": "resolved", "limit": 2}).json()
+    second = client.get("/api/hazards/", params={"status": "resolved", "limit": 2, "cursor": first["next_cursor"]}).json()
+    items = first["items"] + second["items"]
+    assert [item["status"] for item in items] == ["resolved"] * 3
+    assert second["next_cursor"] is None
+
+    assert client.get("/api/hazards/", params={"cursor": "garbage"}).status_code == 400
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlmodel import Session
+
+from models.location import UserCurrentLocation
+from models.users import Users
+from services.location_service import (
+    UserLocationGrid,
+    find_users_near_location,
+    haversine_distance,
+    haversine_distances,
+    nearest_k,
+    within_radius
+)
+
+
+def test_vectorized_haversine_matches_scalar():
+    rng = np.random.default_rng(42)
+    lats = rng.uniform(-89, 89, 20_000)
+    lngs = rng.uniform(-180, 180, 20_000)
+    lat, lng = 28.61, 77.21
+
+    expected = np.array([haversine_distance(lat, lng, a, b) for a, b in zip(lats, lngs)])
+    np.testing.assert_allclose(haversine_distances(lat, lng, lats, lngs), expected, rtol=1e-9, atol=1e-9)
+
+
+def test_vectorized_haversine_handles_identical_and_antipodal_points():
+    distances = haversine_distances(10.0, 20.0, [10.0, -10.0], [20.0, -160.0])
+    assert distances[0] == 0.0
+    assert np.isclose(distances[1], np.pi * 6371)
+
+
+def test_within_radius_and_nearest_k_agree_with_scalar():
+    lats = [28.61, 28.62, 28.70, 29.50]
+    lngs = [77.21, 77.22, 77.30, 77.21]
+    mask, _ = within_radius(28.61, 77.21, lats, lngs, radius_km=15)
+    expected = [haversine_distance(28.61, 77.21, a, b) <= 15 for a, b in zip(lats, lngs)]
+    assert mask.tolist() == expected
+    assert nearest_k(28.61, 77.21, lats, lngs, 2).tolist() == [0, 1]
+
+
+@pytest.fixture
+def user_ids(session):
+    users = [Users(name=f"u{i}", email=f"{uuid4()}@example.com", password_hash="x") for i in range(3)]
+    session.add_all(users)
+    session.commit()
+    return [u.id for u in users]
+
+
+def move(engine, user_id, lat, lng, updated_at=None):
+    # A write handled by another worker: straight to the DB, not this grid
+    with Session(engine) as session:
+        loc = session.get(UserCurrentLocation, user_id) or UserCurrentLocation(user_id=user_id, lat=lat, lng=lng)
+        loc.lat, loc.lng = lat, lng
+        loc.updated_at = updated_at or datetime.utcnow()
+        session.add(loc)
+        session.commit()
+
+
+def nearby_ids(grid, lat, lng):
+    return sorted(loc.user_id for loc in grid.query(lat, lng, 2))
+
+
+def test_grid_refresh_picks_up_other_workers_writes(engine, session, user_ids):
+    a, b, c = user_ids
+    move(engine, a, 28.61, 77.21)
+    grid = UserLocationGrid()
+    grid.refresh(session, max_age_s=60)
+    assert nearby_ids(grid, 28.61, 77.21) == [a]
+
+    move(engine, b, 28.61, 77.21)
+    move(engine, a, 19.07, 72.87)
+    grid.refresh(session, max_age_s=60)
+    assert nearby_ids(grid, 28.61, 77.21) == [a]  # still within max_age_s
+
+    grid.refresh(session, max_age_s=0)
+    assert nearby_ids(grid, 28.61, 77.21) == [b]
+    assert nearby_ids(grid, 19.07, 72.87) == [a]
+
+    # A commit that lands late with an older timestamp is caught by the overlap
+    move(engine, c, 28.61, 77.21, updated_at=datetime.utcnow() - timedelta(seconds=10))
+    grid.refresh(session, max_age_s=0, overlap_s=30)
+    assert nearby_ids(grid, 28.61, 77.21) == sorted([b, c])
+
+
+def test_grid_sync_keeps_newer_local_position(engine, session, user_ids):
+    a = user_ids[0]
+    move(engine, a, 28.61, 77.21, updated_at=datetime.utcnow() - timedelta(seconds=5))
+    grid = UserLocationGrid()
+    grid.rebuild(session)
+
+    # This worker has a newer position than the row a sync re-reads
+    grid.upsert(UserCurrentLocation(user_id=a, lat=19.07, lng=72.87, updated_at=datetime.utcnow()))
+    grid.sync(session, overlap_s=30)
+    assert nearby_ids(grid, 19.07, 72.87) == [a]
+    assert nearby_ids(grid, 28.61, 77.21) == []
+
+
+def test_find_users_near_location_reads_every_workers_writes(engine, session, user_ids):
+    a, b, c = user_ids
+    move(engine, a, 28.61, 77.21)
+    move(engine, b, 28.62, 77.22)  # ~1.5 km away
+    move(engine, c, 19.07, 72.87)
+
+    found = find_users_near_location(session, 28.61, 77.21, radius_km=2)
+    assert sorted(loc.user_id for loc in found) == sorted([a, b])
+    grid = UserLocationGrid()
+    grid.rebuild(session)
+    assert sorted(loc.user_id for loc in found) == nearby_ids(grid, 28.61, 77.21)
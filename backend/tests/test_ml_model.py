@@ -0,0 +1,50 @@
+from io import BytesIO
+
+import numpy as np
+import pytest
+import torch
+from PIL import Image, ImageDraw, ImageFilter
+
+from core.ml_model import preprocess, preprocess_reference
+
+# Inputs are normalized to [-1, 1], so 0.1 is about 13 of 255 levels
+JPEG_ATOL = 0.1
+JPEG_MEAN_ATOL = 0.01
+
+
+def photo_like(size, fmt: str, mode: str = "RGB") -> bytes:
+    """Smooth gradient with blurred blobs: close enough to a photo for resampling"""
+    rng = np.random.default_rng(7)
+    w, h = size
+    y, x = np.mgrid[0:h, 0:w]
+    arr = np.stack([x * 255 / w, y * 255 / h, (x + y) * 127 / (w + h) + 64], axis=-1).astype(np.uint8)
+    img = Image.fromarray(arr)
+    draw = ImageDraw.Draw(img)
+    for _ in range(12):
+        x0, y0 = rng.integers(0, w), rng.integers(0, h)
+        draw.ellipse([x0, y0, x0 + w // 6, y0 + h // 6], fill=tuple(int(v) for v in rng.integers(0, 255, 3)))
+    img = img.filter(ImageFilter.GaussianBlur(max(w, h) / 400)).convert(mode)
+
+    buf = BytesIO()
+    img.save(buf, format=fmt, **({"quality": 90} if fmt == "JPEG" else {}))
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("size", [(200, 150), (640, 480), (1920, 1080), (4032, 3024)])
+@pytest.mark.parametrize("mode", ["RGB", "L"])
+def test_jpeg_fast_path_matches_reference(size, mode):
+    image_bytes = photo_like(size, "JPEG", mode)
+    fast, reference = preprocess(image_bytes), preprocess_reference(image_bytes)
+
+    assert fast.shape == reference.shape == (3, 128, 128)
+    # Draft-mode DCT scaling differs slightly from a full decode + resize
+    torch.testing.assert_close(fast, reference, atol=JPEG_ATOL, rtol=0)
+    assert (fast - reference).abs().mean().item() < JPEG_MEAN_ATOL
+
+
+@pytest.mark.parametrize("size", [(200, 150), (1920, 1080)])
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "L"])
+def test_png_fast_path_matches_reference(size, mode):
+    image_bytes = photo_like(size, "PNG", mode)
+    # No draft mode for PNG: only the normalization arithmetic differs
+    torch.testing.assert_close(preprocess(image_bytes), preprocess_reference(image_bytes), atol=1e-6, rtol=0)
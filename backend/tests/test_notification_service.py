@@ -0,0 +1,79 @@
+import socket
+from concurrent.futures import wait
+
+import pytest
+
+from core.notification_service import EmailSender, SMTPConnectionPool, build_hazard_message
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+HOST = "127.0.0.1"
+
+
+class RecordingHandler:
+    """Local SMTP stand-in: records recipients and which connection delivered them"""
+
+    def __init__(self):
+        self.recipients = []
+        self.sessions = []  # one entry per delivering connection
+        self.drop_on = set()  # message numbers (1-based) whose connection is cut before the reply
+
+    async def handle_DATA(self, server, session, envelope):
+        if session not in self.sessions:
+            self.sessions.append(session)
+        self.recipients.extend(envelope.rcpt_tos)
+        if len(self.recipients) in self.drop_on:
+            server.transport.close()
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname=HOST, port=free_port())
+    controller.start()
+    yield handler, controller.port
+    controller.stop()
+
+
+def send_all(port, count):
+    sender = EmailSender(SMTPConnectionPool(HOST, port, size=1), workers=1, max_batch_size=count, max_wait_ms=200)
+    messages = [
+        build_hazard_message(f"user{i}@example.com", "accident", "Lat: 28.6, Lng: 77.2", "High", "Drive carefully")
+        for i in range(count)
+    ]
+    futures = [sender.submit(m) for m in messages]
+    wait(futures, timeout=30)
+    sender.stop()
+    return [f.exception() for f in futures], sender.stats()
+
+
+def test_batch_is_sent_over_one_reused_connection(smtp_server):
+    handler, port = smtp_server
+    errors, stats = send_all(port, 10)
+
+    assert errors == [None] * 10
+    assert sorted(handler.recipients) == sorted(f"user{i}@example.com" for i in range(10))
+    assert len(handler.sessions) == 1
+    assert stats["connections_opened"] == 1
+    assert stats["sent"] == 10 and stats["reconnects"] == 0
+
+
+def test_dropped_connection_is_reopened_and_message_retried(smtp_server):
+    handler, port = smtp_server
+    handler.drop_on = {4}
+    errors, stats = send_all(port, 10)
+
+    assert errors == [None] * 10
+    assert stats["reconnects"] == 1
+    assert stats["connections_opened"] == 2
+    assert len(handler.sessions) == 2
+    # Message 4 reached the server before the cut, so the retry delivers it twice
+    assert set(handler.recipients) == {f"user{i}@example.com" for i in range(10)}
+    assert len(handler.recipients) == 11
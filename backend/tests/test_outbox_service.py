@@ -0,0 +1,129 @@
+import random
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, func, insert
+from sqlmodel import Session, select
+
+from models.hazard import Hazard
+from models.location import UserCurrentLocation
+from models.notification import Notification
+from models.users import Users
+from services.location_service import find_users_near_location
+from services.outbox_service import RateLimiter, fan_out_alert
+
+N_USERS = 10_000
+CENTER_LAT, CENTER_LNG = 28.61, 77.21
+CHUNK = 1000
+
+
+@pytest.fixture
+def user_ids(session):
+    rng = random.Random(42)
+    ids = [uuid4() for _ in range(N_USERS)]
+    session.connection().execute(insert(Users.__table__), [
+        {"id": user_id, "name": f"u{i}", "email": f"u{i}@example.com", "password_hash": "x", "role": "user"}
+        for i, user_id in enumerate(ids)
+    ])
+    # All within ~1 km of the center, so every user is in alert range
+    session.connection().execute(insert(UserCurrentLocation.__table__), [
+        {
+            "user_id": user_id,
+            "lat": CENTER_LAT + rng.uniform(-0.008, 0.008),
+            "lng": CENTER_LNG + rng.uniform(-0.008, 0.008),
+            "updated_at": datetime.utcnow()
+        }
+        for user_id in ids
+    ])
+    session.commit()
+    return ids
+
+
+def report(session, reporter):
+    hazard = Hazard(lat=CENTER_LAT, lng=CENTER_LNG, hazard_type="accident", photo_url="hazards/a.jpg", reported_by=reporter)
+    session.add(hazard)
+    session.commit()
+    session.refresh(hazard)
+    return hazard
+
+
+def fan_out(session, hazard):
+    nearby = find_users_near_location(session, hazard.lat, hazard.lng, radius_km=2)
+    return fan_out_alert(session, hazard, [loc.user_id for loc in nearby], chunk_size=CHUNK)
+
+
+def notification_count(session):
+    return session.exec(select(func.count()).select_from(Notification)).one()
+
+
+@pytest.fixture
+def inserts(engine):
+    """(executions, statements): INSERT INTO notifications calls made by the app vs sent to the driver"""
+    executions, statements = [], []
+
+    def on_execute(conn, clauseelement, multiparams, params, execution_options):
+        if getattr(clauseelement, "table", None) is Notification.__table__ and clauseelement.is_insert:
+            executions.append(clauseelement)
+
+    def on_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO notifications"):
+            statements.append(statement)
+
+    event.listen(engine, "before_execute", on_execute)
+    event.listen(engine, "before_cursor_execute", on_cursor_execute)
+    yield executions, statements
+    event.remove(engine, "before_execute", on_execute)
+    event.remove(engine, "before_cursor_execute", on_cursor_execute)
+
+
+def test_fan_out_to_10k_users_is_one_bulk_insert_and_deduplicated(session, user_ids, inserts):
+    executions, statements = inserts
+    hazard = report(session, user_ids[0])
+
+    assert fan_out(session, hazard) == N_USERS - 1  # reporter excluded
+    assert notification_count(session) == N_USERS - 1
+    assert len(executions) == 1
+    assert len(statements) == -(-(N_USERS - 1) // CHUNK)  # multi-row VALUES pages, not one per user
+
+    # A second hazard in the same area within the dedup window alerts nobody
+    second = report(session, user_ids[0])
+    assert fan_out(session, second) == 0
+    assert notification_count(session) == N_USERS - 1
+    assert len(executions) == 1
+
+
+def test_racing_fan_outs_are_deduplicated_by_the_unique_index(engine, session, user_ids):
+    hazard = report(session, user_ids[0])
+    raced = []
+
+    def race(conn, cursor, statement, parameters, context, executemany):
+        # Another worker fans out after this one's dedup SELECT, before its INSERT
+        if statement.startswith("INSERT INTO notifications") and not raced:
+            raced.append(True)
+            with Session(engine) as other:
+                raced.append(fan_out(other, other.get(Hazard, hazard.id)))
+
+    event.listen(engine, "before_cursor_execute", race)
+    try:
+        inserted = fan_out(session, hazard)
+    finally:
+        event.remove(engine, "before_cursor_execute", race)
+
+    assert raced == [True, N_USERS - 1]
+    assert inserted == 0
+    assert notification_count(session) == N_USERS - 1
+
+
+def test_rate_limiter_spaces_acquisitions(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("services.outbox_service.time.monotonic", lambda: clock[0])
+    monkeypatch.setattr("services.outbox_service.time.sleep", lambda s: clock.__setitem__(0, clock[0] + s))
+
+    # Powers of two keep the fake clock's float arithmetic exact
+    limiter = RateLimiter(rate=8, burst=4)
+    for _ in range(24):
+        limiter.acquire()
+
+    # The burst goes out at once, the other 20 at 8/s
+    assert clock[0] == pytest.approx(2.5)
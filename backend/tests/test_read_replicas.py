@@ -0,0 +1,86 @@
+from uuid import uuid4
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel, Session, create_engine
+
+import db.session
+from api.hazard import router as hazard_router
+from core.deps import get_current_user, get_current_user_async
+from db.session import RoundRobin, async_database_url, create_async_db_engine, get_read_session
+from models.hazard import Hazard
+from models.users import Users
+
+NAMES = ("primary", "replica1", "replica2")
+
+
+@pytest.fixture
+def user():
+    return Users(id=uuid4(), name="reader", email="reader@example.com", password_hash="x")
+
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch, user):
+    """Primary and two replica SQLite files, each holding one hazard named after it"""
+    engines, async_engines = {}, {}
+    for name in NAMES:
+        url = f"sqlite:///{tmp_path / name}.db"
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(Users(id=user.id, name=user.name, email=user.email, password_hash="x"))
+            session.add(Hazard(lat=28.6, lng=77.2, hazard_type=name, photo_url="hazards/a.jpg", reported_by=user.id))
+            session.commit()
+        engines[name] = engine
+        async_engines[name] = create_async_db_engine(async_database_url(url))
+
+    monkeypatch.setattr(db.session, "engine", engines["primary"])
+    monkeypatch.setattr(db.session, "async_engine", async_engines["primary"])
+    monkeypatch.setattr(db.session, "read_engines", RoundRobin(
+        [engines["replica1"], engines["replica2"]], engines["primary"]
+    ))
+    monkeypatch.setattr(db.session, "async_read_engines", RoundRobin(
+        [async_engines["replica1"], async_engines["replica2"]], async_engines["primary"]
+    ))
+    yield
+    for engine in engines.values():
+        engine.dispose()
+
+
+@pytest.fixture
+def client(databases, user):
+    app = FastAPI()
+    app.include_router(hazard_router, prefix="/api/hazards")
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_current_user_async] = lambda: user
+
+    @app.api_route("/probe", methods=["GET", "POST", "PUT", "DELETE"])
+    def probe(session: Session = Depends(get_read_session)):
+        return session.get(Hazard, 1).hazard_type
+
+    with TestClient(app) as client:
+        yield client
+
+
+def served_by(response):
+    assert response.status_code == 200, response.text
+    body = response.json()
+    items = body["items"] if isinstance(body, dict) else body
+    return [item["hazard_type"] for item in items]
+
+
+def test_reads_alternate_between_replicas(client):
+    assert [served_by(client.get("/api/hazards/")) for _ in range(4)] == [
+        ["replica1"], ["replica2"], ["replica1"], ["replica2"]
+    ]
+    # The async read path has its own rotation
+    nearby = "/api/hazards/nearby?lat=28.6&lng=77.2"
+    assert [served_by(client.get(nearby)) for _ in range(2)] == [["replica1"], ["replica2"]]
+
+
+def test_writes_and_own_reads_stay_on_primary(client):
+    assert [client.request(method, "/probe").json() for method in ("POST", "PUT", "DELETE")] == ["primary"] * 3
+    # /mine must see the caller's own fresh reports, so it never reads a replica
+    assert [served_by(client.get("/api/hazards/mine")) for _ in range(3)] == [["primary"]] * 3
+    assert client.get("/probe").json() == "replica1"
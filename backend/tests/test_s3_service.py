@@ -0,0 +1,53 @@
+from core.s3_service import PresignedUrlCache
+
+
+class StubS3Client:
+    def __init__(self):
+        self.signed = 0
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        self.signed += 1
+        return f"https://{Params['Bucket']}.example/{Params['Key']}?sig={self.signed}&expires={ExpiresIn}"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(monkeypatch, **kwargs):
+    clock = FakeClock()
+    monkeypatch.setattr("core.ttl_cache.time.monotonic", clock)
+    client = StubS3Client()
+    return PresignedUrlCache(client, "bucket", **kwargs), client, clock
+
+
+def test_url_is_reused_before_reuse_fraction_and_resigned_after(monkeypatch):
+    cache, client, clock = make_cache(monkeypatch, reuse_fraction=0.8)
+
+    first = cache.get("hazards/a.jpg", expires_in=100)
+    clock.now += 79
+    assert cache.get("hazards/a.jpg", expires_in=100) == first
+    assert client.signed == 1
+
+    clock.now += 2  # 81s: past 80% of the 100s lifetime
+    second = cache.get("hazards/a.jpg", expires_in=100)
+    assert second != first
+    assert client.signed == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_entries_are_keyed_by_expiry_and_bounded(monkeypatch):
+    cache, client, _ = make_cache(monkeypatch, maxsize=2)
+
+    cache.get("a", expires_in=100)
+    cache.get("a", expires_in=200)
+    assert client.signed == 2
+
+    cache.get("b", expires_in=100)  # evicts ("a", 100), the least recently used
+    cache.get("a", expires_in=100)
+    assert client.signed == 4
+    assert cache.stats()["size"] == 2
@@ -0,0 +1,48 @@
+from core.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(monkeypatch, **kwargs):
+    clock = FakeClock()
+    monkeypatch.setattr("core.ttl_cache.time.monotonic", clock)
+    return TTLCache(**kwargs), clock
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache, clock = make_cache(monkeypatch, ttl_s=10)
+    cache.put("a", 1)
+    cache.put("b", 2, ttl_s=30)  # per-entry override
+
+    clock.now += 9
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3, "size": 1, "maxsize": 10000}
+
+
+def test_no_ttl_keeps_entries_until_evicted(monkeypatch):
+    cache, clock = make_cache(monkeypatch, maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    clock.now += 10 ** 6
+    assert cache.get("a") == 1  # now most recently used
+
+    cache.put("c", 3)  # evicts "b"
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_pop_removes_entry(monkeypatch):
+    cache, _ = make_cache(monkeypatch)
+    cache.put("a", 1)
+    cache.pop("a")
+    cache.pop("missing")
+    assert cache.get("a") is None
@@ -0,0 +1,111 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+import services.upload_service as upload_service
+from core.s3_service import MULTIPART_PART_SIZE
+from core.storage import S3Storage, run_storage_io
+from services.upload_service import receive_upload
+
+
+class StubS3Client:
+    """Records the S3 calls a streaming upload makes"""
+
+    def __init__(self):
+        self.calls = []
+        self.parts = {}
+
+    def create_multipart_upload(self, Bucket, Key, ContentType):
+        self.calls.append("create_multipart_upload")
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.calls.append("upload_part")
+        self.parts[PartNumber] = bytes(Body)
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.calls.append("complete_multipart_upload")
+        self.body = b"".join(self.parts[p["PartNumber"]] for p in MultipartUpload["Parts"])
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.calls.append("put_object")
+        self.body = bytes(Body)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.calls.append("abort_multipart_upload")
+
+
+def make_file(data: bytes) -> UploadFile:
+    # size=None: make receive_upload enforce the cap while streaming
+    return UploadFile(io.BytesIO(data), filename="photo.jpg", headers=Headers({"content-type": "image/jpeg"}))
+
+
+@pytest.fixture
+def offloaded(monkeypatch):
+    """Counts the writes sent to the storage I/O pool"""
+    calls = []
+
+    async def counting_run_storage_io(fn, *args):
+        calls.append(getattr(fn, "__name__", fn))
+        return await run_storage_io(fn, *args)
+
+    monkeypatch.setattr(upload_service, "run_storage_io", counting_run_storage_io)
+    return calls
+
+
+def receive(client, data: bytes, keep_bytes: bool = False):
+    async def run():
+        upload, digest, image_bytes = await receive_upload(
+            make_file(data), keep_bytes=keep_bytes, target=S3Storage(client, "bucket")
+        )
+        return upload, digest, image_bytes
+
+    return asyncio.run(run())
+
+
+def test_small_photo_is_buffered_and_sent_in_one_put(offloaded):
+    client = StubS3Client()
+    data = b"x" * (1024 * 1024)
+
+    upload, digest, image_bytes = receive(client, data, keep_bytes=True)
+
+    assert client.calls == []  # nothing sent while the body arrives
+    assert "write" not in offloaded
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert bytes(image_bytes) == data
+
+    upload.complete()
+    assert client.calls == ["put_object"]
+    assert client.body == data
+
+
+def test_large_photo_sends_full_parts_while_receiving(offloaded):
+    client = StubS3Client()
+    data = bytes(range(256)) * ((MULTIPART_PART_SIZE + 1024 * 1024) // 256)
+
+    upload, digest, _ = receive(client, data)
+
+    assert client.calls == ["create_multipart_upload", "upload_part"]
+    assert len(client.parts[1]) == MULTIPART_PART_SIZE
+    assert offloaded.count("write") == 1  # only the write that filled the part
+
+    upload.complete()
+    assert client.calls[-2:] == ["upload_part", "complete_multipart_upload"]
+    assert client.body == data
+    assert digest == hashlib.sha256(data).hexdigest()
+
+
+def test_oversized_upload_is_rejected_and_aborted(monkeypatch):
+    monkeypatch.setattr(upload_service.settings, "MAX_UPLOAD_BYTES", MULTIPART_PART_SIZE + 1024)
+    client = StubS3Client()
+
+    with pytest.raises(HTTPException) as exc:
+        receive(client, b"x" * (MULTIPART_PART_SIZE * 2))
+
+    assert exc.value.status_code == 413
+    assert client.calls == ["create_multipart_upload", "upload_part", "abort_multipart_upload"]
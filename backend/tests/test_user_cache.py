@@ -0,0 +1,113 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import core.deps
+import services.users_service
+from core.deps import get_current_admin, get_current_user, get_current_user_async
+from core.security import create_access_token
+from core.user_cache import UserCache
+from db.session import async_database_url, create_async_db_engine
+from models.users import Users
+from services.auth_service import token_claims
+from services.users_service import delete_user, update_user_profile
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    cache = UserCache(maxsize=100, ttl_s=60)
+    monkeypatch.setattr(core.deps, "user_cache", cache)
+    monkeypatch.setattr(services.users_service, "user_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def user(session):
+    user = Users(name="cached", email=f"{uuid4()}@example.com", password_hash="x")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def token(user):
+    return create_access_token(token_claims(user))
+
+
+@pytest.fixture
+def users_queries(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_cache_hit_skips_users_query(session, user, token, users_queries, cache):
+    session.expunge_all()  # so every lookup that misses the cache hits the database
+    assert get_current_user(token, session).id == user.id
+    assert len(users_queries) == 1
+
+    session.expunge_all()
+    cached = get_current_user(token, session)
+    assert cached.id == user.id
+    assert cached.email == user.email
+    assert len(users_queries) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_role_change_applies_immediately(session, user, token):
+    with pytest.raises(HTTPException) as exc:
+        get_current_admin(get_current_user(token, session))
+    assert exc.value.status_code == 403
+
+    update_user_profile(session, user.id, {"role": "admin"})
+    assert get_current_admin(get_current_user(token, session)).role == "admin"
+
+    update_user_profile(session, user.id, {"role": "user"})
+    with pytest.raises(HTTPException) as exc:
+        get_current_admin(get_current_user(token, session))
+    assert exc.value.status_code == 403
+
+
+def test_deleted_user_is_rejected_by_both_deps(database_url, session, user, token):
+    get_current_user(token, session)  # warm the cache
+    delete_user(session, user.id)
+    session.expunge_all()
+
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(token, session)
+    assert exc.value.status_code == 404
+
+    async def current_user_async():
+        async_engine = create_async_db_engine(async_database_url(database_url))
+        try:
+            async with AsyncSession(async_engine) as async_session:
+                return await get_current_user_async(token, async_session)
+        finally:
+            await async_engine.dispose()
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(current_user_async())
+    assert exc.value.status_code == 404
+
+
+def test_put_after_invalidate_is_dropped(user, cache):
+    sub = str(user.id)
+    version = cache.version()  # a request starts loading the user...
+    cache.invalidate(sub)  # ...the user changes meanwhile...
+    cache.put(sub, user, version)  # ...and the stale load must not be cached
+
+    assert cache.get(sub) is None
+
+    cache.put(sub, user, cache.version())
+    assert cache.get(sub).id == user.id
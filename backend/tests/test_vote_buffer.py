@@ -0,0 +1,91 @@
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session, select
+
+from models.hazard import Hazard
+from models.users import Users
+from models.vote import Vote
+from services.vote_buffer import VoteBuffer
+
+
+@pytest.fixture
+def user_id(session):
+    user = Users(name="voter", email=f"{uuid4()}@example.com", password_hash="x")
+    session.add(user)
+    session.commit()
+    return user.id
+
+
+@pytest.fixture
+def hazard_id(session, user_id):
+    hazard = Hazard(lat=28.6, lng=77.2, hazard_type="pothole", photo_url="hazards/a.jpg", reported_by=user_id)
+    session.add(hazard)
+    session.commit()
+    return hazard.id
+
+
+@pytest.fixture
+def buffer(engine):
+    # Not started: tests call flush() themselves
+    return VoteBuffer(engine, flush_interval_ms=60_000, max_entries=1000)
+
+
+def committed(engine, hazard_id):
+    with Session(engine) as session:
+        votes = session.exec(select(Vote.vote_type).where(Vote.report_id == hazard_id)).all()
+        hazard = session.get(Hazard, hazard_id)
+        return sorted(votes), hazard.upvotes, hazard.downvotes
+
+
+def test_taps_coalesce_into_one_row_change(engine, session, buffer, user_id, hazard_id):
+    actions = [buffer.toggle(session, user_id, hazard_id, vote) for vote in ("upvote", "upvote", "downvote", "upvote")]
+    assert actions == ["created", "removed", "created", "updated"]
+
+    # Nothing written yet, but reads overlay the buffered state
+    assert committed(engine, hazard_id) == ([], 0, 0)
+    assert buffer.user_vote(user_id, hazard_id, committed=None) == "upvote"
+    assert buffer.count_delta(hazard_id) == {"upvotes": 1, "downvotes": 0}
+
+    assert buffer.flush() == 1
+    assert committed(engine, hazard_id) == (["upvote"], 1, 0)
+    assert buffer.count_delta(hazard_id) == {}
+    assert buffer.stats()["taps"] == 4 and buffer.stats()["rows_written"] == 1
+
+
+def test_taps_that_cancel_out_write_nothing(engine, session, buffer, user_id, hazard_id):
+    buffer.toggle(session, user_id, hazard_id, "upvote")
+    buffer.toggle(session, user_id, hazard_id, "upvote")
+
+    assert buffer.flush() == 0
+    assert committed(engine, hazard_id) == ([], 0, 0)
+    assert buffer.count_delta(hazard_id) == {}
+
+
+def test_unknown_hazard_is_404(session, buffer, user_id):
+    with pytest.raises(HTTPException) as exc:
+        buffer.toggle(session, user_id, 9999, "upvote")
+    assert exc.value.status_code == 404
+
+
+def test_failed_flush_restores_entries_and_newer_taps_win(engine, session, buffer, user_id, hazard_id, monkeypatch):
+    buffer.toggle(session, user_id, hazard_id, "upvote")
+    write = buffer._write
+
+    def failing_write(batch):
+        # A tap lands while the batch is in flight, then the write fails
+        buffer.toggle(session, user_id, hazard_id, "downvote")
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(buffer, "_write", failing_write)
+    assert buffer.flush() == 0
+    assert committed(engine, hazard_id) == ([], 0, 0)
+    assert buffer.user_vote(user_id, hazard_id, committed=None) == "downvote"
+    assert buffer.stats()["pending"] == 1
+
+    monkeypatch.setattr(buffer, "_write", write)
+    assert buffer.flush() == 1
+    # Counters move from the committed state (no vote), not the lost upvote
+    assert committed(engine, hazard_id) == (["downvote"], 0, 1)
+    assert buffer.count_delta(hazard_id) == {}
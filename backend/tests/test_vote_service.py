@@ -0,0 +1,82 @@
+import threading
+from uuid import uuid4
+
+import pytest
+from sqlmodel import Session, select
+
+from models.hazard import Hazard
+from models.users import Users
+from models.vote import Vote
+from services.vote_service import toggle_vote
+
+
+@pytest.fixture
+def user_id(session):
+    user = Users(name="voter", email=f"{uuid4()}@example.com", password_hash="x")
+    session.add(user)
+    session.commit()
+    return user.id
+
+
+@pytest.fixture
+def hazard_id(session, user_id):
+    hazard = Hazard(lat=28.6, lng=77.2, hazard_type="pothole", photo_url="hazards/a.jpg", reported_by=user_id)
+    session.add(hazard)
+    session.commit()
+    return hazard.id
+
+
+def state(engine, hazard_id):
+    with Session(engine) as session:
+        votes = session.exec(select(Vote.vote_type).where(Vote.report_id == hazard_id)).all()
+        hazard = session.get(Hazard, hazard_id)
+        return sorted(votes), hazard.upvotes, hazard.downvotes
+
+
+def test_create_update_remove(engine, session, user_id, hazard_id):
+    assert toggle_vote(session, user_id, hazard_id, "upvote") == "created"
+    assert state(engine, hazard_id) == (["upvote"], 1, 0)
+
+    assert toggle_vote(session, user_id, hazard_id, "downvote") == "updated"
+    assert state(engine, hazard_id) == (["downvote"], 0, 1)
+
+    assert toggle_vote(session, user_id, hazard_id, "downvote") == "removed"
+    assert state(engine, hazard_id) == ([], 0, 0)
+
+
+def run_concurrently(engine, taps):
+    """Runs each (user_id, hazard_id, vote_type) tap on its own thread and session"""
+    barrier = threading.Barrier(len(taps))
+    results, errors = [], []
+
+    def tap(user_id, hazard_id, vote_type):
+        with Session(engine) as session:
+            barrier.wait()
+            try:
+                results.append(toggle_vote(session, user_id, hazard_id, vote_type))
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=tap, args=args) for args in taps]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    return results
+
+
+def test_concurrent_double_taps_leave_exactly_one_row(engine, user_id, hazard_id):
+    # An odd number of identical taps must end as one vote, whatever the interleaving
+    results = run_concurrently(engine, [(user_id, hazard_id, "upvote")] * 5)
+
+    assert sorted(results) == ["created", "created", "created", "removed", "removed"]
+    assert state(engine, hazard_id) == (["upvote"], 1, 0)
+
+
+def test_concurrent_opposite_taps_keep_counters_in_step(engine, user_id, hazard_id):
+    run_concurrently(engine, [(user_id, hazard_id, "upvote"), (user_id, hazard_id, "downvote")])
+
+    votes, upvotes, downvotes = state(engine, hazard_id)
+    assert len(votes) == 1
+    assert (upvotes, downvotes) == ((1, 0) if votes == ["upvote"] else (0, 1))
@@ -1,11 +1,13 @@
 import React, { useEffect, useState } from 'react';
 import ReportCard from './ReportCard';
 import { getPlaceName } from '../utils/locationiq';
+import { pickThumbnail } from '../utils/thumbnails';
 import toast from 'react-hot-toast';
 
 interface Hazard {
   id: string;
   photo_url: string;
+  thumbnails?: Record<string, string>;
   description: string;
   location?: { lat: number; lng: number } | null;
   lat?: number;
@@ -24,6 +26,8 @@ interface Hazard {
 const AdminPanel: React.FC = () => {
   const [hazards, setHazards] = useState<Hazard[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [userLocation, setUserLocation] = useState<{ lat: number; lng: number } | null>(null);
 
   function calculateDistance(lat1: number, lon1: number, lat2: number, lon2: number): number {
@@ -50,10 +54,12 @@ const AdminPanel: React.FC = () => {
     }
   }, []);
 
-  const fetchAllHazards = async () => {
+  const fetchAllHazards = async (cursor: string | null = null) => {
     try {
       const token = localStorage.getItem('access_token');
-      const response = await fetch('http://localhost:8000/api/hazards/', {
+      const url = new URL('http://localhost:8000/api/hazards/');
+      if (cursor) url.searchParams.set('cursor', cursor);
+      const response = await fetch(url.toString(), {
         headers: {
           Authorization: `Bearer ${token}`,
         },
@@ -61,7 +67,7 @@ const AdminPanel: React.FC = () => {
       const data = await response.json();
 
       const formattedHazards = await Promise.all(
-        data.map(async (hazard: Hazard) => {
+        data.items.map(async (hazard: Hazard) => {
           const lat = hazard.location?.lat ?? hazard.lat;
           const lng = hazard.location?.lng ?? hazard.lng;
 
@@ -78,7 +84,8 @@ const AdminPanel: React.FC = () => {
         })
       );
 
-      setHazards(formattedHazards);
+      setHazards((prev) => (cursor ? [...prev, ...formattedHazards] : formattedHazards));
+      setNextCursor(data.next_cursor ?? null);
     } catch (error) {
       toast.error('Failed to fetch hazards');
       console.error('Failed to fetch hazards:', error);
@@ -87,6 +94,13 @@ const AdminPanel: React.FC = () => {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    await fetchAllHazards(nextCursor);
+    setLoadingMore(false);
+  };
+
   const deleteHazard = async (id: string) => {
     const token = localStorage.getItem('access_token');
     if (!window.confirm('Are you sure you want to delete this report?')) return;
@@ -171,7 +185,7 @@ const AdminPanel: React.FC = () => {
           <ReportCard
             report={{
               id: hazard.id,
-              image: hazard.photo_url,
+              image: pickThumbnail(hazard.thumbnails, hazard.photo_url),
               description: hazard.description,
               location: { lat: hazard.lat ?? 0, lng: hazard.lng ?? 0 },
               distance: hazard.distance ?? 0,
@@ -205,6 +219,18 @@ const AdminPanel: React.FC = () => {
           </div>
         </div>
       ))}
+
+      {nextCursor && (
+        <div className="text-center">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="px-4 py-2 text-sm bg-gray-800 text-white rounded hover:bg-gray-900 disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
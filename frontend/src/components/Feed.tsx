@@ -3,6 +3,7 @@ import { MapPin, Clock, Users, RefreshCw } from 'lucide-react';
 import ReportCard from './ReportCard';
 import { useNavigate } from 'react-router-dom';
 import { getPlaceName } from '../utils/locationiq';
+import { pickThumbnail } from '../utils/thumbnails';
 // import { getPlaceName } from '../utils/geolocation';
 import toast from 'react-hot-toast';
 
@@ -83,7 +84,7 @@ const Feed: React.FC<FeedProps> = ({ userLocation }) => {
 
           return {
             id: hazard.id.toString(),
-            image: hazard.photo_url,
+            image: pickThumbnail(hazard.thumbnails, hazard.photo_url),
             description: hazard.description,
             location: { lat: hazard.lat, lng: hazard.lng },
             distance: dist,
@@ -1,6 +1,7 @@
 import React, { useEffect, useState, useRef } from 'react';
 import ReportCard from './ReportCard';
 import { getPlaceName } from '../utils/locationiq';
+import { pickThumbnail } from '../utils/thumbnails';
 
 interface Report {
   id: string;
@@ -78,7 +79,7 @@ const Profile: React.FC = () => {
 
             return {
               id: hazard.id.toString(),
-              image: hazard.photo_url,
+              image: pickThumbnail(hazard.thumbnails, hazard.photo_url),
               description: hazard.description,
               location: { lat: hazard.lat, lng: hazard.lng },
               distance: userLocation
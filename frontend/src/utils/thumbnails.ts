@@ -0,0 +1,15 @@
+// Picks the smallest thumbnail at least `minWidth` px wide, falling back to
+// the largest one, then to the original photo while thumbnails are pending.
+export const pickThumbnail = (
+  thumbnails: Record<string, string> | undefined,
+  photoUrl: string,
+  minWidth = 640
+): string => {
+  const widths = Object.keys(thumbnails ?? {})
+    .map(Number)
+    .sort((a, b) => a - b);
+  if (!thumbnails || widths.length === 0) return photoUrl;
+
+  const width = widths.find((w) => w >= minWidth) ?? widths[widths.length - 1];
+  return thumbnails[String(width)];
+};